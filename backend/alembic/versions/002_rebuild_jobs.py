@@ -0,0 +1,141 @@
+"""Rebuild jobs: persistent queue of index rebuilds
+
+Revision ID: 002_rebuild_jobs
+Revises: 001_initial_schema
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = "002_rebuild_jobs"
+down_revision: str | None = "001_initial_schema"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """
+    Create the rebuild_jobs table.
+
+    Jobs are created by POST /rebuild and claimed by the rebuild worker
+    (python -m src.worker). A partial unique index allows at most one
+    queued or running job at a time (single-flight).
+    """
+    op.create_table(
+        "rebuild_jobs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            nullable=False,
+            comment="Unique rebuild job identifier",
+        ),
+        sa.Column(
+            "status",
+            sa.String(length=20),
+            nullable=False,
+            server_default="queued",
+            comment="Job status (queued, in_progress, completed, failed, cancelled)",
+        ),
+        sa.Column(
+            "progress",
+            sa.Float(),
+            nullable=False,
+            server_default="0",
+            comment="Progress from 0.0 to 1.0",
+        ),
+        sa.Column(
+            "message",
+            sa.Text(),
+            nullable=True,
+            comment="Last progress message",
+        ),
+        sa.Column(
+            "result",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="Rebuild statistics",
+        ),
+        sa.Column(
+            "error",
+            sa.Text(),
+            nullable=True,
+            comment="Error message if the job failed",
+        ),
+        sa.Column(
+            "cancel_requested",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+            comment="Cancellation requested by the API",
+        ),
+        sa.Column(
+            "worker",
+            sa.String(length=255),
+            nullable=True,
+            comment="Worker process running the job",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="Job creation timestamp",
+        ),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Timestamp at which a worker claimed the job",
+        ),
+        sa.Column(
+            "finished_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Job end timestamp",
+        ),
+        sa.Column(
+            "heartbeat_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Last progress write of the worker",
+        ),
+        sa.CheckConstraint(
+            "status IN ('queued', 'in_progress', 'completed', 'failed', 'cancelled')",
+            name=op.f("check_rebuild_job_status"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_rebuild_jobs")),
+        comment="Index rebuild jobs run by the rebuild worker",
+    )
+
+    # Single-flight: at most one queued or running job
+    op.create_index(
+        "ux_rebuild_jobs_single_active",
+        "rebuild_jobs",
+        [sa.text("(true)")],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'in_progress')"),
+    )
+    op.create_index(
+        "ix_rebuild_jobs_status_created",
+        "rebuild_jobs",
+        ["status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the rebuild_jobs table.
+
+    Note: This will delete the rebuild history.
+    """
+    op.drop_index("ix_rebuild_jobs_status_created", table_name="rebuild_jobs")
+    op.drop_index("ux_rebuild_jobs_single_active", table_name="rebuild_jobs")
+    op.drop_table("rebuild_jobs")
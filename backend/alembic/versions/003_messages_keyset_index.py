@@ -0,0 +1,46 @@
+"""Messages: (session_id, created_at, id) index for keyset pagination
+
+Revision ID: 003_messages_keyset_index
+Revises: 002_rebuild_jobs
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = "003_messages_keyset_index"
+down_revision: str | None = "002_rebuild_jobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """
+    Replace ix_messages_session_created with (session_id, created_at, id).
+
+    GET /session/{id}/messages pages a session's history with (created_at, id)
+    cursors: the id breaks ties between messages of the same timestamp, so a
+    page is one index range scan whatever its depth. The former index is a
+    prefix of the new one and is dropped.
+    """
+    op.create_index(
+        "ix_messages_session_created_id",
+        "messages",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_messages_session_created", table_name="messages")
+
+
+def downgrade() -> None:
+    """Restore the (session_id, created_at) index."""
+    op.create_index(
+        "ix_messages_session_created",
+        "messages",
+        ["session_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_messages_session_created_id", table_name="messages")
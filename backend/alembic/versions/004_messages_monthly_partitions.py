@@ -0,0 +1,185 @@
+"""Messages: monthly range partitions on created_at, sessions updated_at index
+
+Revision ID: 004_messages_monthly_partitions
+Revises: 003_messages_keyset_index
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = "004_messages_monthly_partitions"
+down_revision: str | None = "003_messages_keyset_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Months created ahead of the current one (see settings.message_partitions_ahead)
+PARTITIONS_AHEAD = 2
+
+COLUMNS = "id, session_id, role, content, created_at, sources, latency_ms, top_k, query_type"
+
+
+def _month(moment: datetime | None) -> date:
+    moment = (moment or datetime.now(UTC)).astimezone(UTC)
+    return date(moment.year, moment.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _message_columns() -> list[sa.Column]:
+    """Columns of the messages table (as created by 001_initial_schema).
+
+    The id keeps drawing from the sequence of the original SERIAL column.
+    """
+    return [
+        sa.Column(
+            "id",
+            sa.Integer(),
+            nullable=False,
+            server_default=sa.text("nextval('messages_id_seq'::regclass)"),
+            comment="Unique message identifier",
+        ),
+        sa.Column(
+            "session_id",
+            postgresql.UUID(as_uuid=True),
+            nullable=False,
+            comment="Foreign key to parent session",
+        ),
+        sa.Column(
+            "role",
+            sa.String(length=20),
+            nullable=False,
+            comment="Message role (user or assistant)",
+        ),
+        sa.Column("content", sa.Text(), nullable=False, comment="Message content"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="Message creation timestamp",
+        ),
+        sa.Column(
+            "sources",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="Retrieved sources for RAG responses",
+        ),
+        sa.Column(
+            "latency_ms", sa.Float(), nullable=True, comment="Response latency in milliseconds"
+        ),
+        sa.Column("top_k", sa.Integer(), nullable=True, comment="Number of sources retrieved"),
+        sa.Column(
+            "query_type",
+            sa.String(length=20),
+            nullable=True,
+            comment="Query type (chat or search)",
+        ),
+        sa.CheckConstraint("role IN ('user', 'assistant')", name=op.f("check_message_role")),
+        sa.ForeignKeyConstraint(
+            ["session_id"],
+            ["sessions.id"],
+            name=op.f("fk_messages_session_id_sessions"),
+            ondelete="CASCADE",
+        ),
+    ]
+
+
+def _create_message_indexes() -> None:
+    op.create_index(op.f("ix_messages_session_id"), "messages", ["session_id"], unique=False)
+    op.create_index(
+        "ix_messages_session_created_id",
+        "messages",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    """
+    Range-partition messages by month and index sessions.updated_at.
+
+    The rows are copied into a table partitioned by RANGE (created_at): one
+    partition per month from the oldest message to PARTITIONS_AHEAD months
+    ahead, plus a default partition. An old month is then removed with a
+    DROP TABLE of its partition instead of a DELETE (see
+    src.database.partitions). The primary key becomes (id, created_at):
+    PostgreSQL requires the partition key in it; ids keep their sequence.
+
+    ix_sessions_updated_at serves the batched purge of expired sessions
+    (src.worker.retention).
+
+    The copy rewrites the table under an exclusive lock: stop the API and the
+    worker for the duration of the upgrade.
+    """
+    op.create_index("ix_sessions_updated_at", "sessions", ["updated_at"], unique=False)
+
+    # Free the names of the former table, then copy its rows
+    op.rename_table("messages", "messages_unpartitioned")
+    op.execute("ALTER INDEX pk_messages RENAME TO pk_messages_unpartitioned")
+    op.drop_index("ix_messages_session_created_id", table_name="messages_unpartitioned")
+    op.drop_index(op.f("ix_messages_session_id"), table_name="messages_unpartitioned")
+
+    op.create_table(
+        "messages",
+        *_message_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name=op.f("pk_messages")),
+        comment="Chat messages within sessions",
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+
+    oldest, newest = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(created_at), max(created_at) FROM messages_unpartitioned"))
+        .one()
+    )
+    month = _month(oldest)
+    last = _month(max(newest, datetime.now(UTC)) if newest else None)
+    for _ in range(PARTITIONS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE messages_y{month.year:04d}m{month.month:02d} PARTITION OF messages "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        month = end
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM messages_unpartitioned")
+    op.drop_table("messages_unpartitioned")
+    # Built once the rows are in place (one index per partition)
+    _create_message_indexes()
+
+
+def downgrade() -> None:
+    """Copy the messages back into a single unpartitioned table."""
+    op.rename_table("messages", "messages_partitioned")
+    op.execute("ALTER INDEX pk_messages RENAME TO pk_messages_partitioned")
+    op.drop_index("ix_messages_session_created_id", table_name="messages_partitioned")
+    op.drop_index(op.f("ix_messages_session_id"), table_name="messages_partitioned")
+
+    op.create_table(
+        "messages",
+        *_message_columns(),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_messages")),
+        comment="Chat messages within sessions",
+    )
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+    op.execute(f"INSERT INTO messages ({COLUMNS}) SELECT {COLUMNS} FROM messages_partitioned")
+    # Drops the partitions with their parent
+    op.drop_table("messages_partitioned")
+    _create_message_indexes()
+
+    op.drop_index("ix_sessions_updated_at", table_name="sessions")
@@ -0,0 +1,43 @@
+"""Rebuild jobs: shard to rebuild
+
+Revision ID: 005_rebuild_jobs_shard
+Revises: 004_messages_monthly_partitions
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = "005_rebuild_jobs_shard"
+down_revision: str | None = "004_messages_monthly_partitions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """
+    Add the shard column to rebuild_jobs.
+
+    A job queued by POST /rebuild with a shard makes the worker rebuild only
+    that shard of a sharded index (IndexBuilder.rebuild_shard); NULL keeps the
+    full rebuild.
+    """
+    op.add_column(
+        "rebuild_jobs",
+        sa.Column(
+            "shard",
+            sa.String(length=100),
+            nullable=True,
+            comment="Shard to rebuild (None: whole index)",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the shard column of rebuild_jobs."""
+    op.drop_column("rebuild_jobs", "shard")
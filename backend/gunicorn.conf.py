@@ -0,0 +1,54 @@
+"""Configuration gunicorn : plusieurs workers uvicorn partageant le moteur RAG.
+
+Avec `uvicorn --workers N`, chaque worker charge sa propre copie de l'index
+FAISS, du docstore et des documents : la memoire croit avec N. Ici le moteur
+est charge une seule fois dans le processus maitre (preload_app + on_starting),
+avant le fork : les workers partagent ses pages en lecture (copy-on-write).
+
+- gc.disable() puis gc.freeze() avant le fork : le ramasse-miettes des workers
+  ne reecrit pas les en-tetes des objets charges par le maitre ;
+- le prechauffage FAISS (warm_up) reste dans le lifespan de chaque worker :
+  aucune recherche (threads OpenMP) n'est lancee dans le maitre avant le fork ;
+- une nouvelle version d'index rechargee par un worker (watch_index_manifest)
+  lui est privee ; redemarrer le serveur la partage a nouveau.
+
+Usage:
+    scripts/start_api.sh
+    uv run gunicorn -c gunicorn.conf.py src.api.main:app
+    uv run python scripts/memory_report.py --pidfile /tmp/rag-events-api.pid
+"""
+
+import gc
+import os
+
+# Objects allocated while the master loads the engine are never collected
+# before the fork (collections would dirty and compact the shared pages)
+gc.disable()
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+pidfile = os.getenv("GUNICORN_PIDFILE", "/tmp/rag-events-api.pid")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+accesslog = "-"
+
+
+def on_starting(server):
+    """Charge le moteur RAG dans le maitre, puis fige ses objets avant le fork."""
+    from src.api.main import get_rag_engine
+
+    engine = get_rag_engine()
+    gc.freeze()
+    server.log.info(
+        "Moteur RAG precharge (index version %s, %d documents, %d objets figes)",
+        engine.index_version,
+        engine.num_documents,
+        gc.get_freeze_count(),
+    )
+
+
+def post_fork(server, worker):
+    """Reactive le ramasse-miettes dans le worker (objets du maitre exclus)."""
+    gc.enable()
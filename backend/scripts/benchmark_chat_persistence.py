@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Benchmark: database work of one /chat exchange.
+
+Compares the former persistence path of /chat (get-or-create session, history
+read, two message inserts and a timestamp update, each write with its own
+commit and refreshes) with ChatUnitOfWork (two reads, then one transaction).
+Round trips are counted with SQLAlchemy engine events: every statement, plus
+the BEGIN / COMMIT / ROLLBACK of each transaction.
+
+Requires the PostgreSQL database of the settings (DATABASE_URL / POSTGRES_*);
+the sessions created by the benchmark are deleted at the end.
+
+Usage:
+    uv run python scripts/benchmark_chat_persistence.py
+    uv run python scripts/benchmark_chat_persistence.py --exchanges 500 --turns 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import delete, event
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.connection import close_db, get_engine, get_session_maker, init_db
+from src.database.models import SessionModel
+from src.database.repository import ChatUnitOfWork, MessageRepository, SessionRepository
+
+SOURCES = [{"title": "Concert", "content": "Titre: Concert\nVille: Lyon", "similarity": 0.8}]
+
+
+class RoundTripCounter:
+    """Count the statements and transaction commands sent to the database."""
+
+    def __init__(self, engine):
+        self.count = 0
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._increment)
+        for name in ("begin", "commit", "rollback"):
+            event.listen(sync_engine, name, self._increment)
+
+    def _increment(self, *args, **kwargs):
+        self.count += 1
+
+
+async def legacy_exchange(session_maker, session_id: uuid.UUID) -> None:
+    """Persistence path of /chat before ChatUnitOfWork."""
+    async with session_maker() as db:
+        session_repo = SessionRepository(db)
+        message_repo = MessageRepository(db)
+        session = await session_repo.get_by_id(session_id)
+        if not session:
+            session = await session_repo.create(session_id=session_id)
+        metadata = session.session_metadata or {}
+        await message_repo.get_messages_after(
+            session_id=session_id, after_id=metadata.get("summarized_until"), limit=50
+        )
+        await message_repo.create(
+            session_id=session_id, role="user", content="Concerts ?", query_type="chat"
+        )
+        await message_repo.create(
+            session_id=session_id,
+            role="assistant",
+            content="Voici des concerts.",
+            sources=SOURCES,
+            latency_ms=900.0,
+            top_k=5,
+            query_type="chat",
+        )
+        await session_repo.update_timestamp(session_id)
+
+
+async def unit_of_work_exchange(session_maker, session_id: uuid.UUID) -> None:
+    """Persistence path of /chat with ChatUnitOfWork."""
+    async with session_maker() as db:
+        unit_of_work = ChatUnitOfWork(db)
+        asked_at = datetime.utcnow()
+        await unit_of_work.load_history(session_id, limit=50)
+        await unit_of_work.save_exchange(
+            session_id,
+            query="Concerts ?",
+            response="Voici des concerts.",
+            asked_at=asked_at,
+            sources=SOURCES,
+            latency_ms=900.0,
+            top_k=5,
+        )
+
+
+async def run(exchange, session_maker, counter, exchanges: int, turns: int) -> dict:
+    """Run exchanges (turns per session) and collect latencies and round trips."""
+    latencies, round_trips, session_ids = [], [], []
+    for i in range(exchanges):
+        if i % turns == 0:
+            session_ids.append(uuid.uuid4())
+        before = counter.count
+        start = time.perf_counter()
+        await exchange(session_maker, session_ids[-1])
+        latencies.append((time.perf_counter() - start) * 1000)
+        round_trips.append(counter.count - before)
+
+    async with session_maker() as db:
+        await db.execute(delete(SessionModel).where(SessionModel.id.in_(session_ids)))
+        await db.commit()
+
+    latencies.sort()
+    return {
+        "round_trips": statistics.mean(round_trips),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+async def main_async(exchanges: int, turns: int) -> None:
+    """Benchmark both paths on the configured database."""
+    await init_db()
+    session_maker = get_session_maker()
+    counter = RoundTripCounter(get_engine())
+
+    # Warm up the connection pool
+    await run(unit_of_work_exchange, session_maker, counter, turns, turns)
+
+    print("=" * 60)
+    print(f"Persistance de /chat : {exchanges} échanges, {turns} par session")
+    print("=" * 60)
+    for label, exchange in (
+        ("Avant (repositories)", legacy_exchange),
+        ("Après (ChatUnitOfWork)", unit_of_work_exchange),
+    ):
+        stats = await run(exchange, session_maker, counter, exchanges, turns)
+        print(
+            f"{label:24s} {stats['round_trips']:5.1f} allers-retours  "
+            f"p50 {stats['p50']:7.2f} ms  p95 {stats['p95']:7.2f} ms"
+        )
+    await close_db()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de la persistance de /chat")
+    parser.add_argument("--exchanges", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5, help="Échanges par session")
+    args = parser.parse_args()
+    asyncio.run(main_async(args.exchanges, args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: HTML cleaning of event descriptions.
+
+Compares the BeautifulSoup cleaning of the preprocessing notebook (02) with
+the ingestion cleaning stage (plain-text fast path + lxml), serially and with
+a process pool, and checks that both produce identical text.
+
+Usage:
+    uv run python scripts/benchmark_cleaning.py
+    uv run python scripts/benchmark_cleaning.py --input data/raw/events_raw.json --workers 8
+    uv run python scripts/benchmark_cleaning.py --fetch 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.constants import RAW_DATA_DIR, RAW_EVENTS_FILE
+from src.ingest.fetcher import fetch_pages
+from src.ingest.stages import clean_descriptions, has_markup
+
+
+def reference_clean_html(text: str | None) -> str:
+    """Cleaning function of notebooks/02_data_preprocessing.ipynb."""
+    if not text:
+        return ""
+    soup = BeautifulSoup(text, "html.parser")
+    text = soup.get_text(separator=" ", strip=True)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def load_descriptions(path: Path) -> list[str | None]:
+    """Read descriptions from raw API records or processed events."""
+    with open(path, encoding="utf-8") as f:
+        events = json.load(f)
+    return [event.get("description_fr", event.get("description")) for event in events]
+
+
+async def fetch_descriptions(max_events: int) -> list[str | None]:
+    """Fetch descriptions directly from the OpenDataSoft API."""
+    descriptions = []
+    async for page in fetch_pages(max_events=max_events):
+        descriptions.extend(record.get("description_fr") for record in page)
+    return descriptions
+
+
+def timed(func, *args):
+    """Run func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark du nettoyage HTML")
+    parser.add_argument("--input", type=Path, default=RAW_DATA_DIR / RAW_EVENTS_FILE)
+    parser.add_argument("--fetch", type=int, default=0, help="Récupérer N événements via l'API")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.fetch:
+        descriptions = asyncio.run(fetch_descriptions(args.fetch))
+    elif args.input.exists():
+        descriptions = load_descriptions(args.input)
+    else:
+        print(f"❌ Fichier non trouvé: {args.input} (utilisez --input ou --fetch)")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("Benchmark du nettoyage HTML des descriptions")
+    print("=" * 60)
+    with_markup = sum(has_markup(text) for text in descriptions)
+    print(f"Descriptions: {len(descriptions)} ({with_markup} avec balises ou entités)")
+
+    reference, ref_time = timed(lambda: [reference_clean_html(t) for t in descriptions])
+    serial, serial_time = timed(clean_descriptions, descriptions)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        clean_descriptions(descriptions[: args.workers], executor)  # Start the workers
+        parallel, parallel_time = timed(clean_descriptions, descriptions, executor)
+
+    print(f"\nBeautifulSoup (notebook):     {ref_time:8.3f}s")
+    print(f"Fast path + lxml:             {serial_time:8.3f}s  (x{ref_time / serial_time:.1f})")
+    print(
+        f"Fast path + lxml, {args.workers:2d} proc.:  {parallel_time:8.3f}s"
+        f"  (x{ref_time / parallel_time:.1f})"
+    )
+
+    mismatches = [
+        i for i, (ref, new) in enumerate(zip(reference, parallel, strict=True)) if ref != new
+    ]
+    if serial != parallel:
+        print("\n❌ Les résultats série et parallèle diffèrent")
+        sys.exit(1)
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} descriptions différentes, par exemple:")
+        for i in mismatches[:5]:
+            print(f"  - source:   {descriptions[i]!r:.200}")
+            print(f"    notebook: {reference[i]!r:.200}")
+            print(f"    lxml:     {parallel[i]!r:.200}")
+        sys.exit(1)
+    print("\n✅ Sortie identique à la fonction du notebook")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark: cost of an index delta (POST /index/delta) against the corpus size.
+
+Builds an index of N synthetic events with a deterministic local embedding (no
+Mistral calls, so only the index work is measured), then times deltas of one
+event. A delta re-embeds only its own events, but still publishes a complete
+new version: the FAISS index and the pickle of docstore ids are rewritten
+(O(N) bytes), the columnar docstore and the JSONL source are copied without
+decoding the unchanged documents.
+
+Usage:
+    uv run python scripts/benchmark_index_delta.py
+    uv run python scripts/benchmark_index_delta.py --events 1000 10000 50000 --deltas 5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.rag.index_builder import IndexBuilder
+from src.rag.versions import current_version
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic pseudo-random vectors seeded by the text (no API calls)."""
+
+    def _embed(self, text: str) -> list[float]:
+        seed = abs(hash(text)) % 2**32
+        return np.random.default_rng(seed).normal(size=settings.embedding_dimension).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+def make_document(i: int, title: str = "Concert") -> dict:
+    """Synthetic event in rag_documents format (about 500 characters)."""
+    return {
+        "id": f"evt-{i}",
+        "title": f"{title} {i}",
+        "content": f"Titre: {title} {i}\nVille: Lyon\n" + "Description de l'événement. " * 16,
+        "metadata": {"uid": f"evt-{i}", "city": "Lyon", "start_date": "2026-05-01T20:00:00+00:00"},
+    }
+
+
+def benchmark(events: int, deltas: int, workdir: Path) -> tuple[float, float]:
+    """Build an index of `events` events, return (rebuild seconds, median delta ms)."""
+    documents_path = workdir / "rag_documents.jsonl"
+    with open(documents_path, "w", encoding="utf-8") as f:
+        for i in range(events):
+            f.write(json.dumps(make_document(i), ensure_ascii=False) + "\n")
+
+    builder = IndexBuilder(documents_path=documents_path, index_dir=workdir / "faiss_index")
+    start = time.perf_counter()
+    builder.rebuild()
+    rebuild_seconds = time.perf_counter() - start
+
+    # Like the API: the live vector store is passed along from one delta to the next
+    result = builder.apply_delta(upsert=[make_document(0, "Expo")])
+    timings = []
+    for i in range(1, deltas + 1):
+        start = time.perf_counter()
+        result = builder.apply_delta(
+            upsert=[make_document(i, "Expo")],
+            vectorstore=result["vectorstore"],
+            base_version=current_version(builder.index_dir),
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return rebuild_seconds, statistics.median(timings)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark des deltas d'index")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000, 20000])
+    parser.add_argument("--deltas", type=int, default=5, help="Deltas mesurés par taille")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Benchmark des deltas d'index (1 événement par delta)")
+    print("=" * 60)
+    print(f"{'Événements':>12} {'Rebuild':>12} {'Delta (médiane)':>18}")
+    with (
+        patch("src.rag.index_builder.get_embeddings", return_value=HashEmbeddings()),
+        patch.object(settings, "dedup_enabled", False),
+    ):
+        for events in args.events:
+            with tempfile.TemporaryDirectory() as workdir:
+                rebuild_seconds, delta_ms = benchmark(events, args.deltas, Path(workdir))
+            print(f"{events:>12} {rebuild_seconds:>11.2f}s {delta_ms:>16.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Memory report of a multi-worker API server (gunicorn.conf.py).
+
+Reads /proc/<pid>/smaps_rollup (Linux) for the gunicorn master and each worker:
+
+- RSS counts every resident page, shared ones included: summing the RSS of the
+  workers counts the preloaded index once per worker;
+- PSS splits each shared page between the processes mapping it: the sum of the
+  PSS is the real footprint of the server;
+- Shared / Private separate the pages still shared with the master
+  (copy-on-write) from those each process owns.
+
+Usage:
+    uv run python scripts/memory_report.py
+    uv run python scripts/memory_report.py --pid 1234
+    uv run python scripts/memory_report.py --pidfile /tmp/rag-events-api.pid
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROC = Path("/proc")
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def read_memory(pid: int) -> dict[str, int]:
+    """Memory counters of a process in kB (smaps_rollup fields)."""
+    values = {}
+    with open(PROC / str(pid) / "smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "shared": values["Shared_Clean"] + values["Shared_Dirty"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def child_pids(pid: int) -> list[int]:
+    """PIDs of the direct children of a process (the gunicorn workers)."""
+    children = []
+    for stat in PROC.glob("[0-9]*/stat"):
+        try:
+            # "pid (comm) state ppid ...": comm may contain spaces
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue  # Exited meanwhile
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return sorted(children)
+
+
+def report(master: int) -> list[tuple[str, int, dict[str, int]]]:
+    """Memory of the master and of each worker."""
+    rows = [("maître", master, read_memory(master))]
+    for i, pid in enumerate(child_pids(master), 1):
+        try:
+            rows.append((f"worker {i}", pid, read_memory(pid)))
+        except OSError:
+            continue
+    return rows
+
+
+def main():
+    """Print the memory report."""
+    parser = argparse.ArgumentParser(description="Mémoire par worker de l'API")
+    parser.add_argument("--pid", type=int, help="PID du maître gunicorn")
+    parser.add_argument("--pidfile", type=Path, default=Path("/tmp/rag-events-api.pid"))
+    args = parser.parse_args()
+
+    master = args.pid
+    if master is None:
+        if not args.pidfile.exists():
+            sys.exit(f"PID introuvable : {args.pidfile} absent (serveur démarré ?)")
+        master = int(args.pidfile.read_text().strip())
+
+    rows = report(master)
+    workers = rows[1:]
+    print("=" * 72)
+    print(f"Mémoire de l'API (maître {master}, {len(workers)} workers), en Mo")
+    print("=" * 72)
+    print(
+        f"{'Processus':12s} {'PID':>8s} {'RSS':>10s} {'PSS':>10s} {'Partagé':>10s} {'Privé':>10s}"
+    )
+    for name, pid, memory in rows:
+        print(
+            f"{name:12s} {pid:8d} {memory['rss'] / 1024:10.1f} {memory['pss'] / 1024:10.1f} "
+            f"{memory['shared'] / 1024:10.1f} {memory['private'] / 1024:10.1f}"
+        )
+    print("-" * 72)
+    rss = sum(memory["rss"] for _, _, memory in rows) / 1024
+    pss = sum(memory["pss"] for _, _, memory in rows) / 1024
+    print(f"Somme des RSS : {rss:10.1f} Mo (pages partagées comptées par processus)")
+    print(f"Somme des PSS : {pss:10.1f} Mo (empreinte réelle du serveur)")
+    if workers:
+        private = sum(memory["private"] for _, _, memory in workers) / 1024 / len(workers)
+        print(f"Coût d'un worker supplémentaire : ~{private:.1f} Mo (mémoire privée moyenne)")
+
+
+if __name__ == "__main__":
+    main()
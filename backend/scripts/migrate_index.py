@@ -17,10 +17,10 @@ import sys
 from pathlib import Path
 
 # Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.rag.index_builder import IndexBuilder
+from src.rag.versions import resolve_index_dir
 
 
 def progress_callback(message: str, percentage: float) -> None:
@@ -56,14 +56,20 @@ def main():
         print(f"  Documents traités: {result['documents_processed']}")
         print(f"  Dimension embeddings: {result['embedding_dimension']}")
         print(f"  Vecteurs indexés: {result['index_vectors']}")
+        print(
+            f"  Occurrences regroupées: {result['vectors_saved']} "
+            f"(-{result['memory_saved_mb']} Mo)"
+        )
+        print(f"  Doublons fusionnés: {result['duplicates_removed']} (voir dedup_report.json)")
         print(f"  Temps écoulé: {result['elapsed_seconds']}s")
         print(f"  Provider: {result['provider']}")
         print(f"  Modèle: {result['model']}")
         print()
-        print("Fichiers créés:")
-        print(f"  - {builder.index_dir / 'index.faiss'}")
-        print(f"  - {builder.index_dir / 'index.pkl'}")
-        print(f"  - {builder.index_dir / 'config.json'}")
+        version_dir = resolve_index_dir(builder.index_dir)
+        print(f"Fichiers créés (version {result['index_version']}):")
+        print(f"  - {version_dir / 'index.faiss'}")
+        print(f"  - {version_dir / 'index.pkl'}")
+        print(f"  - {version_dir / 'config.json'}")
 
     except FileNotFoundError as e:
         print(f"\n❌ Erreur: {e}")
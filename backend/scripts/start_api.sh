@@ -0,0 +1,19 @@
+#!/bin/bash
+# =============================================================================
+# Demarrage de l'API en multi-workers (gunicorn + workers uvicorn)
+# =============================================================================
+# Le moteur RAG (index FAISS, docstore, documents) est charge une fois dans le
+# processus maitre puis partage par les workers (voir gunicorn.conf.py).
+#
+# Usage:
+#   scripts/start_api.sh                  # WEB_CONCURRENCY workers (defaut: 2)
+#   WEB_CONCURRENCY=4 scripts/start_api.sh
+#
+# Memoire par worker:
+#   uv run python scripts/memory_report.py
+# =============================================================================
+set -e
+
+cd "$(dirname "$0")/.."
+
+exec gunicorn -c gunicorn.conf.py "$@" src.api.main:app
@@ -0,0 +1,129 @@
+"""Execution bornee des appels bloquants du moteur RAG.
+
+Les appels au moteur (embedding, FAISS, LLM) bloquent un thread pendant
+plusieurs secondes. Ils passent par un pool dedie, dimensionne par
+settings.engine_workers, plutot que par la boucle d'evenements ou le pool
+partage de Starlette :
+
+- au plus engine_workers appels s'executent, engine_queue_size attendent ;
+  au-dela, la requete est refusee immediatement (Overloaded -> 503 avec un
+  Retry-After estime) au lieu d'expirer apres une longue attente ;
+- chaque appel porte une echeance : un appel encore en file a l'echeance est
+  annule, un appel commence s'arrete a sa prochaine etape (voir
+  RAGEngine.chat) ; la requete recoit une erreur DeadlineExceeded.
+"""
+
+import asyncio
+import contextvars
+import functools
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src.rag.engine import DeadlineExceeded
+from src.utils.metrics import ERRORS
+
+# Poids de la derniere duree dans la moyenne glissante (estimation du Retry-After)
+DURATION_SMOOTHING = 0.2
+
+
+class Overloaded(Exception):
+    """File d'attente du pool pleine : la requete est refusee."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Serveur sature, reessayez dans {retry_after} s")
+        self.retry_after = retry_after
+
+
+class EngineExecutor:
+    """Pool de threads du moteur RAG avec controle d'admission."""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        """Cree le pool.
+
+        Args:
+            max_workers: Appels executes en parallele.
+            max_queue: Appels admis en attente d'un thread.
+        """
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rag-engine"
+        )
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._average_seconds = 1.0
+
+    @property
+    def admitted(self) -> int:
+        """Appels en cours ou en attente."""
+        return self._admitted
+
+    def retry_after(self) -> int:
+        """Estime en secondes le temps d'ecoulement de la file."""
+        return max(1, math.ceil(self._average_seconds * self._admitted / self.max_workers))
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, deadline: float | None = None, **kwargs: Any
+    ) -> Any:
+        """Execute un appel bloquant dans le pool.
+
+        Args:
+            func: Fonction bloquante.
+            *args: Arguments positionnels de func.
+            deadline: Echeance (horloge time.monotonic) ; None pour aucune.
+            **kwargs: Arguments nommes de func.
+
+        Returns:
+            Le resultat de func.
+
+        Raises:
+            Overloaded: Si le pool et sa file sont pleins.
+            DeadlineExceeded: Si l'echeance est depassee avant la fin de l'appel.
+        """
+        with self._lock:
+            if self._admitted >= self.capacity:
+                ERRORS.inc(component="admission")
+                raise Overloaded(self.retry_after())
+            self._admitted += 1
+
+        def job() -> Any:
+            # Still queued when the deadline passed: do not start the work
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded("Echeance depassee avant le demarrage")
+            start = time.perf_counter()
+            try:
+                return context.run(functools.partial(func, *args, **kwargs))
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._average_seconds += DURATION_SMOOTHING * (elapsed - self._average_seconds)
+
+        context = contextvars.copy_context()
+        try:
+            concurrent_future = self._executor.submit(job)
+        except RuntimeError:
+            self._release()
+            raise
+        # Released when the job ends, or when it is cancelled before starting:
+        # a job still running after its caller gave up keeps its slot
+        concurrent_future.add_done_callback(self._release)
+        try:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            # On timeout the future is cancelled: a queued job never starts
+            return await asyncio.wait_for(asyncio.wrap_future(concurrent_future), timeout=timeout)
+        except TimeoutError:
+            ERRORS.inc(component="deadline")
+            raise DeadlineExceeded("Echeance de la requete depassee") from None
+
+    def _release(self, _future: Any = None) -> None:
+        """Libere la place d'un appel admis (termine ou annule avant son demarrage)."""
+        with self._lock:
+            self._admitted -= 1
+
+    def shutdown(self) -> None:
+        """Arrete le pool (les appels en file sont annules)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -5,23 +5,70 @@ import os
 
 os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 
+import asyncio
+import functools
+import hashlib
+import itertools
+import logging
+import math
+import threading
 import time
 import uuid
 from contextlib import asynccontextmanager
-from functools import lru_cache
-
-from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException
+from datetime import datetime
+from typing import Literal
+
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.admission import EngineExecutor, Overloaded
+from src.config.constants import SUMMARY_HISTORY_PREFIX
 from src.config.settings import settings
-from src.database.connection import close_db, get_db, init_db
-from src.database.repository import MessageRepository, SessionRepository
-from src.rag.engine import RAGEngine
+from src.database.connection import close_db, get_db, get_session_maker, init_db
+from src.database.history_cache import SessionHistoryCache
+from src.database.models import MessageModel
+from src.database.repository import (
+    ChatExchange,
+    ChatUnitOfWork,
+    MessageRepository,
+    RebuildJobRepository,
+    SessionRepository,
+)
+from src.database.write_behind import MessageWriteBehind, WriteBehindFull
+from src.rag.engine import DeadlineExceeded, RAGEngine
+from src.rag.shards import shard_slug
+from src.rag.versions import IndexLocked, current_version, index_lock
+from src.utils.metrics import (
+    ERRORS,
+    HTTP_REQUEST_SECONDS,
+    current_timer,
+    record_cache,
+    render_metrics,
+    track_request,
+)
+from src.utils.tokens import trim_history_to_tokens
 
-MAX_HISTORY = 5  # Nombre de messages (paires user+assistant) à conserver en DB
+# Nombre maximum de messages non résumés lus en DB (l'historique est ensuite
+# plafonné en tokens par settings.history_max_tokens)
+HISTORY_FETCH_LIMIT = 50
+
+logger = logging.getLogger(__name__)
 
 
 # Modèles Pydantic
@@ -33,25 +80,52 @@ class Message(BaseModel):
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1)
     top_k: int = Field(5, ge=1, le=20)
+    city: str | None = Field(
+        None, description="Limiter la recherche a une ville (index shardé par ville ou région)"
+    )
+    include_content: bool = Field(
+        True, description="false : sources reduites a id/titre/score (voir POST /events/batch)"
+    )
+    debug: bool = Field(False, description="Ajoute les durees par etape et les scores")
 
 
 class DocumentResult(BaseModel):
+    id: str | None = None
     title: str
-    content: str
-    metadata: dict
+    content: str | None = None
+    metadata: dict | None = None
     similarity: float
     distance: float
 
 
+class CandidateScore(BaseModel):
+    id: str | None = None
+    title: str
+    similarity: float
+    selected: bool = Field(..., description="Envoye au LLM (select_context)")
+
+
+class DebugInfo(BaseModel):
+    timings_ms: dict[str, float] = Field(
+        ..., description="Durees par etape RAG et operation DB (db:<operation>)"
+    )
+    candidates: list[CandidateScore]
+
+
 class SearchResponse(BaseModel):
     results: list[DocumentResult]
     query: str
+    debug: DebugInfo | None = None
 
 
 class ChatRequest(BaseModel):
     query: str = Field(..., min_length=1)
     session_id: str | None = Field(None, description="ID de session pour la mémoire")
     top_k: int = Field(5, ge=1, le=20)
+    include_content: bool = Field(
+        True, description="false : sources reduites a id/titre/score (voir POST /events/batch)"
+    )
+    debug: bool = Field(False, description="Ajoute les durees par etape et les scores")
 
 
 class ChatResponse(BaseModel):
@@ -59,20 +133,238 @@ class ChatResponse(BaseModel):
     sources: list[DocumentResult]
     query: str
     session_id: str
+    debug: DebugInfo | None = None
+
+
+# Moteur RAG courant : remplace par reference (hot swap) apres un rechargement
+_rag_engine: RAGEngine | None = None
+_rag_engine_lock = threading.Lock()
 
 
-@lru_cache
 def get_rag_engine() -> RAGEngine:
-    return RAGEngine()
+    """Retourne le moteur RAG courant (charge au premier appel)."""
+    global _rag_engine
+    if _rag_engine is None:
+        with _rag_engine_lock:
+            if _rag_engine is None:
+                _rag_engine = RAGEngine()
+    return _rag_engine
+
+
+def reload_rag_engine() -> RAGEngine:
+    """Charge la version d'index publiee dans un nouveau moteur, puis l'echange.
+
+    Le nouveau moteur est construit et prechauffe hors du chemin des requetes ;
+    les requetes en cours terminent sur l'ancien, les suivantes utilisent le nouveau.
+    """
+    global _rag_engine
+    with _rag_engine_lock:
+        engine = RAGEngine()
+        engine.warm_up()
+        _rag_engine = engine
+    logger.info("Moteur RAG recharge (index version %s)", engine.index_version)
+    return engine
+
+
+_engine_executor: EngineExecutor | None = None
+
+
+def get_engine_executor() -> EngineExecutor:
+    """Retourne le pool d'execution du moteur RAG (cree au premier appel)."""
+    global _engine_executor
+    if _engine_executor is None:
+        _engine_executor = EngineExecutor(settings.engine_workers, settings.engine_queue_size)
+    return _engine_executor
+
+
+def request_deadline() -> float | None:
+    """Echeance d'une requete recue maintenant (horloge time.monotonic)."""
+    if settings.engine_request_timeout <= 0:
+        return None
+    return time.monotonic() + settings.engine_request_timeout
+
+
+async def run_engine(func, *args, deadline: float | None = None, **kwargs):
+    """Execute un appel du moteur dans son pool borne.
+
+    Un pool sature donne un 503 immediat avec Retry-After, une echeance
+    depassee un 504.
+    """
+    try:
+        return await get_engine_executor().run(func, *args, deadline=deadline, **kwargs)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        ) from e
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e)) from e
+
+
+async def watch_index_manifest() -> None:
+    """Recharge le moteur quand une nouvelle version d'index est publiee.
+
+    Couvre les reconstructions faites par un autre worker ou processus.
+    """
+    while True:
+        await asyncio.sleep(settings.index_watch_interval)
+        try:
+            rag = get_rag_engine()
+            version = current_version(rag.index_dir)
+            if version is not None and version != rag.index_version:
+                await run_in_threadpool(reload_rag_engine)
+        except Exception:
+            logger.exception("Echec du rechargement de l'index")
+
+
+def build_history(summary: str | None, messages: list[dict]) -> list[dict]:
+    """Construit l'historique envoyé au LLM : résumé glissant + derniers messages.
+
+    Args:
+        summary: Résumé des échanges plus anciens (metadata de session).
+        messages: Messages non résumés, du plus ancien au plus récent.
+
+    Returns:
+        Historique plafonné à settings.history_max_tokens, précédé du résumé.
+    """
+    history = trim_history_to_tokens(messages, settings.history_max_tokens)
+    if summary:
+        history = [{"role": "system", "content": f"{SUMMARY_HISTORY_PREFIX} {summary}"}, *history]
+    return history
+
+
+async def update_session_summary(session_id: uuid.UUID) -> tuple[str, int] | None:
+    """Replie dans le résumé de session les messages sortis de la fenêtre de tokens.
+
+    Exécutée en tâche de fond après chaque échange, avec sa propre session DB.
+    Seuls les HISTORY_FETCH_LIMIT derniers messages forment l'historique : les
+    messages non résumés plus anciens (résumés reportés, autre processus) sont
+    repliés d'abord, par lots de HISTORY_FETCH_LIMIT.
+
+    Returns:
+        (nouveau résumé, nombre de messages repliés parmi les HISTORY_FETCH_LIMIT
+        derniers), ou None si rien n'a été replié.
+    """
+    try:
+        async with get_session_maker()() as db:
+            session_repo = SessionRepository(db)
+            message_repo = MessageRepository(db)
+            metadata = await session_repo.get_metadata(session_id)
+            if metadata is None:
+                return None
+
+            metadata = dict(metadata)
+            previous_until = metadata.get("summarized_until")
+            messages = await message_repo.get_messages_after(
+                session_id, after_id=previous_until, limit=HISTORY_FETCH_LIMIT
+            )
+            kept = trim_history_to_tokens(
+                [msg.to_dict() for msg in messages], settings.history_max_tokens
+            )
+            overflow = messages[: len(messages) - len(kept)]
+
+            # Folds still to apply, oldest first: messages before the fetched window
+            folds = []
+            if len(messages) == HISTORY_FETCH_LIMIT:
+                window_ids = {msg.id for msg in messages}
+                until = previous_until
+                while True:
+                    batch = await message_repo.get_messages_after(
+                        session_id, after_id=until, limit=HISTORY_FETCH_LIMIT, oldest=True
+                    )
+                    older = list(itertools.takewhile(lambda m: m.id not in window_ids, batch))
+                    if not older:
+                        break
+                    folds.append(older)
+                    until = older[-1].id
+                    if len(older) < len(batch):
+                        break
+            if overflow:
+                folds.append(overflow)
+            if not folds:
+                return None
+
+            rag = get_rag_engine()
+            for fold in folds:
+                metadata["summary"] = await get_engine_executor().run(
+                    rag.summarize_history,
+                    metadata.get("summary"),
+                    [msg.to_dict() for msg in fold],
+                )
+                metadata["summarized_until"] = fold[-1].id
+            await session_repo.update_metadata(session_id, metadata)
+            if _history_cache is not None:
+                _history_cache.fold(session_id, previous_until, metadata, len(overflow))
+            return metadata["summary"], len(overflow)
+    except Overloaded:
+        # Folded at the next exchange
+        logger.info("Resume de session %s reporte : moteur sature", session_id)
+    except Exception:
+        logger.exception("Echec de la mise a jour du resume de session %s", session_id)
+    return None
+
+
+# File d'ecriture differee des messages (None : ecriture synchrone dans /chat)
+_message_writer: MessageWriteBehind | None = None
+
+# Historiques recents des sessions (None : relus en base a chaque echange)
+_history_cache: SessionHistoryCache | None = None
+
+
+async def load_session_history(
+    unit_of_work: ChatUnitOfWork, session_id: uuid.UUID
+) -> tuple[dict, list[dict[str, str]]]:
+    """Historique d'une session : metadonnees (resume) et messages non resumes.
+
+    Lu dans le cache des historiques si la session y est, sinon en base
+    (messages en attente d'ecriture compris) puis mis en cache.
+    """
+    if _history_cache is not None:
+        cached = _history_cache.get(session_id)
+        if cached is not None:
+            return cached
+
+    metadata, recent_messages = await unit_of_work.load_history(
+        session_id, limit=HISTORY_FETCH_LIMIT
+    )
+    messages = [msg.to_dict() for msg in recent_messages]
+    if _message_writer is not None:
+        messages += _message_writer.pending_messages(session_id)
+    if _history_cache is not None:
+        _history_cache.put(session_id, metadata, messages)
+    return metadata, messages
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize RAG engine
-    get_rag_engine()
+    get_rag_engine().warm_up()
     # Initialize database tables
     await init_db()
+    # Pick up index versions published by other processes
+    watcher = None
+    if settings.index_watch_interval > 0:
+        watcher = asyncio.create_task(watch_index_manifest())
+    # Background writes of the /chat messages
+    global _message_writer
+    if settings.message_write_behind:
+        _message_writer = MessageWriteBehind(get_session_maker())
+        await _message_writer.start()
+    # Recent session histories, updated write-through by /chat
+    global _history_cache
+    if settings.session_cache_size > 0:
+        _history_cache = SessionHistoryCache(max_messages=HISTORY_FETCH_LIMIT)
     yield
+    if watcher:
+        watcher.cancel()
+    # Write (or spill) the buffered messages before closing the pool
+    if _message_writer is not None:
+        await _message_writer.close()
+        _message_writer = None
+    _history_cache = None
+    global _engine_executor
+    if _engine_executor is not None:
+        _engine_executor.shutdown()
+        _engine_executor = None
     # Close database connections
     await close_db()
 
@@ -94,6 +386,65 @@ if settings.enable_cors:
     )
 
 
+class MetricsMiddleware:
+    """Middleware ASGI : duree des requetes par route et erreurs 5xx (voir /metrics).
+
+    Ajoute aussi l'en-tete Server-Timing : durees des etapes RAG et des
+    operations DB de la requete (voir track_request), plus le total.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                server_timing = timer.header(total=time.perf_counter() - start)
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", server_timing.encode("latin-1")),
+                    ],
+                }
+            await send(message)
+
+        try:
+            with track_request() as timer:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            # Route template (/rebuild/{task_id}), not the raw path: bounded label values
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, method=scope["method"], route=route
+            )
+            if status >= 500:
+                ERRORS.inc(component="http")
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metriques du processus au format texte Prometheus.
+
+    Histogrammes de latence par etape du moteur RAG, par appel de repository
+    et par route, compteurs de cache, de tokens LLM et d'erreurs.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check(db: AsyncSession = Depends(get_db)):
     try:
@@ -112,40 +463,89 @@ async def health_check(db: AsyncSession = Depends(get_db)):
             "embedding_dimension": rag.embedding_dim,
             "active_sessions": active_sessions,
             "database": "connected",
+            "history_cache": _history_cache.stats() if _history_cache is not None else None,
         }
     except Exception as e:
         raise HTTPException(status_code=503, detail=str(e))
 
 
+def _source_json(result: dict, include_content: bool = True) -> dict:
+    """Source d'une reponse (resultat de recherche) au format DocumentResult.
+
+    Sans contenu, la source est une reference (id, titre, scores) que le client
+    complete a la demande avec GET /events/{id} ou POST /events/batch.
+    """
+    source = {
+        "id": result["document"].get("id"),
+        "title": result["document"]["title"],
+        "similarity": result["similarity"],
+        "distance": result["distance"],
+    }
+    if include_content:
+        source["content"] = result["document"]["content"]
+        source["metadata"] = result["document"]["metadata"]
+    return source
+
+
+def _document_result(result: dict, include_content: bool = True) -> DocumentResult:
+    """Convertit un resultat de recherche en DocumentResult."""
+    return DocumentResult(**_source_json(result, include_content))
+
+
+def _debug_info(candidates: list[dict], selected: list[dict]) -> DebugInfo:
+    """Durees de la requete en cours (Server-Timing) et scores des candidats."""
+    timer = current_timer()
+    selected_ids = {r["document"].get("id") for r in selected}
+    return DebugInfo(
+        timings_ms=timer.as_dict() if timer is not None else {},
+        candidates=[
+            CandidateScore(
+                id=r["document"].get("id"),
+                title=r["document"]["title"],
+                similarity=r["similarity"],
+                selected=r["document"].get("id") in selected_ids,
+            )
+            for r in candidates
+        ],
+    )
+
+
 @app.post("/search", response_model=SearchResponse)
 async def search(request: SearchRequest):
     try:
         rag = get_rag_engine()
-        results = rag.search(request.query, top_k=request.top_k)
+        deadline = request_deadline()
+        # The deadline bounds the wait for a thread and the stages of the search
+        results = await run_engine(
+            functools.partial(rag.search, deadline=deadline),
+            request.query,
+            top_k=request.top_k,
+            city=request.city,
+            deadline=deadline,
+        )
         return SearchResponse(
-            results=[
-                DocumentResult(
-                    title=r["document"]["title"],
-                    content=r["document"]["content"],
-                    metadata=r["document"]["metadata"],
-                    similarity=r["similarity"],
-                    distance=r["distance"],
-                )
-                for r in results
-            ],
+            results=[_document_result(r, request.include_content) for r in results],
             query=request.query,
+            debug=_debug_info(results, results) if request.debug else None,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest, db: AsyncSession = Depends(get_db)):
-    """Chat avec mémoire des 5 derniers échanges."""
+async def chat(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """Chat avec mémoire : résumé glissant + derniers échanges plafonnés en tokens."""
     try:
         rag = get_rag_engine()
-        session_repo = SessionRepository(db)
-        message_repo = MessageRepository(db)
+        unit_of_work = ChatUnitOfWork(db)
+        asked_at = datetime.utcnow()
+        deadline = request_deadline()
 
         # Parse or generate session_id
         if request.session_id:
@@ -156,74 +556,72 @@ async def chat(request: ChatRequest, db: AsyncSession = Depends(get_db)):
         else:
             session_id = uuid.uuid4()
 
-        # Get or create session
-        session = await session_repo.get_by_id(session_id)
-        if not session:
-            session = await session_repo.create(session_id=session_id)
-
-        # Get conversation history (limited to MAX_HISTORY * 2 messages)
-        history = await message_repo.get_session_history(
-            session_id=session_id,
-            limit=MAX_HISTORY * 2,
-        )
+        # Conversation history: rolling summary + messages not yet summarized,
+        # including those still waiting in the write-behind queue (no query
+        # when the session is in the history cache).
+        # The session is created with the first exchange (save_exchange).
+        metadata, messages = await load_session_history(unit_of_work, session_id)
+        history = build_history(metadata.get("summary"), messages)
 
         # Track latency
         start_time = time.time()
 
         # Appel RAG avec historique
-        result = rag.chat(request.query, top_k=request.top_k, history=history)
+        # The deadline bounds the wait for a thread and the stages of the pipeline
+        result = await run_engine(
+            functools.partial(rag.chat, deadline=deadline),
+            request.query,
+            top_k=request.top_k,
+            history=history,
+            deadline=deadline,
+        )
 
         # Calculate latency
         latency_ms = (time.time() - start_time) * 1000
 
-        # Save user message
-        await message_repo.create(
-            session_id=session_id,
-            role="user",
-            content=request.query,
-            query_type="chat",
-        )
-
         # Convert sources to list for JSON serialization
-        sources_json = [
-            {
-                "title": r["document"]["title"],
-                "content": r["document"]["content"],
-                "metadata": r["document"]["metadata"],
-                "similarity": r["similarity"],
-                "distance": r["distance"],
-            }
-            for r in result["sources"]
-        ]
-
-        # Save assistant message with metadata
-        await message_repo.create(
+        sources_json = [_source_json(r) for r in result["sources"]]
+
+        # Upsert session + both messages (one transaction), written in the
+        # background by the write-behind queue when it is enabled
+        exchange = ChatExchange(
             session_id=session_id,
-            role="assistant",
-            content=result["response"],
+            query=request.query,
+            response=result["response"],
+            asked_at=asked_at,
+            answered_at=datetime.utcnow(),
             sources=sources_json,
             latency_ms=latency_ms,
             top_k=request.top_k,
             query_type="chat",
         )
+        if _message_writer is not None:
+            try:
+                await _message_writer.submit(exchange)
+            except WriteBehindFull as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Base de donnees saturee : {e}",
+                    headers={"Retry-After": str(math.ceil(settings.message_buffer_timeout))},
+                ) from e
+        else:
+            await unit_of_work.save_exchanges([exchange])
+        if _history_cache is not None:
+            _history_cache.append(session_id, exchange.messages())
 
-        # Update session timestamp
-        await session_repo.update_timestamp(session_id)
+        # Fold older turns into the rolling summary after the response is sent
+        background_tasks.add_task(update_session_summary, session_id)
 
         return ChatResponse(
             response=result["response"],
-            sources=[
-                DocumentResult(
-                    title=r["document"]["title"],
-                    content=r["document"]["content"],
-                    metadata=r["document"]["metadata"],
-                    similarity=r["similarity"],
-                    distance=r["distance"],
-                )
-                for r in result["sources"]
-            ],
+            sources=[_document_result(r, request.include_content) for r in result["sources"]],
             query=result["query"],
             session_id=str(session_id),
+            debug=(
+                _debug_info(result.get("candidates", []), result["sources"])
+                if request.debug
+                else None
+            ),
         )
     except HTTPException:
         raise
@@ -231,6 +629,181 @@ async def chat(request: ChatRequest, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Taches de fond des connexions WebSocket (references gardees jusqu'a leur fin)
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _stream_chat(
+    websocket: WebSocket, request: ChatRequest, history: list[dict], deadline: float | None
+) -> tuple[str, list[dict]]:
+    """Execute RAGEngine.chat_stream dans le pool du moteur et relaie ses evenements.
+
+    Returns:
+        (reponse complete, sources au format DocumentResult)
+    """
+    rag = get_rag_engine()
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[dict | None] = asyncio.Queue()
+    stopped = threading.Event()
+
+    def produce() -> None:
+        for event in rag.chat_stream(
+            request.query, top_k=request.top_k, history=history, deadline=deadline
+        ):
+            if stopped.is_set():
+                return  # Client gone or deadline passed: stop generating
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+    producer = asyncio.ensure_future(get_engine_executor().run(produce, deadline=deadline))
+    producer.add_done_callback(lambda _: events.put_nowait(None))
+    tokens, sources = [], []
+    try:
+        while (event := await events.get()) is not None:
+            if event["type"] == "sources":
+                sources = [_source_json(r) for r in event["sources"]]
+                event = {
+                    **event,
+                    "sources": [_source_json(r, request.include_content) for r in event["sources"]],
+                }
+            else:
+                tokens.append(event["content"])
+            await websocket.send_json(event)
+        producer.result()  # Overloaded / DeadlineExceeded / engine errors
+    finally:
+        stopped.set()
+    return "".join(tokens), sources
+
+
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket, session_id: str | None = None):
+    """Chat en flux : la session reste en memoire pendant toute la connexion.
+
+    L'historique est lu une fois a la connexion, puis tenu a jour en memoire ;
+    les echanges sont ecrits en tache de fond (file d'ecriture differee).
+
+    Protocole (JSON) :
+    - serveur : {"type": "session", "session_id"} a la connexion ;
+    - client : {"query": str, "top_k": int} par question ;
+    - serveur : {"type": "sources"}, des {"type": "token", "content"}, puis
+      {"type": "done", "response", "latency_ms"} ou {"type": "error", "status", "detail"}.
+
+    Une erreur sur une question n'interrompt pas la connexion ; si l'historique
+    ne peut etre lu a la connexion, elle est fermee (code 1011).
+    """
+    await websocket.accept()
+    if session_id:
+        try:
+            session_uuid = uuid.UUID(session_id)
+        except ValueError:
+            # 1008: policy violation
+            await websocket.close(code=1008, reason="Invalid session_id format")
+            return
+    else:
+        session_uuid = uuid.uuid4()
+
+    try:
+        async with get_session_maker()() as db:
+            metadata, messages = await load_session_history(ChatUnitOfWork(db), session_uuid)
+    except Exception:
+        logger.exception("Echec du chargement de la session %s", session_uuid)
+        # 1011: internal error
+        await websocket.close(code=1011, reason="Session history unavailable")
+        return
+    summary = metadata.get("summary")
+    summary_task: asyncio.Task | None = None
+
+    async def send_error(status_code: int, detail, **extra) -> None:
+        await websocket.send_json(
+            {"type": "error", "status": status_code, "detail": detail, **extra}
+        )
+
+    await websocket.send_json({"type": "session", "session_id": str(session_uuid)})
+    try:
+        while True:
+            try:
+                request = ChatRequest.model_validate_json(await websocket.receive_text())
+            except ValidationError as e:
+                await send_error(422, e.errors(include_url=False, include_context=False))
+                continue
+
+            # Older turns folded into the summary since the last question
+            if summary_task is not None and summary_task.done():
+                folded = summary_task.result()
+                if folded is not None:
+                    summary, count = folded
+                    del messages[:count]
+                summary_task = None
+
+            asked_at = datetime.utcnow()
+            deadline = request_deadline()
+            start_time = time.time()
+            try:
+                response, sources = await _stream_chat(
+                    websocket, request, build_history(summary, messages), deadline
+                )
+            except Overloaded as e:
+                await send_error(503, str(e), retry_after=e.retry_after)
+                continue
+            except DeadlineExceeded as e:
+                await send_error(504, str(e))
+                continue
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.exception("Echec de la reponse en flux (session %s)", session_uuid)
+                await send_error(500, str(e))
+                continue
+
+            exchange = ChatExchange(
+                session_id=session_uuid,
+                query=request.query,
+                response=response,
+                asked_at=asked_at,
+                answered_at=datetime.utcnow(),
+                sources=sources,
+                latency_ms=(time.time() - start_time) * 1000,
+                top_k=request.top_k,
+                query_type="chat",
+            )
+            try:
+                if _message_writer is not None:
+                    await _message_writer.submit(exchange)
+                else:
+                    async with get_session_maker()() as db:
+                        await ChatUnitOfWork(db).save_exchanges([exchange])
+            except WriteBehindFull as e:
+                await send_error(
+                    503,
+                    f"Base de donnees saturee : {e}",
+                    retry_after=math.ceil(settings.message_buffer_timeout),
+                )
+                continue
+            except Exception as e:
+                logger.exception(
+                    "Echec de l'enregistrement de l'echange (session %s)", session_uuid
+                )
+                await send_error(500, f"Echec de l'enregistrement : {e}")
+                continue
+            messages += exchange.messages()
+            if _history_cache is not None:
+                _history_cache.append(session_uuid, exchange.messages())
+
+            await websocket.send_json(
+                {
+                    "type": "done",
+                    "response": response,
+                    "session_id": str(session_uuid),
+                    "latency_ms": exchange.latency_ms,
+                }
+            )
+            if summary_task is None:
+                summary_task = asyncio.create_task(update_session_summary(session_uuid))
+                _background_tasks.add(summary_task)
+                summary_task.add_done_callback(_background_tasks.discard)
+    except WebSocketDisconnect:
+        pass
+
+
 @app.delete("/session/{session_id}")
 async def clear_session(session_id: str, db: AsyncSession = Depends(get_db)):
     """Efface l'historique d'une session."""
@@ -241,6 +814,10 @@ async def clear_session(session_id: str, db: AsyncSession = Depends(get_db)):
 
     session_repo = SessionRepository(db)
     deleted = await session_repo.delete(session_uuid)
+    if _message_writer is not None:
+        deleted = _message_writer.discard(session_uuid) > 0 or deleted
+    if _history_cache is not None:
+        _history_cache.invalidate(session_uuid)
 
     if not deleted:
         raise HTTPException(status_code=404, detail="Session non trouvée")
@@ -248,37 +825,166 @@ async def clear_session(session_id: str, db: AsyncSession = Depends(get_db)):
     return {"status": "cleared", "session_id": session_id}
 
 
-@app.get("/session/{session_id}")
-async def get_session(session_id: str, db: AsyncSession = Depends(get_db)):
-    """Recupere l'historique d'une session."""
+class SessionMessage(BaseModel):
+    """Message de l'historique d'une session."""
+
+    id: int | None = Field(None, description="None : message pas encore ecrit en base")
+    role: str
+    content: str
+    created_at: str
+    sources: list | None = None
+
+
+class SessionMessagesResponse(BaseModel):
+    """Page de l'historique d'une session."""
+
+    session_id: str
+    messages: list[SessionMessage]
+    next_cursor: str | None = Field(None, description="Curseur de la page suivante")
+
+
+def _session_message(message) -> SessionMessage:
+    """Convertit un MessageModel en SessionMessage."""
+    return SessionMessage(
+        id=message.id,
+        role=message.role,
+        content=message.content,
+        created_at=message.created_at.isoformat(),
+        sources=message.sources,
+    )
+
+
+def _pending_session_messages(exchanges: list[ChatExchange]) -> list[SessionMessage]:
+    """Messages de la file d'ecriture differee, du plus ancien au plus recent."""
+    return [
+        SessionMessage(
+            role=message["role"],
+            content=message["content"],
+            created_at=(
+                exchange.asked_at if message["role"] == "user" else exchange.answered_at
+            ).isoformat(),
+            sources=exchange.sources if message["role"] == "assistant" else None,
+        )
+        for exchange in exchanges
+        for message in exchange.messages()
+    ]
+
+
+def _parse_session_id(session_id: str) -> uuid.UUID:
+    """Valide un session_id (400 si invalide)."""
     try:
-        session_uuid = uuid.UUID(session_id)
+        return uuid.UUID(session_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid session_id format")
 
+
+@app.get("/session/{session_id}")
+async def get_session(
+    session_id: str,
+    limit: int = Query(HISTORY_FETCH_LIMIT, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """Recupere une session et ses derniers messages.
+
+    Seuls les `limit` derniers messages sont lus (un parcours d'index) ;
+    history_cursor donne les plus anciens via GET /session/{id}/messages?order=desc.
+    """
+    session_uuid = _parse_session_id(session_id)
+
     session_repo = SessionRepository(db)
     session = await session_repo.get_by_id(session_uuid)
 
-    if not session:
+    # Messages not written yet (write-behind queue)
+    pending = []
+    if _message_writer is not None:
+        pending = _message_writer.pending_exchanges(session_uuid)
+
+    if not session and not pending:
         raise HTTPException(status_code=404, detail="Session non trouvee")
 
     # Convert messages to dict format
-    history = [msg.to_dict() for msg in session.messages]
+    messages: list[MessageModel] = []
+    history_cursor = None
+    if session:
+        messages, history_cursor = await MessageRepository(db).get_page(
+            session_uuid, limit=limit, newest_first=True
+        )
+    history = [msg.to_dict() for msg in reversed(messages)]
+    history += [message for exchange in pending for message in exchange.messages()]
 
+    created_at = session.created_at if session else pending[0].asked_at
+    updated_at = session.updated_at if session and not pending else pending[-1].answered_at
     return {
         "session_id": session_id,
         "history": history,
-        "created_at": session.created_at.isoformat(),
-        "updated_at": session.updated_at.isoformat(),
+        "history_cursor": history_cursor,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
     }
 
 
+@app.get("/session/{session_id}/messages", response_model=SessionMessagesResponse)
+async def get_session_messages(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    order: Literal["asc", "desc"] = "asc",
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Historique d'une session, pagine par curseur (created_at, id).
+
+    Une page coute un parcours d'index de `limit` lignes, quelle que soit la
+    longueur de la session. Les messages pas encore ecrits (file d'ecriture
+    differee) s'ajoutent a l'extremite la plus recente : derniere page en ordre
+    asc, premiere page en ordre desc.
+
+    Args:
+        limit: Nombre maximum de messages en base par page.
+        cursor: next_cursor de la page precedente.
+        order: asc (du plus ancien) ou desc (du plus recent).
+    """
+    session_uuid = _parse_session_id(session_id)
+
+    pending = []
+    if _message_writer is not None:
+        pending = _message_writer.pending_exchanges(session_uuid)
+    exists = await SessionRepository(db).get_metadata(session_uuid) is not None
+    if not exists and not pending:
+        raise HTTPException(status_code=404, detail="Session non trouvee")
+
+    messages: list[MessageModel] = []
+    next_cursor = None
+    if exists:
+        try:
+            messages, next_cursor = await MessageRepository(db).get_page(
+                session_uuid, limit=limit, cursor=cursor, newest_first=order == "desc"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    page = [_session_message(message) for message in messages]
+    if order == "asc" and next_cursor is None:
+        page += _pending_session_messages(pending)
+    elif order == "desc" and cursor is None:
+        page = _pending_session_messages(pending)[::-1] + page
+    return SessionMessagesResponse(session_id=session_id, messages=page, next_cursor=next_cursor)
+
+
 # =============================================================================
 # REBUILD ENDPOINT
 # =============================================================================
 
-# Stockage du statut des taches de reconstruction
-rebuild_tasks: dict[str, dict] = {}
+
+class RebuildRequest(BaseModel):
+    """Requete de reconstruction (corps optionnel)."""
+
+    shard: str | None = Field(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Ville ou region du shard a reconstruire (absent : tout l'index)",
+    )
 
 
 class RebuildResponse(BaseModel):
@@ -292,14 +998,25 @@ class RebuildResponse(BaseModel):
 class RebuildStatusResponse(BaseModel):
     """Reponse de statut de reconstruction."""
 
-    status: str = Field(..., description="Statut (in_progress, completed, failed)")
+    status: str = Field(
+        ..., description="Statut (queued, in_progress, completed, failed, cancelled)"
+    )
     progress: float | None = Field(None, description="Progression (0.0 a 1.0)")
     message: str | None = Field(None, description="Message de progression")
     documents_processed: int | None = Field(None, description="Nombre de documents traites")
     embedding_dimension: int | None = Field(None, description="Dimension des embeddings")
     index_vectors: int | None = Field(None, description="Nombre de vecteurs dans l'index")
+    index_version: str | None = Field(None, description="Version d'index publiee")
+    vectors_saved: int | None = Field(
+        None, description="Occurrences regroupees (vecteurs economises)"
+    )
+    duplicates_removed: int | None = Field(
+        None, description="Quasi-doublons fusionnes (voir dedup_report.json)"
+    )
+    memory_saved_mb: float | None = Field(None, description="Memoire d'index economisee (Mo)")
     elapsed_seconds: float | None = Field(None, description="Temps ecoule en secondes")
     error: str | None = Field(None, description="Message d'erreur si echec")
+    shard: str | None = Field(None, description="Shard reconstruit (absent : tout l'index)")
 
 
 def verify_rebuild_api_key(x_api_key: str | None = Header(None, alias="X-API-Key")) -> str:
@@ -330,68 +1047,179 @@ def verify_rebuild_api_key(x_api_key: str | None = Header(None, alias="X-API-Key
 
 @app.post("/rebuild", response_model=RebuildResponse)
 async def rebuild_index(
-    background_tasks: BackgroundTasks,
+    request: RebuildRequest | None = None,
     api_key: str = Depends(verify_rebuild_api_key),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Reconstruit l'index FAISS a partir des documents sources.
 
     Necessite le header X-API-Key avec une cle valide (REBUILD_API_KEY).
-    La reconstruction s'execute en arriere-plan.
+    La reconstruction est mise en file et executee par le worker de
+    reconstruction (python -m src.worker), hors du processus de l'API.
+    Avec {"shard": "Marseille"}, seul ce shard d'un index shardé est
+    reconstruit, les autres sont repris de la version courante.
+    Une seule reconstruction a la fois : 409 si une autre est en cours.
     Utilisez GET /rebuild/{task_id} pour suivre la progression.
     """
-    from src.rag.index_builder import IndexBuilder
+    shard = shard_slug(request.shard) if request and request.shard else None
+    job_repo = RebuildJobRepository(db)
+    # Liberer la file si le worker d'une reconstruction precedente a disparu
+    await job_repo.fail_stale(settings.rebuild_job_stale_seconds)
+
+    job = await job_repo.create(shard=shard)
+    if job is None:
+        active = await job_repo.get_active()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Reconstruction deja en cours (task_id: {active.id if active else '?'})",
+        )
 
-    task_id = str(uuid.uuid4())
-    rebuild_tasks[task_id] = {"status": "in_progress", "progress": 0.0, "message": "Demarrage"}
+    return RebuildResponse(
+        status="accepted",
+        message=(
+            f"Reconstruction du shard {shard} mise en file pour le worker"
+            if shard
+            else "Reconstruction de l'index mise en file pour le worker"
+        ),
+        task_id=str(job.id),
+    )
 
-    def progress_callback(message: str, percentage: float) -> None:
-        rebuild_tasks[task_id]["progress"] = percentage
-        rebuild_tasks[task_id]["message"] = message
 
-    def run_rebuild() -> None:
-        try:
-            builder = IndexBuilder(progress_callback=progress_callback)
-            result = builder.rebuild()
+class IndexDocument(BaseModel):
+    """Document ajoute ou remplace par un delta (format rag_documents)."""
 
-            rebuild_tasks[task_id] = {
-                "status": "completed",
-                "progress": 1.0,
-                "message": "Reconstruction terminee",
-                **result,
-            }
+    id: str = Field(..., min_length=1, description="Identifiant (uid) de l'evenement")
+    title: str = Field("", description="Titre de l'evenement")
+    content: str = Field(..., min_length=1, description="Texte indexe")
+    metadata: dict = Field(default_factory=dict, description="Metadonnees de l'evenement")
 
-            # Vider le cache du RAG engine pour recharger l'index
-            get_rag_engine.cache_clear()
 
-        except Exception as e:
-            rebuild_tasks[task_id] = {
-                "status": "failed",
-                "progress": rebuild_tasks[task_id].get("progress", 0),
-                "message": "Echec de la reconstruction",
-                "error": str(e),
-            }
+class IndexDeltaRequest(BaseModel):
+    """Delta a appliquer a l'index sans reconstruction complete."""
 
-    background_tasks.add_task(run_rebuild)
+    upsert: list[IndexDocument] = Field(
+        default_factory=list, description="Documents a ajouter ou remplacer"
+    )
+    delete: list[str] = Field(default_factory=list, description="Identifiants (uid) a supprimer")
 
-    return RebuildResponse(
-        status="accepted",
-        message="Reconstruction de l'index demarree en arriere-plan",
-        task_id=task_id,
+
+class IndexDeltaResponse(BaseModel):
+    """Resultat de l'application d'un delta."""
+
+    upserted: int = Field(..., description="Evenements ajoutes ou remplaces")
+    deleted: int = Field(..., description="Evenements supprimes")
+    index_vectors: int = Field(..., description="Nombre de vecteurs dans l'index")
+    elapsed_ms: float = Field(..., description="Duree d'application en millisecondes")
+
+
+@app.post("/index/delta", response_model=IndexDeltaResponse)
+async def apply_index_delta(
+    request: IndexDeltaRequest,
+    api_key: str = Depends(verify_rebuild_api_key),
+):
+    """
+    Applique des ajouts/suppressions d'evenements a l'index en place.
+
+    Seuls les documents ajoutes sont embeddes : le delta s'applique en quelques
+    millisecondes au lieu d'une reconstruction complete. Necessite X-API-Key.
+
+    Les deltas sont serialises par le verrou de l'index (tous processus, et
+    reconstructions du worker comprises) : 503 si le verrou n'est pas obtenu
+    avant settings.index_lock_timeout.
+    """
+    from src.rag.index_builder import IndexBuilder
+    from src.rag.vectorstore import clone_vectorstore
+
+    rag = get_rag_engine()
+    if not rag._use_langchain_vectorstore or rag._vectorstore is None:
+        raise HTTPException(status_code=409, detail="Index legacy : utilisez /rebuild")
+    if rag.is_sharded:
+        raise HTTPException(status_code=409, detail="Index shardé : utilisez /rebuild")
+
+    start_time = time.perf_counter()
+    builder = IndexBuilder(documents_path=rag.documents_path, index_dir=rag.index_dir)
+    upsert = [doc.model_dump() for doc in request.upsert]
+    base_version = rag.index_version
+    vectorstore = rag._vectorstore
+
+    def run_delta():
+        with index_lock(rag.index_dir, timeout=settings.index_lock_timeout):
+            result = builder.apply_delta(
+                upsert, request.delete, clone_vectorstore(vectorstore), base_version=base_version
+            )
+            # Still under the lock: engines swap versions in publication order
+            rag.apply_delta(
+                result["vectorstore"], upsert, request.delete, version=result["version"]
+            )
+        return result
+
+    try:
+        result = await run_in_threadpool(run_delta)
+    except IndexLocked as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Index en cours d'ecriture : {e}",
+            headers={"Retry-After": str(math.ceil(settings.index_lock_timeout))},
+        ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return IndexDeltaResponse(
+        upserted=result["upserted"],
+        deleted=result["deleted"],
+        index_vectors=result["index_vectors"],
+        elapsed_ms=round((time.perf_counter() - start_time) * 1000, 2),
     )
 
 
+def _parse_task_id(task_id: str) -> uuid.UUID:
+    """Valide un task_id (UUID) ; un id mal forme ne peut pas exister : 404."""
+    try:
+        return uuid.UUID(task_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Tache non trouvee") from None
+
+
 @app.get("/rebuild/{task_id}", response_model=RebuildStatusResponse)
-async def get_rebuild_status(task_id: str):
+async def get_rebuild_status(task_id: str, db: AsyncSession = Depends(get_db)):
     """
     Recupere le statut d'une tache de reconstruction.
 
+    Le statut est lu en base : il est le meme quel que soit le worker API
+    interroge et survit aux redemarrages.
+
+    Args:
+        task_id: ID de la tache retourne par POST /rebuild.
+    """
+    job = await RebuildJobRepository(db).get(_parse_task_id(task_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Tache non trouvee")
+    return RebuildStatusResponse(**job.to_status())
+
+
+@app.post("/rebuild/{task_id}/cancel", response_model=RebuildStatusResponse)
+async def cancel_rebuild(
+    task_id: str,
+    api_key: str = Depends(verify_rebuild_api_key),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Annule une tache de reconstruction.
+
+    Une tache en file est annulee immediatement ; une tache en cours est
+    arretee par le worker a sa prochaine etape (avant la sauvegarde de
+    l'index). Necessite X-API-Key.
+
     Args:
         task_id: ID de la tache retourne par POST /rebuild.
     """
-    if task_id not in rebuild_tasks:
+    job = await RebuildJobRepository(db).request_cancel(_parse_task_id(task_id))
+    if job is None:
         raise HTTPException(status_code=404, detail="Tache non trouvee")
-    return RebuildStatusResponse(**rebuild_tasks[task_id])
+    return RebuildStatusResponse(**job.to_status())
 
 
 # =============================================================================
@@ -417,6 +1245,7 @@ class DateRange(BaseModel):
 class Event(BaseModel):
     """Evenement culturel."""
 
+    id: str | None = None
     title: str
     description: str
     location: Location
@@ -432,9 +1261,23 @@ class EventsListResponse(BaseModel):
     """Reponse de la liste des evenements."""
 
     events: list[Event]
-    total: int
+    total: int = Field(..., description="Nombre total d'evenements indexes")
     skip: int
     limit: int
+    next_cursor: str | None = Field(None, description="Curseur de la page suivante")
+
+
+class EventsBatchRequest(BaseModel):
+    """Ids des evenements a lire en un appel."""
+
+    ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+class EventsBatchResponse(BaseModel):
+    """Evenements lus par id, dans l'ordre demande."""
+
+    events: list[Event]
+    missing: list[str] = Field(default_factory=list, description="Ids inconnus de l'index")
 
 
 def _extract_description(content: str) -> str:
@@ -446,48 +1289,136 @@ def _extract_description(content: str) -> str:
     return content
 
 
+def _to_event(doc: dict) -> Event:
+    """Convertit un document indexe en Event."""
+    metadata = doc.get("metadata", {})
+    return Event(
+        id=doc.get("id"),
+        title=doc.get("title", ""),
+        description=_extract_description(doc.get("content", "")),
+        location=Location(
+            city=metadata.get("city", ""),
+            address=metadata.get("address"),
+        ),
+        date_range=DateRange(
+            start=metadata.get("start_date", ""),
+            end=metadata.get("end_date", ""),
+        ),
+        is_free=metadata.get("is_free"),
+        url=metadata.get("url"),
+    )
+
+
 @app.get("/events", response_model=EventsListResponse)
-async def list_events(skip: int = 0, limit: int = 100):
+async def list_events(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    sort: Literal["start_date", "city"] = "start_date",
+    city: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    free: bool | None = None,
+):
     """
-    Liste tous les evenements indexes.
+    Liste les evenements indexes, filtres et tries.
+
+    La liste s'appuie sur l'index de listing du moteur (voir src.rag.listing) :
+    une page coute O(limit) quelle que soit sa profondeur. La pagination par
+    curseur (next_cursor) est a preferer a skip, conserve pour compatibilite.
+    L'ETag change avec la version d'index : If-None-Match renvoie 304.
 
     Args:
-        skip: Nombre d'evenements a sauter (pagination).
+        skip: Nombre d'evenements a sauter (pagination par offset).
         limit: Nombre maximum d'evenements a retourner.
+        cursor: next_cursor de la page precedente.
+        sort: Tri par date de debut ou par ville (puis date de debut).
+        city: Evenements d'une ville.
+        date_from: Evenements se terminant a partir de cette date (ISO).
+        date_to: Evenements commencant au plus tard a cette date (ISO, incluse).
+        free: Evenements gratuits (true) ou payants (false).
 
     Returns:
         Liste paginee des evenements.
     """
-    try:
-        rag = get_rag_engine()
-        events = []
-
-        for doc in rag.documents:
-            metadata = doc.get("metadata", {})
-            events.append(
-                Event(
-                    title=doc.get("title", ""),
-                    description=_extract_description(doc.get("content", "")),
-                    location=Location(
-                        city=metadata.get("city", ""),
-                        address=metadata.get("address"),
-                    ),
-                    date_range=DateRange(
-                        start=metadata.get("start_date", ""),
-                        end=metadata.get("end_date", ""),
-                    ),
-                    url=metadata.get("url"),
-                )
-            )
+    rag = get_rag_engine()
+    listing = rag.listing
 
-        total = len(events)
-        paginated = events[skip : skip + limit]
+    query = hashlib.blake2b(str(request.query_params).encode("utf-8"), digest_size=8)
+    etag = f'W/"{listing.etag}-{query.hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        record_cache("events_etag", etag in if_none_match)
+        if etag in if_none_match:
+            return Response(status_code=304, headers={"ETag": etag})
 
-        return EventsListResponse(
-            events=paginated,
-            total=total,
-            skip=skip,
-            limit=limit,
+    try:
+        page = listing.page(
+            limit,
+            sort=sort,
+            cursor=cursor,
+            offset=skip,
+            city=city,
+            date_from=date_from,
+            date_to=date_to,
+            free=free,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        events = [_to_event(rag.documents[row]) for row in page.rows]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    response.headers["ETag"] = etag
+    return EventsListResponse(
+        events=events,
+        total=len(listing),
+        skip=skip,
+        limit=limit,
+        next_cursor=page.next_cursor,
+    )
+
+
+@app.get("/events/{event_id}", response_model=Event)
+async def get_event(event_id: str, request: Request, response: Response):
+    """
+    Lit un evenement par id (table id -> ligne du docstore, O(1)).
+
+    Permet de completer a la demande les sources renvoyees sans contenu par
+    /search et /chat (include_content=false). ETag lie a la version d'index.
+    """
+    rag = get_rag_engine()
+    key = hashlib.blake2b(event_id.encode("utf-8"), digest_size=8)
+    etag = f'W/"{rag.listing.etag}-{key.hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        record_cache("events_etag", etag in if_none_match)
+        if etag in if_none_match:
+            return Response(status_code=304, headers={"ETag": etag})
+
+    document = rag.get_events([event_id]).get(event_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    response.headers["ETag"] = etag
+    return _to_event(document)
+
+
+@app.post("/events/batch", response_model=EventsBatchResponse)
+async def get_events_batch(request: EventsBatchRequest):
+    """
+    Lit plusieurs evenements par id en un appel.
+
+    Returns:
+        Evenements dans l'ordre des ids demandes (doublons ignores), et ids inconnus.
+    """
+    rag = get_rag_engine()
+    ids = list(dict.fromkeys(request.ids))
+    documents = rag.get_events(ids)
+    return EventsBatchResponse(
+        events=[_to_event(documents[doc_id]) for doc_id in ids if doc_id in documents],
+        missing=[doc_id for doc_id in ids if doc_id not in documents],
+    )
@@ -18,6 +18,11 @@ TESTS_DATA_DIR = PROJECT_ROOT / "tests" / "data"
 # =============================================================================
 OPENAGENDA_BASE_URL = "https://api.openagenda.com/v2"
 OPENAGENDA_EVENTS_ENDPOINT = "/agendas/{agenda_uid}/events"
+OPENDATASOFT_EVENTS_URL = (
+    "https://public.opendatasoft.com/api/explore/v2.1/catalog/datasets/"
+    "evenements-publics-openagenda/records"
+)
+OPENDATASOFT_PAGE_SIZE = 100  # Maximum records per request on OpenDataSoft
 
 # =============================================================================
 # MODEL NAMES AND VERSIONS
@@ -39,6 +44,8 @@ DEFAULT_CHUNK_OVERLAP = 50  # Overlap between chunks
 DEFAULT_BATCH_SIZE = 32  # For embedding generation
 DEFAULT_REQUEST_TIMEOUT = 30  # API request timeout in seconds
 DEFAULT_MAX_RETRIES = 3  # Maximum retries for failed requests
+DEFAULT_FETCH_CONCURRENCY = 4  # Concurrent page requests during ingestion
+EVENT_HISTORY_DAYS = 365  # Events ended before this many days are not ingested
 
 # =============================================================================
 # PROMPT TEMPLATES
@@ -102,6 +109,24 @@ Personnalité :
 
 {context}"""
 
+# Rolling conversation summary prompt (memory compression)
+SUMMARY_PROMPT_TEMPLATE = """Tu maintiens le résumé d'une conversation entre un utilisateur et un assistant \
+qui l'aide à trouver des événements culturels.
+
+Résumé actuel :
+{summary}
+
+Nouveaux messages à intégrer :
+{messages}
+
+Rédige le résumé mis à jour en quelques phrases. Conserve les préférences de l'utilisateur \
+(villes, dates, types d'événements, budget) et les événements déjà recommandés.
+
+Résumé :"""
+
+# Prefix used when the summary is injected into the conversation history
+SUMMARY_HISTORY_PREFIX = "Résumé de la conversation précédente :"
+
 # =============================================================================
 # VALIDATION CONSTANTS
 # =============================================================================
@@ -131,6 +156,8 @@ EVENT_CATEGORIES = [
 # =============================================================================
 RAW_EVENTS_FILE = "events_raw.json"
 PROCESSED_EVENTS_FILE = "events_processed.json"
+RAG_DOCUMENTS_FILE = "rag_documents.json"
+RAG_DOCUMENTS_JSONL_FILE = "rag_documents.jsonl"
 FAISS_INDEX_FILE = "index.faiss"
 FAISS_METADATA_FILE = "index.pkl"
 TEST_QUESTIONS_FILE = "test_questions.json"
@@ -1,10 +1,13 @@
 """Application settings module using Pydantic Settings."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.config.constants import DEFAULT_CHUNK_OVERLAP, DEFAULT_CHUNK_SIZE
+
 
 class Settings(BaseSettings):
     """Application configuration loaded from environment variables."""
@@ -32,6 +35,30 @@ class Settings(BaseSettings):
     index_path: Path = Field(
         Path("data/indexes/faiss_index"), description="Path to FAISS index directory"
     )
+    index_keep_versions: int = Field(
+        3, ge=1, le=50, description="Number of index versions kept on disk"
+    )
+    index_watch_interval: float = Field(
+        5.0, ge=0.0, description="Seconds between index manifest checks (0 to disable)"
+    )
+    index_lock_timeout: float = Field(
+        30.0, gt=0.0, description="Seconds an index delta waits for a rebuild or another delta"
+    )
+    index_shard_by: Literal["none", "city", "region"] = Field(
+        "none", description="Build one index shard per city or region ('none' for one index)"
+    )
+    shard_search_workers: int = Field(
+        4, ge=1, le=64, description="Threads searching shards in parallel"
+    )
+    engine_workers: int = Field(
+        8, ge=1, le=256, description="Threads running RAG engine calls (search, LLM)"
+    )
+    engine_queue_size: int = Field(
+        16, ge=0, description="RAG engine calls waiting for a thread before 503 rejections"
+    )
+    engine_request_timeout: float = Field(
+        60.0, ge=0.0, description="Deadline in seconds of /search and /chat (0 to disable)"
+    )
     max_events: int = Field(10000, description="Maximum number of events to fetch")
     default_location: str | None = Field(
         "marseille", description="Default location for event search"
@@ -43,6 +70,19 @@ class Settings(BaseSettings):
     mistral_embedding_model: str = Field(
         "mistral-embed", description="Mistral embedding model name (dimension: 1024)"
     )
+    chunk_size: int = Field(
+        DEFAULT_CHUNK_SIZE, ge=100, description="Maximum characters per embedded chunk"
+    )
+    chunk_overlap: int = Field(
+        DEFAULT_CHUNK_OVERLAP, ge=0, description="Characters shared by consecutive chunks"
+    )
+    dedup_enabled: bool = Field(False, description="Merge near-duplicate events at build time")
+    dedup_similarity_threshold: float = Field(
+        0.95,
+        ge=0.5,
+        le=1.0,
+        description="Cosine similarity above which two events are considered duplicates",
+    )
 
     # =============================================================================
     # LLM CONFIGURATION
@@ -58,6 +98,31 @@ class Settings(BaseSettings):
     min_similarity_score: float = Field(
         0.3, ge=0.0, le=1.0, description="Minimum similarity score threshold"
     )
+    score_gap_ratio: float = Field(
+        0.2,
+        ge=0.0,
+        le=1.0,
+        description="Relative score drop between consecutive results that stops the context",
+    )
+    max_context_documents: int = Field(
+        5, ge=1, le=20, description="Maximum number of documents sent to the LLM"
+    )
+    chunk_overfetch: int = Field(
+        4, ge=1, le=20, description="Chunks fetched per requested event before aggregation"
+    )
+    chunk_pooling: Literal["max", "sum"] = Field(
+        "max", description="How chunk similarities are pooled into an event score"
+    )
+
+    # =============================================================================
+    # CONVERSATION MEMORY
+    # =============================================================================
+    history_max_tokens: int = Field(
+        1500, ge=0, le=32000, description="Token budget for verbatim conversation history"
+    )
+    summary_max_tokens: int = Field(
+        300, ge=1, le=4096, description="Maximum tokens for the rolling conversation summary"
+    )
 
     # =============================================================================
     # API CONFIGURATION (if using FastAPI)
@@ -76,6 +141,76 @@ class Settings(BaseSettings):
     streamlit_port: int = Field(8501, ge=1, le=65535, description="Streamlit port")
     streamlit_server_address: str = Field("0.0.0.0", description="Streamlit server address")
 
+    # =============================================================================
+    # REBUILD WORKER CONFIGURATION
+    # =============================================================================
+    rebuild_worker_poll_interval: float = Field(
+        2.0, gt=0.0, description="Seconds between queue polls and progress writes"
+    )
+    rebuild_worker_max_memory_mb: int = Field(
+        4096, ge=0, description="Address space limit of the rebuild worker (0 for no limit)"
+    )
+    rebuild_worker_nice: int = Field(
+        10, ge=0, le=19, description="CPU niceness added to the rebuild worker"
+    )
+    rebuild_job_stale_seconds: float = Field(
+        300.0, gt=0.0, description="Heartbeat age after which a running job is failed"
+    )
+
+    # =============================================================================
+    # MESSAGE WRITE-BEHIND (see src.database.write_behind)
+    # =============================================================================
+    message_write_behind: bool = Field(
+        True, description="Write /chat messages in background batches instead of inline"
+    )
+    message_flush_interval: float = Field(
+        0.2, gt=0.0, description="Maximum seconds before buffered messages are written"
+    )
+    message_flush_batch_size: int = Field(
+        100, ge=1, description="Buffered exchanges that trigger an immediate write"
+    )
+    message_buffer_size: int = Field(
+        2000, ge=1, description="Maximum buffered exchanges before /chat waits for room"
+    )
+    message_buffer_timeout: float = Field(
+        2.0, gt=0.0, description="Seconds /chat waits for room before failing with 503"
+    )
+    message_shutdown_timeout: float = Field(
+        10.0, gt=0.0, description="Seconds allowed to write buffered messages on shutdown"
+    )
+    message_spill_dir: Path = Field(
+        Path("data/pending_messages"),
+        description="Directory of the messages not written at shutdown (replayed on start)",
+    )
+    session_cache_size: int = Field(
+        1000, ge=0, description="Session histories cached per worker for /chat (0 to disable)"
+    )
+    session_cache_max_bytes: int = Field(
+        64 * 1024 * 1024, ge=1, description="Estimated memory limit of the session history cache"
+    )
+    session_cache_ttl: float = Field(
+        300.0, gt=0.0, description="Seconds before a cached session history is read again"
+    )
+
+    # =============================================================================
+    # SESSION RETENTION (see src.worker.retention)
+    # =============================================================================
+    session_ttl_days: float = Field(
+        30.0, ge=0.0, description="Days without an exchange before a session is purged (0: kept)"
+    )
+    session_purge_interval: float = Field(
+        3600.0, gt=0.0, description="Seconds between two retention passes of the worker"
+    )
+    session_purge_batch_size: int = Field(
+        500, ge=1, description="Expired sessions deleted per transaction"
+    )
+    message_partitions_ahead: int = Field(
+        2, ge=1, description="Monthly messages partitions created ahead of the current month"
+    )
+    message_retention_months: int = Field(
+        0, ge=0, description="Monthly messages partitions kept before being dropped (0: kept)"
+    )
+
     # =============================================================================
     # DATABASE CONFIGURATION (POSTGRESQL)
     # =============================================================================
@@ -0,0 +1,93 @@
+"""RAG documents file access (JSON array or JSON Lines)."""
+
+import json
+import re
+from collections.abc import Container, Iterable
+from pathlib import Path
+from typing import IO
+
+from src.config.constants import PROCESSED_DATA_DIR, RAG_DOCUMENTS_FILE, RAG_DOCUMENTS_JSONL_FILE
+
+# Leading id of a line written by write_jsonl, when it needs no unescaping
+_LINE_ID = re.compile(r'\{"id": "([^"\\]*)"')
+
+
+def default_documents_path() -> Path:
+    """
+    Get the default RAG documents file.
+
+    The JSONL output of the ingestion pipeline takes precedence over the
+    legacy JSON file produced by the notebooks.
+
+    Returns:
+        Path to rag_documents.jsonl if it exists, rag_documents.json otherwise
+    """
+    jsonl_path = PROCESSED_DATA_DIR / RAG_DOCUMENTS_JSONL_FILE
+    if jsonl_path.exists():
+        return jsonl_path
+    return PROCESSED_DATA_DIR / RAG_DOCUMENTS_FILE
+
+
+def read_documents(path: Path) -> list[dict]:
+    """
+    Read RAG documents from a JSON array or a JSON Lines file.
+
+    Args:
+        path: Documents file (.jsonl for JSON Lines, JSON array otherwise)
+
+    Returns:
+        List of document dictionaries (id, title, content, metadata)
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        documents: list[dict] = json.load(f)
+        return documents
+
+
+def write_jsonl(documents: Iterable[dict], f: IO[str]) -> int:
+    """
+    Write documents as JSON Lines.
+
+    Args:
+        documents: RAG document dictionaries
+        f: Text file opened for writing
+
+    Returns:
+        Number of documents written
+    """
+    count = 0
+    for doc in documents:
+        f.write(json.dumps(doc, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def copy_jsonl_except(source: IO[str], target: IO[str], excluded_ids: Container[str]) -> int:
+    """
+    Copy JSON Lines documents, skipping some ids.
+
+    Kept lines are copied verbatim: only their id is read, from the line
+    prefix written by write_jsonl when possible, so unchanged documents are
+    neither decoded nor re-encoded.
+
+    Args:
+        source: JSON Lines file opened for reading
+        target: Text file opened for writing
+        excluded_ids: Ids of the documents not copied
+
+    Returns:
+        Number of documents copied
+    """
+    count = 0
+    for line in source:
+        if not line.strip():
+            continue
+        match = _LINE_ID.match(line)
+        doc_id = match.group(1) if match else json.loads(line).get("id")
+        if doc_id in excluded_ids:
+            continue
+        target.write(line if line.endswith("\n") else line + "\n")
+        count += 1
+    return count
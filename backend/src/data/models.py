@@ -5,6 +5,16 @@ from typing import Optional
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
+FREE_PRICE_WORDS = ("gratuit", "free", "libre", "0€", "0 €", "0 euros")
+
+
+def is_free_price(price: str | None) -> bool:
+    """Check if a price or pricing description denotes a free event."""
+    if not price:
+        return False
+    price_lower = price.lower()
+    return any(word in price_lower for word in FREE_PRICE_WORDS)
+
 
 class Coordinates(BaseModel):
     """Geographic coordinates."""
@@ -94,12 +104,7 @@ class Event(BaseModel):
     @property
     def is_free(self) -> bool:
         """Check if event is free."""
-        if not self.price:
-            return False
-        price_lower = self.price.lower()
-        return any(
-            word in price_lower for word in ["gratuit", "free", "libre", "0€", "0 €", "0 euros"]
-        )
+        return is_free_price(self.price)
 
     @property
     def is_upcoming(self) -> bool:
@@ -1,4 +1,4 @@
-"""Database module for PostgreSQL session and message persistence."""
+"""Database module for PostgreSQL session, message and rebuild job persistence."""
 
 from src.database.connection import (
     close_db,
@@ -7,15 +7,32 @@ from src.database.connection import (
     get_session_maker,
     init_db,
 )
-from src.database.models import Base, MessageModel, SessionModel
-from src.database.repository import MessageRepository, SessionRepository
+from src.database.history_cache import SessionHistoryCache
+from src.database.models import Base, MessageModel, RebuildJobModel, SessionModel
+from src.database.partitions import MessagePartitionRepository
+from src.database.repository import (
+    ChatExchange,
+    ChatUnitOfWork,
+    MessageRepository,
+    RebuildJobRepository,
+    SessionRepository,
+)
+from src.database.write_behind import MessageWriteBehind, WriteBehindFull
 
 __all__ = [
     "Base",
     "MessageModel",
+    "RebuildJobModel",
     "SessionModel",
+    "ChatExchange",
+    "ChatUnitOfWork",
+    "MessagePartitionRepository",
     "MessageRepository",
+    "MessageWriteBehind",
+    "RebuildJobRepository",
+    "SessionHistoryCache",
     "SessionRepository",
+    "WriteBehindFull",
     "close_db",
     "get_db",
     "get_engine",
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import (
 from src.config.settings import settings
 
 from .models import Base
+from .partitions import MessagePartitionRepository, add_months, month_start
 
 # Global engine instance
 _engine: AsyncEngine | None = None
@@ -84,12 +85,23 @@ async def init_db() -> None:
     Initialize database by creating all tables.
 
     Should be called once at application startup.
-    Creates all tables defined in Base metadata.
+    Creates all tables defined in Base metadata, then the partitions of the
+    messages table up to settings.message_partitions_ahead months ahead
+    (a partitioned table without partitions refuses every insert).
     """
     engine = get_engine()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    async with get_session_maker()() as db:
+        partitions = MessagePartitionRepository(db)
+        if await partitions.is_partitioned():
+            await partitions.create_default_partition()
+            current = month_start()
+            await partitions.create_partitions(
+                current, add_months(current, settings.message_partitions_ahead)
+            )
+
 
 async def close_db() -> None:
     """
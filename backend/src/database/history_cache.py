@@ -0,0 +1,195 @@
+"""In-process LRU cache of recent session histories.
+
+/chat needs, for each turn, the session metadata (rolling summary) and the
+messages not folded into the summary yet. This worker wrote them itself on the
+previous turn, so they are kept here instead of being read back from
+PostgreSQL:
+
+- an entry is filled by a history read (cache miss), then updated
+  write-through with each exchange the worker writes (append) and each summary
+  fold (fold); DELETE /session invalidates it;
+- the cache is bounded by entries (settings.session_cache_size) and estimated
+  bytes (settings.session_cache_max_bytes), least recently used first out;
+- entries expire after settings.session_cache_ttl seconds, which bounds how
+  stale a session written by another worker can be;
+- hits and misses feed rag_cache_requests_total{cache="session_history"},
+  entries and bytes the rag_cache_entries / rag_cache_bytes gauges.
+
+Used from the event loop only (no locking).
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.config.settings import settings
+from src.utils.metrics import CACHE_BYTES, CACHE_ENTRIES, record_cache
+
+CACHE_NAME = "session_history"
+MESSAGE_OVERHEAD = 232  # Bytes of a {"role", "content"} dict, besides the content
+
+
+@dataclass
+class CachedHistory:
+    """Metadata and unsummarized messages of a session, oldest first."""
+
+    metadata: dict
+    messages: list[dict[str, str]]
+    loaded_at: float
+    size: int = 0
+
+    def estimate_size(self) -> int:
+        """Approximate memory held by the entry, in bytes."""
+        summary = self.metadata.get("summary") or ""
+        return (
+            sys.getsizeof(summary)
+            + MESSAGE_OVERHEAD
+            + sum(MESSAGE_OVERHEAD + sys.getsizeof(m["content"]) for m in self.messages)
+        )
+
+
+class SessionHistoryCache:
+    """Bounded LRU of session histories, updated write-through."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        max_messages: int = 50,
+    ):
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Maximum cached sessions (default: settings)
+            max_bytes: Maximum estimated bytes (default: settings)
+            ttl: Seconds after which an entry is read again (default: settings)
+            max_messages: Messages kept per session (the size of a history read)
+        """
+        self.max_entries = max_entries or settings.session_cache_size
+        self.max_bytes = max_bytes or settings.session_cache_max_bytes
+        self.ttl = ttl or settings.session_cache_ttl
+        self.max_messages = max_messages
+        self._entries: OrderedDict[UUID, CachedHistory] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated memory held by the cached histories."""
+        return self._bytes
+
+    def get(self, session_id: UUID) -> tuple[dict, list[dict[str, str]]] | None:
+        """
+        Get the history of a session.
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            (metadata, messages) copies, or None on a miss or an expired entry
+        """
+        entry = self._entries.get(session_id)
+        if entry is not None and time.monotonic() - entry.loaded_at > self.ttl:
+            self._remove(session_id)
+            entry = None
+        record_cache(CACHE_NAME, entry is not None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(session_id)
+        return dict(entry.metadata), list(entry.messages)
+
+    def put(self, session_id: UUID, metadata: dict, messages: list[dict[str, str]]) -> None:
+        """
+        Cache the history read from the database.
+
+        Args:
+            session_id: Session UUID
+            metadata: Session metadata ({} for a new session)
+            messages: Unsummarized messages, oldest first
+        """
+        self._remove(session_id)
+        entry = CachedHistory(dict(metadata), messages[-self.max_messages :], time.monotonic())
+        self._store(session_id, entry)
+
+    def append(self, session_id: UUID, messages: list[dict[str, str]]) -> None:
+        """
+        Add the messages of an exchange written by this worker (write-through).
+
+        Sessions not cached are left alone: their next read goes to the database.
+        """
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        self._remove(session_id)
+        entry.messages = [*entry.messages, *messages][-self.max_messages :]
+        self._store(session_id, entry)
+
+    def fold(
+        self, session_id: UUID, previous_until: int | None, metadata: dict, count: int
+    ) -> None:
+        """
+        Apply a summary fold: new metadata, oldest messages dropped.
+
+        Args:
+            session_id: Session UUID
+            previous_until: summarized_until the fold started from
+            metadata: Metadata written by the fold
+            count: Number of messages folded into the summary
+        """
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        if entry.metadata.get("summarized_until") != previous_until:
+            # The entry was not read from the same history: read it again
+            self.invalidate(session_id)
+            return
+        self._remove(session_id)
+        entry.metadata = dict(metadata)
+        entry.messages = entry.messages[count:]
+        self._store(session_id, entry)
+
+    def invalidate(self, session_id: UUID) -> None:
+        """Forget a session (deleted, or changed elsewhere)."""
+        self._remove(session_id)
+        self._report()
+
+    def stats(self) -> dict:
+        """Hit rate and memory usage of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _store(self, session_id: UUID, entry: CachedHistory) -> None:
+        """Insert an entry as most recently used, then evict over the bounds."""
+        entry.size = entry.estimate_size()
+        self._entries[session_id] = entry
+        self._bytes += entry.size
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+        self._report()
+
+    def _remove(self, session_id: UUID) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _report(self) -> None:
+        CACHE_ENTRIES.set(len(self._entries), cache=CACHE_NAME)
+        CACHE_BYTES.set(self._bytes, cache=CACHE_NAME)
@@ -1,10 +1,11 @@
-"""SQLAlchemy models for session and message persistence."""
+"""SQLAlchemy models for session, message and rebuild job persistence."""
 
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    Boolean,
     CheckConstraint,
     DateTime,
     Float,
@@ -13,6 +14,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -34,7 +36,8 @@ class SessionModel(Base):
         created_at: Session creation timestamp
         updated_at: Session last update timestamp
         session_metadata: Additional session metadata (JSONB)
-        messages: Relationship to associated messages
+        messages: Relationship to associated messages (never loaded implicitly:
+            read them with MessageRepository, or selectinload when needed)
     """
 
     __tablename__ = "sessions"
@@ -71,19 +74,23 @@ class SessionModel(Base):
         comment="Additional session metadata",
     )
 
-    # One-to-many relationship with messages (cascade delete)
+    # One-to-many relationship with messages (cascade delete). lazy="raise":
+    # loading a session never pulls its whole history; an implicit access raises
     messages: Mapped[list["MessageModel"]] = relationship(
         "MessageModel",
         back_populates="session",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
         order_by="MessageModel.created_at",
+        passive_deletes=True,
     )
 
     # Indexes
     __table_args__ = (
         Index("ix_sessions_user_created", "user_id", "created_at"),
         Index("ix_sessions_created_at", "created_at"),
+        # Purge of the expired sessions (src.worker.retention)
+        Index("ix_sessions_updated_at", "updated_at"),
     )
 
     def __repr__(self) -> str:
@@ -97,12 +104,15 @@ class MessageModel(Base):
     """
     Message model for storing chat messages within sessions.
 
+    The table is partitioned by month on created_at (see
+    src.database.partitions): the primary key includes the partition key.
+
     Attributes:
         id: Unique message identifier (auto-increment)
         session_id: Foreign key to parent session
         role: Message role ('user' or 'assistant')
         content: Message content
-        created_at: Message creation timestamp
+        created_at: Message creation timestamp (partition key)
         sources: Retrieved sources for RAG responses (JSONB)
         latency_ms: Response latency in milliseconds
         top_k: Number of sources retrieved
@@ -137,6 +147,7 @@ class MessageModel(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         default=datetime.utcnow,
         nullable=False,
         comment="Message creation timestamp",
@@ -162,11 +173,11 @@ class MessageModel(Base):
         comment="Query type (chat or search)",
     )
 
-    # Many-to-one relationship with session
+    # Many-to-one relationship with session (explicit loading only)
     session: Mapped["SessionModel"] = relationship(
         "SessionModel",
         back_populates="messages",
-        lazy="selectin",
+        lazy="raise",
     )
 
     # Constraints
@@ -175,7 +186,10 @@ class MessageModel(Base):
             "role IN ('user', 'assistant')",
             name="check_message_role",
         ),
-        Index("ix_messages_session_created", "session_id", "created_at"),
+        # Keyset pagination of a session's history on (created_at, id)
+        Index("ix_messages_session_created_id", "session_id", "created_at", "id"),
+        # One partition per month: old months are dropped, not deleted row by row
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     def __repr__(self) -> str:
@@ -195,3 +209,140 @@ class MessageModel(Base):
             "role": self.role,
             "content": self.content,
         }
+
+
+# Statuses of a rebuild job that has not finished yet (at most one at a time)
+REBUILD_JOB_ACTIVE_STATUSES = ("queued", "in_progress")
+
+
+class RebuildJobModel(Base):
+    """
+    Rebuild job model: persistent queue of index rebuilds run by the worker.
+
+    Attributes:
+        id: Unique job identifier (UUID, returned as task_id by POST /rebuild)
+        status: Job status (queued, in_progress, completed, failed, cancelled)
+        progress: Progress from 0.0 to 1.0
+        message: Last progress message
+        result: Rebuild statistics returned by IndexBuilder.rebuild (JSONB)
+        error: Error message if the job failed
+        cancel_requested: Set by POST /rebuild/{id}/cancel, read by the worker
+        worker: Identifier of the worker process running the job
+        shard: Key of the shard to rebuild (None: whole index)
+        created_at: Job creation timestamp
+        started_at: Timestamp at which a worker claimed the job
+        finished_at: Timestamp at which the job completed, failed or was cancelled
+        heartbeat_at: Last progress write of the worker (stale jobs are failed)
+    """
+
+    __tablename__ = "rebuild_jobs"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        comment="Unique rebuild job identifier",
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default="queued",
+        nullable=False,
+        comment="Job status (queued, in_progress, completed, failed, cancelled)",
+    )
+    progress: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        nullable=False,
+        comment="Progress from 0.0 to 1.0",
+    )
+    message: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Last progress message",
+    )
+    result: Mapped[dict | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Rebuild statistics",
+    )
+    error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error message if the job failed",
+    )
+    cancel_requested: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False,
+        comment="Cancellation requested by the API",
+    )
+    worker: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="Worker process running the job",
+    )
+    shard: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+        comment="Shard to rebuild (None: whole index)",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False,
+        comment="Job creation timestamp",
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Timestamp at which a worker claimed the job",
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Job end timestamp",
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Last progress write of the worker",
+    )
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'in_progress', 'completed', 'failed', 'cancelled')",
+            name="check_rebuild_job_status",
+        ),
+        # Single-flight: a unique constant over the active rows allows only one
+        Index(
+            "ux_rebuild_jobs_single_active",
+            text("(true)"),
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'in_progress')"),
+        ),
+        Index("ix_rebuild_jobs_status_created", "status", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RebuildJobModel(id={self.id}, status={self.status}, "
+            f"progress={self.progress}, created_at={self.created_at})>"
+        )
+
+    def to_status(self) -> dict:
+        """
+        Convert job to the GET /rebuild/{task_id} response format.
+
+        Returns:
+            Dictionary with status, progress, message, error and the
+            rebuild statistics once the job has completed
+        """
+        return {
+            **(self.result or {}),
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "shard": self.shard,
+        }
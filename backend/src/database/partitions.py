@@ -0,0 +1,179 @@
+"""Monthly range partitions of the messages table.
+
+Since migration 004 the messages table is partitioned by RANGE (created_at),
+one partition per calendar month (UTC) named messages_yYYYYmMM, plus a
+messages_default partition catching rows outside the created months:
+
+- partitions are created ahead of time (settings.message_partitions_ahead),
+  by init_db at startup and by the retention pass of the worker;
+- a month older than settings.message_retention_months is removed with a
+  DROP TABLE of its partition: O(1), no row-by-row DELETE, no table bloat.
+
+Databases created before migration 004 keep an unpartitioned table: every
+operation here is then skipped (see MessagePartitionRepository.is_partitioned).
+"""
+
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.utils.metrics import observe_query
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+_PARTITION_NAME = re.compile(r"^messages_y(\d{4})m(\d{2})$")
+
+
+def month_start(moment: datetime | date | None = None) -> date:
+    """First day of the (UTC) month of a timestamp, now by default."""
+    if moment is None:
+        moment = datetime.now(UTC)
+    elif isinstance(moment, datetime) and moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after (or before) ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the messages of a month."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a monthly partition, None for other tables (default partition)."""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """CREATE TABLE statement of the partition of a month (bounds in UTC)."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+class MessagePartitionRepository:
+    """
+    Repository for the partitions of the messages table.
+
+    Provides creation of the upcoming monthly partitions and O(1) removal
+    of the old ones.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy async session
+        """
+        self.session = session
+
+    @observe_query
+    async def is_partitioned(self) -> bool:
+        """True when the messages table is partitioned (migration 004 applied)."""
+        result = await self.session.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+            ),
+            {"table": PARENT_TABLE},
+        )
+        return bool(result.scalar())
+
+    @observe_query
+    async def list_partitions(self) -> list[str]:
+        """Names of the partitions of the messages table, default partition included."""
+        result = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid) "
+                "ORDER BY child.relname"
+            ),
+            {"table": PARENT_TABLE},
+        )
+        return list(result.scalars().all())
+
+    @observe_query
+    async def create_default_partition(self) -> None:
+        """Create the default partition, catching rows outside the monthly partitions."""
+        await self.session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+                f"PARTITION OF {PARENT_TABLE} DEFAULT"
+            )
+        )
+        await self.session.commit()
+
+    @observe_query
+    async def create_partitions(self, first: date, last: date) -> list[str]:
+        """
+        Create the missing monthly partitions from ``first`` to ``last`` included.
+
+        A month whose rows already landed in the default partition cannot be
+        created (PostgreSQL refuses overlapping bounds): it is logged and
+        skipped, its rows stay readable in the default partition.
+
+        Args:
+            first: First month (first day)
+            last: Last month (first day)
+
+        Returns:
+            Names of the partitions created
+        """
+        existing = set(await self.list_partitions())
+        created = []
+        month = month_start(first)
+        while month <= last:
+            name = partition_name(month)
+            if name not in existing:
+                try:
+                    await self.session.execute(text(create_partition_sql(month)))
+                    await self.session.commit()
+                    created.append(name)
+                except DBAPIError:
+                    await self.session.rollback()
+                    logger.exception("Partition %s not created", name)
+            month = add_months(month, 1)
+        return created
+
+    @observe_query
+    async def drop_partitions_before(self, month: date) -> list[str]:
+        """
+        Drop the monthly partitions of the months before ``month``.
+
+        Each DROP TABLE removes a whole month of messages at once, whatever
+        its size. The default partition is never dropped.
+
+        Args:
+            month: First month kept (first day)
+
+        Returns:
+            Names of the partitions dropped
+        """
+        dropped = []
+        for name in await self.list_partitions():
+            partition = partition_month(name)
+            if partition is not None and partition < month:
+                await self.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        await self.session.commit()
+        return dropped
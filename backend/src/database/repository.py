@@ -1,13 +1,41 @@
 """Repository classes for database operations."""
 
-from datetime import datetime
-from typing import Optional
+import base64
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import delete, desc, select
+from sqlalchemy import case, delete, desc, func, insert, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import MessageModel, SessionModel
+from src.utils.metrics import observe_query
+
+from .models import REBUILD_JOB_ACTIVE_STATUSES, MessageModel, RebuildJobModel, SessionModel
+
+
+def encode_message_cursor(message: MessageModel) -> str:
+    """Opaque keyset cursor of a message: its (created_at, id) position."""
+    raw = json.dumps([message.created_at.isoformat(), message.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_message_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor written by encode_message_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, message_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
 
 
 class SessionRepository:
@@ -26,6 +54,7 @@ class SessionRepository:
         """
         self.session = session
 
+    @observe_query
     async def create(
         self,
         session_id: UUID | None = None,
@@ -46,16 +75,17 @@ class SessionRepository:
         session_model = SessionModel(
             id=session_id,
             user_id=user_id,
-            metadata=metadata or {},
+            session_metadata=metadata or {},
         )
         self.session.add(session_model)
         await self.session.commit()
         await self.session.refresh(session_model)
         return session_model
 
+    @observe_query
     async def get_by_id(self, session_id: UUID) -> SessionModel | None:
         """
-        Get session by ID with all related messages.
+        Get session by ID (messages are not loaded, see MessageRepository.get_page).
 
         Args:
             session_id: Session UUID
@@ -67,6 +97,23 @@ class SessionRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @observe_query
+    async def get_metadata(self, session_id: UUID) -> dict | None:
+        """
+        Get the metadata of a session without loading its messages.
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            Metadata dictionary ({} if unset), or None if the session does not exist
+        """
+        stmt = select(SessionModel.session_metadata).where(SessionModel.id == session_id)
+        result = await self.session.execute(stmt)
+        row = result.first()
+        return None if row is None else (row[0] or {})
+
+    @observe_query
     async def get_recent_messages(
         self,
         session_id: UUID,
@@ -93,6 +140,7 @@ class SessionRepository:
         # Return in chronological order (oldest first)
         return list(reversed(messages))
 
+    @observe_query
     async def delete(self, session_id: UUID) -> bool:
         """
         Delete a session and all its messages (cascade).
@@ -104,10 +152,39 @@ class SessionRepository:
             True if session was deleted, False if not found
         """
         stmt = delete(SessionModel).where(SessionModel.id == session_id)
-        result = await self.session.execute(stmt)
+        result = cast(CursorResult, await self.session.execute(stmt))
         await self.session.commit()
         return result.rowcount > 0
 
+    @observe_query
+    async def delete_expired(self, ttl_seconds: float, limit: int) -> int:
+        """
+        Delete one batch of sessions without an exchange for ``ttl_seconds``.
+
+        Messages go with their session (ON DELETE CASCADE). The batch is
+        bounded by ``limit`` so each transaction stays short; sessions locked
+        by a concurrent purge or exchange are skipped (SKIP LOCKED).
+
+        Args:
+            ttl_seconds: Age of updated_at after which a session is expired
+            limit: Maximum sessions deleted
+
+        Returns:
+            Number of sessions deleted
+        """
+        expired = (
+            select(SessionModel.id)
+            .where(SessionModel.updated_at < func.now() - timedelta(seconds=ttl_seconds))
+            .order_by(SessionModel.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(SessionModel).where(SessionModel.id.in_(expired.scalar_subquery()))
+        result = cast(CursorResult, await self.session.execute(stmt))
+        await self.session.commit()
+        return result.rowcount
+
+    @observe_query
     async def update_timestamp(self, session_id: UUID) -> SessionModel | None:
         """
         Update session's updated_at timestamp.
@@ -125,6 +202,27 @@ class SessionRepository:
             await self.session.refresh(session_model)
         return session_model
 
+    @observe_query
+    async def update_metadata(self, session_id: UUID, metadata: dict) -> bool:
+        """
+        Replace the session's metadata JSON (e.g. rolling conversation summary).
+
+        Args:
+            session_id: Session UUID
+            metadata: New metadata dictionary
+
+        Returns:
+            True if the session was updated, False if not found
+        """
+        stmt = (
+            update(SessionModel)
+            .where(SessionModel.id == session_id)
+            .values(session_metadata=metadata)
+        )
+        result = cast(CursorResult, await self.session.execute(stmt))
+        await self.session.commit()
+        return result.rowcount > 0
+
 
 class MessageRepository:
     """
@@ -142,6 +240,7 @@ class MessageRepository:
         """
         self.session = session
 
+    @observe_query
     async def create(
         self,
         session_id: UUID,
@@ -181,6 +280,7 @@ class MessageRepository:
         await self.session.refresh(message)
         return message
 
+    @observe_query
     async def get_session_history(
         self,
         session_id: UUID,
@@ -207,3 +307,521 @@ class MessageRepository:
         messages = list(result.scalars().all())
         # Return in chronological order (oldest first) and convert to dict
         return [msg.to_dict() for msg in reversed(messages)]
+
+    @observe_query
+    async def get_messages_after(
+        self,
+        session_id: UUID,
+        after_id: int | None = None,
+        limit: int = 50,
+        oldest: bool = False,
+    ) -> list[MessageModel]:
+        """
+        Get the most recent messages written after a given message.
+
+        Used to read the part of the conversation not yet folded into the
+        rolling summary stored in the session metadata.
+
+        Args:
+            session_id: Session UUID
+            after_id: Only return messages with a greater ID (None for all)
+            limit: Maximum number of messages to retrieve
+            oldest: Return the oldest messages after after_id instead
+
+        Returns:
+            List of message models ordered chronologically (oldest first)
+        """
+        stmt = select(MessageModel).where(MessageModel.session_id == session_id)
+        if after_id is not None:
+            stmt = stmt.where(MessageModel.id > after_id)
+        if oldest:
+            stmt = stmt.order_by(MessageModel.created_at).limit(limit)
+            result = await self.session.execute(stmt)
+            return list(result.scalars().all())
+        stmt = stmt.order_by(desc(MessageModel.created_at)).limit(limit)
+        result = await self.session.execute(stmt)
+        messages = list(result.scalars().all())
+        return list(reversed(messages))
+
+    @observe_query
+    async def get_page(
+        self,
+        session_id: UUID,
+        limit: int = 50,
+        cursor: str | None = None,
+        newest_first: bool = False,
+    ) -> tuple[list[MessageModel], str | None]:
+        """
+        Get one page of a session's history, by (created_at, id) keyset.
+
+        The page is a range scan of ix_messages_session_created_id starting
+        after the cursor: its cost does not depend on its depth in the history.
+
+        Args:
+            session_id: Session UUID
+            limit: Maximum number of messages in the page
+            cursor: next_cursor of the previous page (None for the first page)
+            newest_first: Walk the history from the most recent message
+
+        Returns:
+            Messages in walking order, and the cursor of the next page (None on
+            the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        key = tuple_(MessageModel.created_at, MessageModel.id)
+        stmt = select(MessageModel).where(MessageModel.session_id == session_id)
+        if cursor is not None:
+            position = tuple_(*decode_message_cursor(cursor))
+            stmt = stmt.where(key < position if newest_first else key > position)
+        if newest_first:
+            stmt = stmt.order_by(desc(MessageModel.created_at), desc(MessageModel.id))
+        else:
+            stmt = stmt.order_by(MessageModel.created_at, MessageModel.id)
+        # One extra row tells whether a next page exists
+        result = await self.session.execute(stmt.limit(limit + 1))
+        messages = list(result.scalars().all())
+        if len(messages) <= limit:
+            return messages, None
+        return messages[:limit], encode_message_cursor(messages[limit - 1])
+
+
+class ChatUnitOfWork:
+    """
+    Unit of work of one /chat exchange.
+
+    Replaces the get-or-create / create / create / update_timestamp sequence
+    (four commits, each followed by refreshes) with:
+
+    - load_history: two reads, then the read transaction is closed so no
+      connection is held while the LLM generates the answer;
+    - save_exchange(s): one transaction that upserts the sessions (creating
+      them or bumping updated_at in the same statement) and inserts the
+      messages in a single multi-row INSERT, with one commit and no refresh.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the unit of work with a database session.
+
+        Args:
+            session: SQLAlchemy async session
+        """
+        self.session = session
+
+    @observe_query
+    async def load_history(
+        self,
+        session_id: UUID,
+        limit: int = 50,
+    ) -> tuple[dict, list[MessageModel]]:
+        """
+        Read what the engine needs from a session, before generation.
+
+        Args:
+            session_id: Session UUID (the session may not exist yet)
+            limit: Maximum number of messages not yet summarized to read
+
+        Returns:
+            (session metadata, messages after metadata["summarized_until"]),
+            ({}, []) for a new session
+        """
+        metadata = await SessionRepository(self.session).get_metadata(session_id)
+        messages = []
+        if metadata is not None:
+            messages = await MessageRepository(self.session).get_messages_after(
+                session_id,
+                after_id=metadata.get("summarized_until"),
+                limit=limit,
+            )
+        # Release the connection: generation takes seconds
+        await self.session.rollback()
+        return metadata or {}, messages
+
+    @observe_query
+    async def save_exchange(
+        self,
+        session_id: UUID,
+        query: str,
+        response: str,
+        asked_at: datetime,
+        sources: list | None = None,
+        latency_ms: float | None = None,
+        top_k: int | None = None,
+        query_type: str = "chat",
+    ) -> None:
+        """
+        Persist a question and its answer in one transaction.
+
+        Args:
+            session_id: Session UUID (created if it does not exist)
+            query: User message
+            response: Assistant message
+            asked_at: Reception time of the user message (the assistant message
+                is timestamped now, so both keep their order on created_at)
+            sources: Sources of the answer
+            latency_ms: Response latency in milliseconds
+            top_k: Number of sources requested
+            query_type: Query type ('chat' or 'search')
+        """
+        await self.save_exchanges(
+            [
+                ChatExchange(
+                    session_id=session_id,
+                    query=query,
+                    response=response,
+                    asked_at=asked_at,
+                    answered_at=datetime.utcnow(),
+                    sources=sources,
+                    latency_ms=latency_ms,
+                    top_k=top_k,
+                    query_type=query_type,
+                )
+            ]
+        )
+
+    @observe_query
+    async def save_exchanges(self, exchanges: list["ChatExchange"]) -> None:
+        """
+        Persist a batch of exchanges in one transaction.
+
+        One multi-row upsert creates the sessions or bumps their updated_at,
+        one multi-row INSERT writes the messages, then a single commit.
+
+        Args:
+            exchanges: Exchanges in the order they were answered
+        """
+        if not exchanges:
+            return
+
+        # One row per session: ON CONFLICT DO UPDATE cannot touch a row twice
+        sessions: dict[UUID, dict] = {}
+        for exchange in exchanges:
+            row = sessions.setdefault(
+                exchange.session_id,
+                {
+                    "id": exchange.session_id,
+                    "session_metadata": {},
+                    "created_at": exchange.asked_at,
+                },
+            )
+            row["updated_at"] = exchange.answered_at
+
+        stmt = pg_insert(SessionModel).values(list(sessions.values()))
+        upsert = stmt.on_conflict_do_update(
+            index_elements=[SessionModel.id], set_={"updated_at": stmt.excluded.updated_at}
+        )
+        messages = insert(MessageModel).values(
+            [row for exchange in exchanges for row in exchange.message_rows()]
+        )
+        try:
+            await self.session.execute(upsert)
+            await self.session.execute(messages)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+
+@dataclass(eq=False)
+class ChatExchange:
+    """A question and its answer, as persisted by ChatUnitOfWork.save_exchanges."""
+
+    session_id: UUID
+    query: str
+    response: str
+    asked_at: datetime
+    answered_at: datetime
+    sources: list | None = None
+    latency_ms: float | None = None
+    top_k: int | None = None
+    query_type: str = "chat"
+
+    def messages(self) -> list[dict[str, str]]:
+        """User and assistant messages in RAGEngine history format."""
+        return [
+            {"role": "user", "content": self.query},
+            {"role": "assistant", "content": self.response},
+        ]
+
+    def message_rows(self) -> list[dict]:
+        """Rows of the messages table (every row lists the same columns)."""
+        return [
+            {
+                "session_id": self.session_id,
+                "role": "user",
+                "content": self.query,
+                "created_at": self.asked_at,
+                "sources": null(),
+                "latency_ms": None,
+                "top_k": None,
+                "query_type": self.query_type,
+            },
+            {
+                "session_id": self.session_id,
+                "role": "assistant",
+                "content": self.response,
+                "created_at": self.answered_at,
+                "sources": self.sources,
+                "latency_ms": self.latency_ms,
+                "top_k": self.top_k,
+                "query_type": self.query_type,
+            },
+        ]
+
+    def to_json(self) -> dict:
+        """JSON-serializable form (spill file of the write-behind queue)."""
+        return {
+            **asdict(self),
+            "session_id": str(self.session_id),
+            "asked_at": self.asked_at.isoformat(),
+            "answered_at": self.answered_at.isoformat(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ChatExchange":
+        """Rebuild an exchange written by to_json."""
+        return cls(
+            **{
+                **data,
+                "session_id": UUID(data["session_id"]),
+                "asked_at": datetime.fromisoformat(data["asked_at"]),
+                "answered_at": datetime.fromisoformat(data["answered_at"]),
+            }
+        )
+
+
+class RebuildJobRepository:
+    """
+    Repository for rebuild job database operations.
+
+    Jobs are created by the API and claimed, updated and finished by the
+    rebuild worker; any API process can read their progress.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy async session
+        """
+        self.session = session
+
+    @observe_query
+    async def create(self, shard: str | None = None) -> RebuildJobModel | None:
+        """
+        Queue a new rebuild job.
+
+        Args:
+            shard: Key of the shard to rebuild, None to rebuild the whole index
+
+        Returns:
+            Created job model, or None if a job is already queued or running
+            (single-flight, enforced by a partial unique index)
+        """
+        job = RebuildJobModel(
+            status="queued", progress=0.0, message="En attente d'un worker", shard=shard
+        )
+        self.session.add(job)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            return None
+        await self.session.refresh(job)
+        return job
+
+    @observe_query
+    async def get(self, job_id: UUID) -> RebuildJobModel | None:
+        """
+        Get job by ID.
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Job model or None if not found
+        """
+        stmt = select(RebuildJobModel).where(RebuildJobModel.id == job_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @observe_query
+    async def get_active(self) -> RebuildJobModel | None:
+        """
+        Get the queued or running job, if any.
+
+        Returns:
+            Job model or None if no rebuild is pending
+        """
+        stmt = select(RebuildJobModel).where(
+            RebuildJobModel.status.in_(REBUILD_JOB_ACTIVE_STATUSES)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @observe_query
+    async def claim_next(self, worker: str) -> RebuildJobModel | None:
+        """
+        Atomically move the oldest queued job to in_progress.
+
+        The candidate row is locked with FOR UPDATE SKIP LOCKED, so concurrent
+        workers never claim the same job.
+
+        Args:
+            worker: Identifier of the claiming worker process
+
+        Returns:
+            Claimed job model or None if the queue is empty
+        """
+        candidate = (
+            select(RebuildJobModel.id)
+            .where(RebuildJobModel.status == "queued")
+            .order_by(RebuildJobModel.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(RebuildJobModel)
+            .where(RebuildJobModel.id == candidate)
+            .values(
+                status="in_progress",
+                worker=worker,
+                message="Demarrage",
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(RebuildJobModel)
+        )
+        result = await self.session.execute(stmt)
+        job = result.scalar_one_or_none()
+        await self.session.commit()
+        return job
+
+    @observe_query
+    async def update_progress(self, job_id: UUID, progress: float, message: str | None) -> bool:
+        """
+        Write the progress of a running job and refresh its heartbeat.
+
+        Args:
+            job_id: Job UUID
+            progress: Progress from 0.0 to 1.0
+            message: Progress message
+
+        Returns:
+            True if cancellation of the job was requested
+        """
+        stmt = (
+            update(RebuildJobModel)
+            .where(RebuildJobModel.id == job_id)
+            .values(progress=progress, message=message, heartbeat_at=func.now())
+            .returning(RebuildJobModel.cancel_requested)
+        )
+        result = await self.session.execute(stmt)
+        cancel_requested = result.scalar_one_or_none()
+        await self.session.commit()
+        return bool(cancel_requested)
+
+    @observe_query
+    async def finish(
+        self,
+        job_id: UUID,
+        status: str,
+        message: str,
+        result: dict | None = None,
+        error: str | None = None,
+    ) -> bool:
+        """
+        Mark a job as completed, failed or cancelled.
+
+        Args:
+            job_id: Job UUID
+            status: Final status ('completed', 'failed' or 'cancelled')
+            message: Final progress message
+            result: Optional rebuild statistics
+            error: Optional error message
+
+        Returns:
+            True if the job was updated, False if not found
+        """
+        values: dict[str, Any] = {
+            "status": status,
+            "message": message,
+            "result": result,
+            "error": error,
+            "finished_at": func.now(),
+        }
+        if status == "completed":
+            values["progress"] = 1.0
+        stmt = update(RebuildJobModel).where(RebuildJobModel.id == job_id).values(**values)
+        result_proxy = cast(CursorResult, await self.session.execute(stmt))
+        await self.session.commit()
+        return result_proxy.rowcount > 0
+
+    @observe_query
+    async def request_cancel(self, job_id: UUID) -> RebuildJobModel | None:
+        """
+        Request cancellation of a job.
+
+        A queued job is cancelled immediately; a running job is flagged and
+        stopped by its worker at the next progress update.
+
+        Args:
+            job_id: Job UUID
+
+        Returns:
+            Updated job model or None if not found
+        """
+        queued = RebuildJobModel.status == "queued"
+        stmt = (
+            update(RebuildJobModel)
+            .where(
+                RebuildJobModel.id == job_id,
+                RebuildJobModel.status.in_(REBUILD_JOB_ACTIVE_STATUSES),
+            )
+            .values(
+                cancel_requested=True,
+                status=case((queued, "cancelled"), else_=RebuildJobModel.status),
+                message=case((queued, "Reconstruction annulee"), else_=RebuildJobModel.message),
+                finished_at=case((queued, func.now()), else_=RebuildJobModel.finished_at),
+            )
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+        job = await self.get(job_id)
+        if job is not None:
+            await self.session.refresh(job)
+        return job
+
+    @observe_query
+    async def fail_stale(self, stale_after_seconds: float) -> int:
+        """
+        Fail running jobs whose worker stopped sending heartbeats.
+
+        Frees the single-flight slot after a worker crash.
+
+        Args:
+            stale_after_seconds: Heartbeat age after which a job is considered lost
+
+        Returns:
+            Number of jobs marked as failed
+        """
+        stmt = (
+            update(RebuildJobModel)
+            .where(
+                RebuildJobModel.status == "in_progress",
+                RebuildJobModel.heartbeat_at < func.now() - timedelta(seconds=stale_after_seconds),
+            )
+            .values(
+                status="failed",
+                message="Echec de la reconstruction",
+                error="Worker perdu (plus de heartbeat)",
+                finished_at=func.now(),
+            )
+        )
+        result = cast(CursorResult, await self.session.execute(stmt))
+        await self.session.commit()
+        return result.rowcount
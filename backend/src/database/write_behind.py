@@ -0,0 +1,254 @@
+"""Write-behind queue for the messages of /chat.
+
+/chat hands the answered exchange to the queue and returns: the messages are
+written to PostgreSQL by a background task, in batches (one multi-row upsert
+and INSERT per batch, see ChatUnitOfWork.save_exchanges):
+
+- a batch is flushed every settings.message_flush_interval seconds, or as soon
+  as settings.message_flush_batch_size exchanges are waiting;
+- the buffer holds at most settings.message_buffer_size exchanges: submit
+  waits for room (backpressure) and fails after settings.message_buffer_timeout;
+- exchanges stay visible through pending_messages until their batch is
+  committed, so history reads see the messages not flushed yet;
+- a failed batch is retried; on shutdown, what cannot be flushed is spilled to
+  a JSON lines file of settings.message_spill_dir, replayed at the next start.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections import deque
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.settings import settings
+
+from .repository import ChatExchange, ChatUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 5.0  # Seconds between attempts when the database is down
+
+
+class WriteBehindFull(Exception):
+    """Raised when the buffer stayed full for settings.message_buffer_timeout."""
+
+
+class MessageWriteBehind:
+    """Buffer of exchanges flushed to the database by a background task."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        buffer_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        spill_dir: Path | None = None,
+    ):
+        """
+        Create the queue (call start() from the event loop before submitting).
+
+        Args:
+            session_maker: Session factory used by the flusher
+            buffer_size: Maximum buffered exchanges (default: settings)
+            batch_size: Exchanges that trigger an immediate flush (default: settings)
+            flush_interval: Maximum seconds before a flush (default: settings)
+            spill_dir: Directory of the shutdown spill files (default: settings)
+        """
+        self.session_maker = session_maker
+        self.buffer_size = buffer_size or settings.message_buffer_size
+        self.batch_size = batch_size or settings.message_flush_batch_size
+        self.flush_interval = flush_interval or settings.message_flush_interval
+        self.spill_dir = Path(spill_dir or settings.message_spill_dir)
+
+        self._buffer: deque[ChatExchange] = deque()
+        self._in_flight: list[ChatExchange] = []
+        self._pending: dict[UUID, list[ChatExchange]] = {}
+        self._room = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        """Exchanges not committed yet (buffered or being flushed)."""
+        return len(self._buffer) + len(self._in_flight)
+
+    async def start(self) -> None:
+        """Replay the spill files left by previous shutdowns and start flushing."""
+        for exchange in self._claim_spilled():
+            self._enqueue(exchange)
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, exchange: ChatExchange) -> None:
+        """
+        Queue an exchange for writing.
+
+        Args:
+            exchange: Answered exchange
+
+        Raises:
+            WriteBehindFull: If no room was made within settings.message_buffer_timeout
+            RuntimeError: If the queue is closed
+        """
+        if self._closing:
+            raise RuntimeError("Message write-behind queue is closed")
+        async with self._room:
+            try:
+                await asyncio.wait_for(
+                    self._room.wait_for(lambda: len(self) < self.buffer_size),
+                    timeout=settings.message_buffer_timeout,
+                )
+            except TimeoutError:
+                raise WriteBehindFull(f"{len(self)} messages waiting for the database") from None
+            self._enqueue(exchange)
+
+    def pending_exchanges(self, session_id: UUID) -> list[ChatExchange]:
+        """Exchanges of a session not committed yet, oldest first."""
+        return list(self._pending.get(session_id, []))
+
+    def pending_messages(self, session_id: UUID) -> list[dict[str, str]]:
+        """
+        Messages of a session not committed yet, oldest first.
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            Messages in RAGEngine history format
+        """
+        return [
+            message
+            for exchange in self.pending_exchanges(session_id)
+            for message in exchange.messages()
+        ]
+
+    def discard(self, session_id: UUID) -> int:
+        """
+        Drop the buffered exchanges of a deleted session.
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            Number of exchanges dropped (a batch already being written is kept)
+        """
+        kept = [exchange for exchange in self._buffer if exchange.session_id != session_id]
+        dropped = len(self._buffer) - len(kept)
+        self._buffer = deque(kept)
+        in_flight = [e for e in self._in_flight if e.session_id == session_id]
+        if in_flight:
+            self._pending[session_id] = in_flight
+        else:
+            self._pending.pop(session_id, None)
+        return dropped
+
+    async def close(self, timeout: float | None = None) -> None:
+        """
+        Flush the buffer, then spill what could not be written.
+
+        Args:
+            timeout: Seconds allowed for the final flush (default: settings)
+        """
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(
+                    self._task, timeout=timeout or settings.message_shutdown_timeout
+                )
+            except TimeoutError:
+                logger.warning("Ecriture des messages interrompue a l'arret")
+        remaining = [*self._in_flight, *self._buffer]
+        if remaining:
+            self._spill(remaining)
+
+    def _enqueue(self, exchange: ChatExchange) -> None:
+        """Add an exchange to the buffer and the pending view."""
+        self._buffer.append(exchange)
+        self._pending.setdefault(exchange.session_id, []).append(exchange)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Flush loop: every flush_interval, or when a batch is full."""
+        failures = 0
+        while not (self._closing and not self._buffer):
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except TimeoutError:
+                    pass
+            self._wakeup.clear()
+            while self._buffer:
+                if await self._flush_batch():
+                    failures = 0
+                    continue
+                failures += 1
+                if self._closing:
+                    return  # Database down at shutdown: close() spills the buffer
+                await asyncio.sleep(min(self.flush_interval * 2**failures, MAX_RETRY_DELAY))
+                break
+
+    async def _flush_batch(self) -> bool:
+        """Write one batch; on failure, put it back at the head of the buffer."""
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        self._in_flight = batch
+        written = False
+        try:
+            async with self.session_maker() as db:
+                await ChatUnitOfWork(db).save_exchanges(batch)
+            written = True
+        except Exception:
+            logger.exception("Echec de l'ecriture de %d echanges, nouvel essai", len(batch))
+        finally:
+            # Also when cancelled at shutdown: close() spills the buffer
+            self._in_flight = []
+            if not written:
+                self._buffer.extendleft(reversed(batch))
+        if not written:
+            return False
+
+        for exchange in batch:
+            pending = self._pending.get(exchange.session_id)
+            if pending is not None:
+                pending.remove(exchange)
+                if not pending:
+                    del self._pending[exchange.session_id]
+        async with self._room:
+            self._room.notify_all()
+        return True
+
+    def _spill(self, exchanges: list[ChatExchange]) -> None:
+        """Write exchanges to a spill file of this process."""
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{socket.gethostname()}-{os.getpid()}.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            for exchange in exchanges:
+                f.write(json.dumps(exchange.to_json(), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        logger.warning("%d echanges non ecrits sauvegardes dans %s", len(exchanges), path)
+
+    def _claim_spilled(self) -> list[ChatExchange]:
+        """Read and remove the spill files (renamed first: one worker replays each file)."""
+        if not self.spill_dir.exists():
+            return []
+        exchanges: list[ChatExchange] = []
+        for path in sorted(self.spill_dir.glob("*.jsonl")):
+            claimed = path.with_suffix(f".replay-{os.getpid()}")
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # Claimed by another worker
+            with open(claimed, encoding="utf-8") as f:
+                exchanges.extend(
+                    ChatExchange.from_json(json.loads(line)) for line in f if line.strip()
+                )
+            claimed.unlink()
+        if exchanges:
+            logger.info("%d echanges non ecrits repris de %s", len(exchanges), self.spill_dir)
+        return exchanges
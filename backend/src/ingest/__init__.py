@@ -0,0 +1,31 @@
+"""Ingestion pipeline for OpenAgenda events.
+
+This module replaces the data collection and preprocessing notebooks (01/02):
+- fetch_pages: Async paginated fetcher for the OpenDataSoft API
+- validate_records / build_documents: Generator-based validation and cleaning stages
+- clean_descriptions: HTML cleaning with a plain-text fast path and optional process pool
+- run_ingestion: Streaming pipeline writing rag_documents.jsonl for IndexBuilder
+"""
+
+from src.ingest.fetcher import fetch_pages
+from src.ingest.pipeline import run_ingestion, write_jsonl
+from src.ingest.stages import (
+    IngestionStats,
+    OpenAgendaRecord,
+    build_documents,
+    clean_descriptions,
+    clean_html,
+    validate_records,
+)
+
+__all__ = [
+    "IngestionStats",
+    "OpenAgendaRecord",
+    "build_documents",
+    "clean_descriptions",
+    "clean_html",
+    "fetch_pages",
+    "run_ingestion",
+    "validate_records",
+    "write_jsonl",
+]
@@ -0,0 +1,5 @@
+"""Allow ``python -m src.ingest``."""
+
+from src.ingest.cli import main
+
+main()
@@ -0,0 +1,76 @@
+"""Command line entry point of the ingestion pipeline.
+
+Usage:
+    uv run rag-ingest --max-events 5000 --location Marseille
+    uv run python -m src.ingest --output data/processed/rag_documents.jsonl
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import httpx
+
+from src.config.constants import DEFAULT_FETCH_CONCURRENCY, LOG_DATE_FORMAT, LOG_FORMAT
+from src.config.settings import settings
+from src.ingest.pipeline import run_ingestion
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Récupère les événements OpenAgenda et produit rag_documents.jsonl",
+    )
+    parser.add_argument(
+        "--max-events", type=int, default=settings.max_events, help="Nombre maximum d'événements"
+    )
+    parser.add_argument(
+        "--location", default=settings.default_location, help="Ville (vide pour toutes)"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSONL de sortie")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_FETCH_CONCURRENCY,
+        help="Requêtes simultanées vers l'API",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processus de nettoyage HTML (1 pour nettoyer sans pool)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the ingestion pipeline and print its statistics."""
+    args = parse_args(argv)
+    logging.basicConfig(level=settings.log_level, format=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+    try:
+        stats = asyncio.run(
+            run_ingestion(
+                output_path=args.output,
+                max_events=args.max_events,
+                location=args.location or None,
+                concurrency=args.concurrency,
+                workers=args.workers,
+            )
+        )
+    except httpx.HTTPError as e:
+        print(f"❌ Erreur API: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Récupérés: {stats.fetched}")
+    print(f"Validés: {stats.validated}")
+    print(f"Filtrés (trop anciens): {stats.filtered}")
+    print(f"Erreurs: {stats.errors}")
+    print(f"Documents écrits: {stats.written}")
+    print(f"Durée: {stats.elapsed_seconds:.1f}s ({stats.events_per_second:.1f} evts/s)")
+
+
+if __name__ == "__main__":
+    main()
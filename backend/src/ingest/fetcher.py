@@ -0,0 +1,132 @@
+"""Asynchronous paginated fetcher for the OpenDataSoft OpenAgenda dataset."""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+
+import httpx
+
+from src.config.constants import (
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_REQUEST_TIMEOUT,
+    EVENT_HISTORY_DAYS,
+    OPENDATASOFT_EVENTS_URL,
+    OPENDATASOFT_PAGE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_where_clause(location: str | None = None) -> str:
+    """
+    Build the OpenDataSoft ``where`` filter.
+
+    Keeps events that ended less than EVENT_HISTORY_DAYS ago, optionally
+    restricted to a city.
+
+    Args:
+        location: Optional city name (exact match on location_city)
+
+    Returns:
+        ODSQL where clause
+    """
+    date_past = (datetime.now() - timedelta(days=EVENT_HISTORY_DAYS)).strftime("%Y-%m-%d")
+    clauses = [f'lastdate_end >= "{date_past}"']
+    if location:
+        clauses.append(f'location_city="{location}"')
+    return " AND ".join(clauses)
+
+
+async def _get_page(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    max_retries: int,
+) -> dict:
+    """Fetch one page, retrying with exponential backoff."""
+    for attempt in range(max_retries):
+        try:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            page: dict = response.json()
+            return page
+        except httpx.HTTPError as e:
+            if attempt == max_retries - 1:
+                raise
+            logger.warning("Page offset=%s en echec (%s), nouvel essai", params.get("offset"), e)
+            await asyncio.sleep(2**attempt)
+    raise RuntimeError("max_retries must be >= 1")
+
+
+async def fetch_pages(
+    max_events: int,
+    location: str | None = None,
+    url: str = OPENDATASOFT_EVENTS_URL,
+    page_size: int = OPENDATASOFT_PAGE_SIZE,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream pages of raw OpenAgenda records.
+
+    The first page gives the total count; the remaining pages are requested
+    with up to ``concurrency`` requests in flight and yielded in offset order,
+    so only a bounded number of pages is held in memory.
+
+    Args:
+        max_events: Maximum number of records to fetch
+        location: Optional city filter
+        url: Records endpoint of the OpenDataSoft dataset
+        page_size: Records per request (OpenDataSoft caps it at 100)
+        concurrency: Maximum number of concurrent page requests
+        timeout: Request timeout in seconds
+        max_retries: Attempts per page before giving up
+
+    Yields:
+        Lists of raw records, in API order
+
+    Raises:
+        httpx.HTTPError: If a page still fails after max_retries attempts
+    """
+    base_params = {
+        "where": build_where_clause(location),
+        "order_by": "firstdate_begin asc",
+    }
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+
+        def request(offset: int) -> asyncio.Task:
+            params = {**base_params, "offset": offset, "limit": min(page_size, max_events - offset)}
+            return asyncio.create_task(_get_page(client, url, params, max_retries))
+
+        first = await request(0)
+        records = first.get("results", [])
+        total = min(first.get("total_count", len(records)), max_events)
+        logger.info("%d evenements disponibles, %d a recuperer", first.get("total_count", 0), total)
+        if not records:
+            return
+        yield records
+
+        offsets = iter(range(len(records), total, page_size))
+        pending: deque[asyncio.Task] = deque()
+        try:
+            for offset in offsets:
+                pending.append(request(offset))
+                if len(pending) >= concurrency:
+                    break
+            while pending:
+                page = await pending.popleft()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append(request(next_offset))
+                records = page.get("results", [])
+                if not records:
+                    break
+                yield records
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,84 @@
+"""Streaming ingestion pipeline: OpenDataSoft API -> validated RAG documents (JSONL)."""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.config.constants import (
+    DEFAULT_FETCH_CONCURRENCY,
+    OPENDATASOFT_EVENTS_URL,
+    PROCESSED_DATA_DIR,
+    RAG_DOCUMENTS_JSONL_FILE,
+)
+from src.data.documents import write_jsonl
+from src.ingest.fetcher import fetch_pages
+from src.ingest.stages import IngestionStats, build_documents, validate_records
+
+logger = logging.getLogger(__name__)
+
+
+async def run_ingestion(
+    output_path: Path | None = None,
+    max_events: int = 10000,
+    location: str | None = None,
+    url: str = OPENDATASOFT_EVENTS_URL,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    workers: int | None = None,
+) -> IngestionStats:
+    """
+    Fetch, validate, clean and write events page by page.
+
+    The output is written to a temporary file renamed on success, so
+    IndexBuilder never reads a partially written file. HTML descriptions are
+    cleaned in a process pool, off the event loop, while the next pages are
+    being downloaded.
+
+    Args:
+        output_path: JSONL destination (PROCESSED_DATA_DIR/rag_documents.jsonl by default)
+        max_events: Maximum number of records to fetch
+        location: Optional city filter
+        url: OpenDataSoft records endpoint
+        concurrency: Maximum number of concurrent page requests
+        workers: Cleaning processes (os.cpu_count() by default, 1 to clean in-process)
+
+    Returns:
+        Pipeline counters and throughput
+    """
+    output_path = output_path or PROCESSED_DATA_DIR / RAG_DOCUMENTS_JSONL_FILE
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    stats = IngestionStats()
+
+    def write_page(page: list[dict], f) -> int:
+        return write_jsonl(build_documents(validate_records(page, stats), executor), f)
+
+    start_time = time.perf_counter()
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            async for page in fetch_pages(
+                max_events=max_events,
+                location=location,
+                url=url,
+                concurrency=concurrency,
+            ):
+                stats.written += await asyncio.to_thread(write_page, page, f)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    stats.elapsed_seconds = time.perf_counter() - start_time
+    logger.info(
+        "%d documents ecrits dans %s (%.1f evts/s)",
+        stats.written,
+        output_path,
+        stats.events_per_second,
+    )
+    return stats
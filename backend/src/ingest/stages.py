@@ -0,0 +1,266 @@
+"""Generator-based validation and cleaning stages of the ingestion pipeline.
+
+Each stage consumes an iterable and yields results one at a time, so the
+pipeline never materializes the whole agenda in memory.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+from itertools import islice
+
+from lxml import etree
+from lxml import html as lxml_html
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from src.config.constants import EVENT_HISTORY_DAYS
+from src.data.models import is_free_price
+
+DESCRIPTION_MAX_LENGTH = 500  # Characters of description kept in the RAG content
+CLEANING_BATCH_SIZE = 500  # Events cleaned together by build_documents
+CLEANING_CHUNK_SIZE = 64  # Descriptions sent to a worker process per task
+
+_MARKUP_CHARS = re.compile(r"[<&]")
+_SKIPPED_TAGS = frozenset({"script", "style"})
+
+
+class IngestionStats(BaseModel):
+    """Counters collected while the pipeline runs."""
+
+    fetched: int = Field(0, description="Raw records received from the API")
+    validated: int = Field(0, description="Records accepted by validation")
+    filtered: int = Field(0, description="Records dropped because they are too old")
+    errors: int = Field(0, description="Records rejected as invalid")
+    written: int = Field(0, description="Documents written to the output")
+    elapsed_seconds: float = Field(0.0, description="Total pipeline duration")
+
+    @property
+    def events_per_second(self) -> float:
+        """Throughput of the pipeline in written events per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.written / self.elapsed_seconds
+
+
+class OpenAgendaRecord(BaseModel):
+    """Validated OpenDataSoft OpenAgenda record."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    uid: str
+    title: str = Field(alias="title_fr")
+    description: str | None = Field(default=None, alias="description_fr")
+    start_date: str = Field(alias="firstdate_begin")
+    end_date: str = Field(alias="lastdate_end")
+    city: str | None = Field(default=None, alias="location_city")
+    region: str | None = Field(default=None, alias="location_region")
+    address: str | None = Field(default=None, alias="location_address")
+    url: str | None = Field(default=None, alias="canonicalurl")
+    conditions: str | None = Field(default=None, alias="conditions_fr")
+
+    @field_validator("end_date")
+    @classmethod
+    def validate_end_date(cls, v: str) -> str:
+        """Reject events that ended more than EVENT_HISTORY_DAYS ago."""
+        date_limit = (datetime.now() - timedelta(days=EVENT_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        event_date = v[:10]
+        if event_date < date_limit:
+            raise ValueError(f"Événement trop ancien (terminé le {event_date})")
+        return v
+
+
+def validate_records(
+    records: Iterable[dict],
+    stats: IngestionStats | None = None,
+) -> Iterator[OpenAgendaRecord]:
+    """
+    Validate raw API records.
+
+    Args:
+        records: Raw OpenDataSoft records
+        stats: Optional counters updated in place
+
+    Yields:
+        Valid, recent enough records
+    """
+    for record in records:
+        if stats:
+            stats.fetched += 1
+        try:
+            event = OpenAgendaRecord.model_validate(record)
+        except ValidationError as e:
+            if stats:
+                if "trop ancien" in str(e):
+                    stats.filtered += 1
+                else:
+                    stats.errors += 1
+            continue
+        if stats:
+            stats.validated += 1
+        yield event
+
+
+def has_markup(text: str | None) -> bool:
+    """Tell whether a description may contain tags or character entities."""
+    return text is not None and _MARKUP_CHARS.search(text) is not None
+
+
+def _iter_text(element: etree._Element) -> Iterator[str]:
+    """Yield the text nodes of a fragment, skipping comments, scripts and styles."""
+    if element.text and isinstance(element.tag, str) and element.tag not in _SKIPPED_TAGS:
+        yield element.text
+    for child in element:
+        yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+
+def clean_html(text: str | None) -> str:
+    """
+    Strip HTML markup and collapse whitespace.
+
+    Descriptions without ``<`` or ``&`` cannot contain markup and only get
+    their whitespace normalized; the others are parsed with lxml. The output
+    matches the BeautifulSoup ``get_text(separator=" ", strip=True)`` cleaning
+    of the preprocessing notebook (see scripts/benchmark_cleaning.py).
+
+    Args:
+        text: HTML or plain text description
+
+    Returns:
+        Plain text
+    """
+    if not text:
+        return ""
+    if not has_markup(text):
+        return " ".join(text.split())
+    try:
+        root = lxml_html.fragment_fromstring(text, create_parent="div")
+    except etree.ParserError:
+        return ""
+    return " ".join(" ".join(_iter_text(root)).split())
+
+
+def clean_descriptions(
+    descriptions: list[str | None],
+    executor: Executor | None = None,
+) -> list[str]:
+    """
+    Clean a batch of descriptions, parsing the ones with markup in parallel.
+
+    Plain-text descriptions take the fast path in the calling process; only
+    descriptions with markup are shipped to the executor, in chunks of
+    CLEANING_CHUNK_SIZE to amortize inter-process overhead.
+
+    Args:
+        descriptions: Raw descriptions
+        executor: Optional executor (typically a ProcessPoolExecutor)
+
+    Returns:
+        Cleaned descriptions, in input order
+    """
+    cleaned = [""] * len(descriptions)
+    markup_positions = []
+    for i, description in enumerate(descriptions):
+        if has_markup(description):
+            markup_positions.append(i)
+        else:
+            cleaned[i] = clean_html(description)
+
+    markup_texts = [descriptions[i] for i in markup_positions]
+    results: Iterable[str]
+    if executor is None or len(markup_texts) <= CLEANING_CHUNK_SIZE:
+        results = map(clean_html, markup_texts)
+    else:
+        results = executor.map(clean_html, markup_texts, chunksize=CLEANING_CHUNK_SIZE)
+
+    for i, text in zip(markup_positions, results, strict=True):
+        cleaned[i] = text
+    return cleaned
+
+
+def format_date(date_str: str) -> str:
+    """Format an ISO date as DD/MM/YYYY à HH:MM (unchanged if unparsable)."""
+    try:
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        return dt.strftime("%d/%m/%Y à %H:%M")
+    except ValueError:
+        return date_str
+
+
+def truncate_text(text: str, max_length: int = DESCRIPTION_MAX_LENGTH) -> str:
+    """Truncate a text, keeping complete sentences when possible."""
+    if len(text) <= max_length:
+        return text
+    truncated = text[:max_length]
+    last_period = truncated.rfind(".")
+    if last_period > 0:
+        return truncated[: last_period + 1]
+    return truncated + "..."
+
+
+def create_rag_document(event: OpenAgendaRecord, description: str) -> dict:
+    """
+    Build the RAG document of an event.
+
+    Args:
+        event: Validated record
+        description: Cleaned plain text description
+
+    Returns:
+        Document dictionary (id, title, content, metadata) as read by IndexBuilder
+    """
+    start = format_date(event.start_date)
+    end = format_date(event.end_date)
+
+    content_parts = [
+        f"Titre: {event.title or 'Sans titre'}",
+        f"Ville: {event.city or 'Non spécifié'}",
+        f"Date: Du {start} au {end}",
+    ]
+    if description:
+        content_parts.append(f"Description: {truncate_text(description)}")
+    if event.address:
+        content_parts.append(f"Adresse: {event.address}")
+
+    return {
+        "id": event.uid,
+        "title": event.title,
+        "content": "\n".join(content_parts),
+        "metadata": {
+            "uid": event.uid,
+            "city": event.city or "",
+            "region": event.region or "",
+            "start_date": event.start_date,
+            "end_date": event.end_date,
+            "url": event.url or "",
+            "address": event.address or "",
+            "price": event.conditions or "",
+            "is_free": is_free_price(event.conditions) if event.conditions else None,
+        },
+    }
+
+
+def build_documents(
+    events: Iterable[OpenAgendaRecord],
+    executor: Executor | None = None,
+) -> Iterator[dict]:
+    """
+    Clean descriptions and build RAG documents.
+
+    Events are cleaned in batches of CLEANING_BATCH_SIZE so the optional
+    executor receives enough work per call.
+
+    Args:
+        events: Validated records
+        executor: Optional executor used to parse HTML descriptions in parallel
+
+    Yields:
+        RAG document dictionaries
+    """
+    events = iter(events)
+    while batch := list(islice(events, CLEANING_BATCH_SIZE)):
+        descriptions = clean_descriptions([event.description for event in batch], executor)
+        for event, description in zip(batch, descriptions, strict=True):
+            yield create_rag_document(event, description)
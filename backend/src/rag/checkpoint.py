@@ -0,0 +1,141 @@
+"""Checkpoints of the embedding stage of an index build.
+
+Embedding is the slow, paid part of a rebuild. Each embedded batch is appended
+to a raw vector file as soon as it is computed, so a build interrupted by a
+network error or a worker restart resumes from the last completed batch:
+
+    faiss_index/
+        checkpoint/
+            vectors.f32      # float32 rows, appended batch by batch
+            progress.json    # {"fingerprint": ..., "dimension": d, "rows": n}
+
+A batch is fsynced before progress.json (replaced atomically) counts it, so
+the manifest never references rows that are not on disk; bytes past ``rows``
+(a batch written but not recorded) are truncated on resume. The fingerprint
+identifies the build inputs: a checkpoint of a different corpus, model or
+chunking is discarded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+CHECKPOINT_DIR = "checkpoint"
+VECTORS_FILE = "vectors.f32"
+PROGRESS_FILE = "progress.json"
+
+
+def build_fingerprint(ids: Iterable[str], texts: Iterable[str], *settings: object) -> str:
+    """Hash the inputs of the embedding stage.
+
+    Args:
+        ids: Chunk ids, in embedding order.
+        texts: Chunk texts, in embedding order.
+        *settings: Other values the vectors depend on (model name, chunk size...).
+
+    Returns:
+        Hex digest identifying the build.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(value) for value in settings]).encode("utf-8"))
+    for doc_id, text in zip(ids, texts, strict=True):
+        digest.update(doc_id.encode("utf-8") + b"\0" + text.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class BuildCheckpoint:
+    """Append-only vector file plus progress manifest of one build."""
+
+    def __init__(self, root: Path, fingerprint: str):
+        """Open the checkpoint of an index root, resuming it if it matches.
+
+        Args:
+            root: Index root directory (the checkpoint goes to root/checkpoint).
+            fingerprint: Fingerprint of the build (see build_fingerprint).
+        """
+        self.directory = root / CHECKPOINT_DIR
+        self.fingerprint = fingerprint
+        self.rows = 0
+        self.dimension: int | None = None
+
+        progress = self._read_progress()
+        if progress is None or progress.get("fingerprint") != fingerprint:
+            self.clear()
+            return
+
+        self.rows = progress["rows"]
+        self.dimension = progress["dimension"]
+        expected = self.rows * self.dimension * 4
+        vectors_path = self.directory / VECTORS_FILE
+        size = vectors_path.stat().st_size if vectors_path.exists() else 0
+        if size < expected:
+            # Recorded rows are missing: the checkpoint cannot be trusted
+            self.clear()
+        elif size > expected:
+            # Batch written after the last progress update: drop it
+            with open(vectors_path, "r+b") as f:
+                f.truncate(expected)
+
+    def _read_progress(self) -> dict | None:
+        """Read progress.json (None if missing or unreadable)."""
+        try:
+            with open(self.directory / PROGRESS_FILE, encoding="utf-8") as f:
+                progress: dict = json.load(f)
+            return progress
+        except (OSError, ValueError):
+            return None
+
+    def _write_progress(self) -> None:
+        """Atomically replace progress.json."""
+        tmp_path = self.directory / f"{PROGRESS_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"fingerprint": self.fingerprint, "dimension": self.dimension, "rows": self.rows},
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.directory / PROGRESS_FILE)
+
+    def append(self, vectors: np.ndarray | list[list[float]]) -> None:
+        """Durably append a batch of vectors and record it.
+
+        Args:
+            vectors: Embedded batch, shape (n, d).
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Dimension {vectors.shape[1]} != checkpoint {self.dimension}")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / VECTORS_FILE, "ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.rows += len(vectors)
+        self._write_progress()
+
+    def vectors(self) -> np.ndarray:
+        """Memory-map the checkpointed vectors, shape (rows, dimension)."""
+        if not self.rows:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        vectors: np.ndarray = np.memmap(
+            str(self.directory / VECTORS_FILE),
+            dtype=np.float32,
+            mode="r",
+            shape=(self.rows, self.dimension or 0),
+        )
+        return vectors
+
+    def clear(self) -> None:
+        """Delete the checkpoint (once the build is published, or when stale)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.rows = 0
+        self.dimension = None
@@ -0,0 +1,187 @@
+"""Near-duplicate event detection on embedded documents.
+
+The same event is often published by several organizers with slightly
+different texts. Duplicates are found with a batched FAISS range search on
+the cosine similarity of the event vectors, grouped with a union-find, and
+each group is merged into a single canonical document. Two similar events are
+only grouped when their metadata agree (see may_be_duplicates): a touring show
+or a weekly workshop reuses the same text in other cities or on other dates.
+"""
+
+from collections.abc import Callable
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+DEDUP_BATCH_SIZE = 1024  # Query vectors per range search call
+MAX_REPORT_EXAMPLES = 10  # Clusters listed in the dedup report
+_FILLED_FIELDS = ("url", "address", "city")  # Filled from duplicates when missing
+
+
+def normalized(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalized float32 copy of vectors (inner product = cosine similarity)."""
+    vectors = np.array(vectors, dtype=np.float32, order="C", copy=True)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def find_duplicate_clusters(
+    vectors: np.ndarray,
+    threshold: float,
+    batch_size: int = DEDUP_BATCH_SIZE,
+    compatible: Callable[[int, int], bool] | None = None,
+) -> list[list[int]]:
+    """Group vectors whose cosine similarity is above a threshold.
+
+    Pairs are found with a range search over an inner-product index, one
+    batch of query vectors at a time, and merged transitively (union-find).
+    With ``compatible``, two groups are only joined when every row of one is
+    compatible with every row of the other: a chain Paris ~ (no city) ~ Lyon
+    never puts Paris and Lyon in the same cluster.
+
+    Args:
+        vectors: L2-normalized event vectors, shape (n, d) (see normalized).
+        threshold: Minimum cosine similarity for two events to be duplicates.
+        batch_size: Number of query vectors per range search.
+        compatible: Extra condition on a pair of rows (None: similarity only).
+
+    Returns:
+        Clusters of at least two rows, each sorted, in order of first row.
+    """
+    n = len(vectors)
+    if n < 2:
+        return []
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+
+    parent = list(range(n))
+    members = {i: [i] for i in range(n)}  # Rows of each root
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for start in range(0, n, batch_size):
+        lims, _, labels = index.range_search(vectors[start : start + batch_size], threshold)
+        for offset in range(len(lims) - 1):
+            i = start + offset
+            for j in labels[lims[offset] : lims[offset + 1]].tolist():
+                if j <= i:
+                    continue
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j:
+                    continue
+                if compatible is not None and not all(
+                    compatible(a, b) for a in members[root_i] for b in members[root_j]
+                ):
+                    continue
+                root, child = min(root_i, root_j), max(root_i, root_j)
+                parent[child] = root
+                members[root].extend(members.pop(child))
+
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return [rows for rows in groups.values() if len(rows) > 1]
+
+
+def select_canonical(documents: list[Document]) -> int:
+    """Position of the most detailed document (longest content, first on ties)."""
+    return max(range(len(documents)), key=lambda i: len(documents[i].page_content))
+
+
+def _occurrences(metadata: dict) -> list[list[str]]:
+    """Occurrences of a document ([start, end] pairs)."""
+    if metadata.get("occurrences"):
+        return [list(occurrence) for occurrence in metadata["occurrences"]]
+    if metadata.get("start_date") or metadata.get("end_date"):
+        return [[metadata.get("start_date", ""), metadata.get("end_date", "")]]
+    return []
+
+
+def _date_span(metadata: dict) -> tuple[str, str] | None:
+    """First and last day (YYYY-MM-DD) of the occurrences of a document."""
+    days = [day[:10] for occurrence in _occurrences(metadata) for day in occurrence if day]
+    return (min(days), max(days)) if days else None
+
+
+def may_be_duplicates(first: dict, second: dict) -> bool:
+    """Whether the metadata of two similar events allow merging them.
+
+    Both must be in the same city and their date ranges must overlap; a field
+    missing on either side does not prevent the merge.
+
+    Args:
+        first: Metadata of an event.
+        second: Metadata of the other event.
+    """
+    cities = [(m.get("city") or "").strip().casefold() for m in (first, second)]
+    if all(cities) and cities[0] != cities[1]:
+        return False
+    spans = [_date_span(first), _date_span(second)]
+    if spans[0] is not None and spans[1] is not None:
+        return spans[0][0] <= spans[1][1] and spans[1][0] <= spans[0][1]
+    return True
+
+
+def merge_duplicates(canonical: Document, duplicates: list[Document]) -> Document:
+    """Merge duplicates into their canonical document.
+
+    The canonical metadata gets the union of the occurrences of the cluster,
+    the ids of the removed duplicates and, when missing, the url / address /
+    city of a duplicate.
+
+    Args:
+        canonical: Document kept in the index (see select_canonical).
+        duplicates: Documents removed from the index.
+
+    Returns:
+        The canonical document with merged metadata.
+    """
+    documents = [canonical, *duplicates]
+    metadata = dict(canonical.metadata)
+
+    for field in _FILLED_FIELDS:
+        if not metadata.get(field):
+            metadata[field] = next(
+                (doc.metadata[field] for doc in duplicates if doc.metadata.get(field)), ""
+            )
+
+    occurrences = sorted({tuple(o) for doc in documents for o in _occurrences(doc.metadata)})
+    if len(occurrences) > 1:
+        metadata["occurrences"] = [list(occurrence) for occurrence in occurrences]
+
+    duplicate_ids = [doc.metadata.get("id", "") for doc in duplicates]
+    metadata["duplicate_ids"] = sorted(set(metadata.get("duplicate_ids", [])) | set(duplicate_ids))
+    return Document(page_content=canonical.page_content, metadata=metadata)
+
+
+def build_report(
+    threshold: float,
+    events_before: int,
+    clusters: list[dict],
+) -> dict:
+    """Build the dedup report written next to the index.
+
+    Args:
+        threshold: Cosine similarity threshold used.
+        events_before: Number of events before deduplication.
+        clusters: One entry per cluster: {"canonical": {"id", "title"},
+            "duplicates": [{"id", "title", "similarity"}, ...]}.
+
+    Returns:
+        Report with counts and the largest clusters as examples.
+    """
+    removed = sum(len(cluster["duplicates"]) for cluster in clusters)
+    examples = sorted(clusters, key=lambda cluster: -len(cluster["duplicates"]))
+    return {
+        "threshold": threshold,
+        "events_before": events_before,
+        "events_after": events_before - removed,
+        "clusters": len(clusters),
+        "duplicates_removed": removed,
+        "examples": examples[:MAX_REPORT_EXAMPLES],
+    }
@@ -0,0 +1,273 @@
+"""Columnar on-disk document store.
+
+The documents served by an index version are stored column by column in
+``<version_dir>/docstore``:
+
+    docstore/
+        docstore.json                       # {"format": 1, "count": n, "columns": [...]}
+        id.bin        id.offsets.npy
+        title.bin     title.offsets.npy
+        content.bin   content.offsets.npy
+        metadata.bin  metadata.offsets.npy  # one JSON object per row
+
+Each ``.bin`` file concatenates the UTF-8 values of a column and the matching
+``.offsets.npy`` holds n + 1 uint64 offsets, so row i of a column is
+``blob[offsets[i]:offsets[i + 1]]``. Both are memory-mapped: opening a store
+only decodes the id column (to map ids to rows); the other fields are decoded
+on access and their pages live in the OS page cache, not in the Python heap.
+"""
+
+import bisect
+import json
+import mmap
+from collections.abc import Container, Iterable, Iterator, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+
+import numpy as np
+
+DOCSTORE_DIR = "docstore"
+DOCSTORE_FORMAT = 1
+COLUMNS = ("id", "title", "content", "metadata")
+
+
+def _encode(column: str, document: dict) -> bytes:
+    """Encode one field of a document (metadata as JSON)."""
+    if column == "metadata":
+        return json.dumps(document.get("metadata", {}), ensure_ascii=False).encode("utf-8")
+    return (document.get(column) or "").encode("utf-8")
+
+
+def write_docstore(
+    documents: Iterable[dict],
+    index_dir: Path,
+    previous: "ColumnarDocumentStore | None" = None,
+    kept_ids: Container[str] = (),
+) -> int:
+    """Write documents to a columnar store, streaming them column by column.
+
+    With ``previous``, its rows whose id is in ``kept_ids`` are written first,
+    copied as raw bytes run by run without being decoded; ``documents`` are
+    appended after them. An index delta thus only encodes the documents it
+    changes.
+
+    Args:
+        documents: Documents in rag_documents format (id, title, content, metadata).
+        index_dir: Index version directory (the store goes to index_dir/docstore).
+        previous: Store of the previous index version to copy rows from.
+        kept_ids: Ids of the rows of previous to keep.
+
+    Returns:
+        Number of documents written.
+    """
+    directory = index_dir / DOCSTORE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+
+    kept = np.zeros(0, dtype=bool)
+    if previous is not None:
+        kept = np.fromiter(
+            (doc_id in kept_ids for doc_id in previous._rows), dtype=bool, count=len(previous)
+        )
+    # Runs [start, end) of consecutive kept rows
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], kept, [False]))))
+    runs = edges.reshape(-1, 2).tolist()
+
+    offsets: dict[str, list[np.ndarray]] = {column: [] for column in COLUMNS}
+    count = int(kept.sum())
+    with ExitStack() as stack:
+        blobs = {
+            column: stack.enter_context(open(directory / f"{column}.bin", "wb"))
+            for column in COLUMNS
+        }
+        if previous is not None:
+            for column in COLUMNS:
+                source = previous._offsets[column]
+                for start, end in runs:
+                    blobs[column].write(
+                        previous._blobs[column][int(source[start]) : int(source[end])]
+                    )
+                offsets[column].append(np.diff(source)[kept])
+        lengths: dict[str, list[int]] = {column: [] for column in COLUMNS}
+        for document in documents:
+            for column in COLUMNS:
+                data = _encode(column, document)
+                blobs[column].write(data)
+                lengths[column].append(len(data))
+            count += 1
+
+    for column in COLUMNS:
+        sizes = np.concatenate([*offsets[column], np.array(lengths[column], dtype=np.uint64)])
+        column_offsets = np.zeros(len(sizes) + 1, dtype=np.uint64)
+        np.cumsum(sizes, out=column_offsets[1:])
+        np.save(directory / f"{column}.offsets.npy", column_offsets)
+
+    with open(directory / "docstore.json", "w", encoding="utf-8") as f:
+        json.dump({"format": DOCSTORE_FORMAT, "count": count, "columns": list(COLUMNS)}, f)
+
+    return count
+
+
+def _map_file(path: Path) -> mmap.mmap | bytes:
+    """Memory-map a file read-only (empty files cannot be mapped)."""
+    with open(path, "rb") as f:
+        if path.stat().st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ColumnarDocumentStore:
+    """Read-only, memory-mapped access to a columnar document store."""
+
+    def __init__(self, index_dir: Path):
+        """Open the store of an index version directory.
+
+        Args:
+            index_dir: Index version directory containing a docstore/ subdirectory.
+
+        Raises:
+            FileNotFoundError: If the directory has no document store.
+            ValueError: If the store was written with an unsupported format.
+        """
+        directory = index_dir / DOCSTORE_DIR
+        with open(directory / "docstore.json", encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("format") != DOCSTORE_FORMAT:
+            raise ValueError(f"Unsupported docstore format: {info.get('format')}")
+
+        self.directory = directory
+        self._count: int = info["count"]
+        self._offsets = {
+            column: np.load(directory / f"{column}.offsets.npy", mmap_mode="r")
+            for column in COLUMNS
+        }
+        self._blobs = {column: _map_file(directory / f"{column}.bin") for column in COLUMNS}
+        # One pass over the id column (no per-row memmap access)
+        ids, bounds = self._blobs["id"], self._offsets["id"].tolist()
+        self._rows = {
+            ids[start:end].decode("utf-8"): row
+            for row, (start, end) in enumerate(zip(bounds[:-1], bounds[1:], strict=True))
+        }
+
+    def get_field(self, row: int, column: str) -> str | dict:
+        """Decode a single field of a row.
+
+        Args:
+            row: Row number (0 <= row < len(store)).
+            column: One of COLUMNS.
+
+        Returns:
+            The field value (a dict for metadata, a string otherwise).
+        """
+        offsets = self._offsets[column]
+        data = self._blobs[column][int(offsets[row]) : int(offsets[row + 1])]
+        if column == "metadata":
+            metadata: dict = json.loads(data)
+            return metadata
+        return data.decode("utf-8")
+
+    def row_of(self, doc_id: str) -> int | None:
+        """Get the row of a document id (None if unknown)."""
+        return self._rows.get(doc_id)
+
+    def get_by_id(self, doc_id: str) -> dict | None:
+        """Get a document by id (None if unknown)."""
+        row = self._rows.get(doc_id)
+        return None if row is None else self[row]
+
+    def __getitem__(self, row: int) -> dict:
+        """Decode a full document (rag_documents format)."""
+        if not 0 <= row < self._count:
+            raise IndexError(f"Row {row} out of range (0-{self._count - 1})")
+        return {column: self.get_field(row, column) for column in COLUMNS}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in range(self._count):
+            yield self[row]
+
+
+class InMemoryDocumentStore:
+    """Same interface as ColumnarDocumentStore over a list of documents.
+
+    Used for indexes written before the columnar store existed, with the
+    documents loaded from a JSON / JSONL source file.
+    """
+
+    def __init__(self, documents: list[dict]):
+        """Wrap documents in rag_documents format (id, title, content, metadata)."""
+        self._documents = documents
+        self._rows = {doc.get("id"): row for row, doc in enumerate(documents)}
+
+    def row_of(self, doc_id: str) -> int | None:
+        """Get the row of a document id (None if unknown)."""
+        return self._rows.get(doc_id)
+
+    def get_by_id(self, doc_id: str) -> dict | None:
+        """Get a document by id (None if unknown)."""
+        row = self._rows.get(doc_id)
+        return None if row is None else self._documents[row]
+
+    def __getitem__(self, row: int) -> dict:
+        return self._documents[row]
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._documents)
+
+
+class ShardedDocumentStore:
+    """Same interface as ColumnarDocumentStore over the stores of index shards.
+
+    Rows are numbered shard after shard, in the order of the given stores.
+    """
+
+    def __init__(self, stores: Sequence[ColumnarDocumentStore | InMemoryDocumentStore]):
+        """Chain the document stores of the shards of an index version."""
+        self._stores = stores
+        self._starts: list[int] = np.cumsum([0] + [len(store) for store in stores]).tolist()
+        # One id -> global row table: lookups do not probe every shard
+        self._rows = {
+            doc_id: start + row
+            for start, store in zip(self._starts[:-1], stores, strict=True)
+            for doc_id, row in store._rows.items()
+        }
+
+    def row_of(self, doc_id: str) -> int | None:
+        """Get the row of a document id (None if unknown)."""
+        return self._rows.get(doc_id)
+
+    def get_by_id(self, doc_id: str) -> dict | None:
+        """Get a document by id (None if unknown)."""
+        row = self._rows.get(doc_id)
+        return None if row is None else self[row]
+
+    def __getitem__(self, row: int) -> dict:
+        if not 0 <= row < len(self):
+            raise IndexError(f"Row {row} out of range (0-{len(self) - 1})")
+        shard = bisect.bisect_right(self._starts, row) - 1
+        return self._stores[shard][row - self._starts[shard]]
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __iter__(self) -> Iterator[dict]:
+        for store in self._stores:
+            yield from store
+
+
+def open_document_store(index_dir: Path) -> ColumnarDocumentStore | None:
+    """Open the columnar store of an index version, if it has one.
+
+    Args:
+        index_dir: Index version directory.
+
+    Returns:
+        The opened store, or None for indexes without a docstore/ directory.
+    """
+    if not (index_dir / DOCSTORE_DIR / "docstore.json").exists():
+        return None
+    return ColumnarDocumentStore(index_dir)
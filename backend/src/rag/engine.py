@@ -5,11 +5,17 @@ using LangChain components (LCEL chains, FAISS vector store, ChatMistralAI).
 """
 
 import json
+import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 from pathlib import Path
 
 import faiss
 import numpy as np
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_community.vectorstores import FAISS
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
@@ -18,11 +24,141 @@ from src.config.constants import (
     CONVERSATION_SYSTEM_PROMPT,
     PROCESSED_DATA_DIR,
     RAG_SYSTEM_PROMPT_TEMPLATE,
+    SUMMARY_PROMPT_TEMPLATE,
 )
 from src.config.settings import settings
+from src.data.documents import default_documents_path, read_documents
+from src.rag.docstore import (
+    ColumnarDocumentStore,
+    InMemoryDocumentStore,
+    ShardedDocumentStore,
+    open_document_store,
+)
 from src.rag.embeddings import get_embeddings
+from src.rag.listing import EventListing
 from src.rag.llm import get_llm
+from src.rag.shards import (
+    merge_ranked,
+    normalize_place,
+    read_shard_manifest,
+    route_query,
+    shard_dir,
+)
 from src.rag.vectorstore import load_vectorstore
+from src.rag.versions import VERSIONS_DIR, current_version, resolve_index_dir
+from src.utils.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+MAX_LISTED_OCCURRENCES = 3  # Dates à venir affichées dans le contexte du LLM
+
+# Pool partagé par les moteurs successifs (rechargements) pour interroger les shards
+_shard_executor: ThreadPoolExecutor | None = None
+
+
+def get_shard_executor() -> ThreadPoolExecutor:
+    """Retourne le pool de threads de recherche dans les shards (créé au premier appel)."""
+    global _shard_executor
+    if _shard_executor is None:
+        _shard_executor = ThreadPoolExecutor(
+            max_workers=settings.shard_search_workers, thread_name_prefix="shard-search"
+        )
+    return _shard_executor
+
+
+class DeadlineExceeded(TimeoutError):
+    """Échéance de la requête dépassée : le pipeline s'arrête avant l'étape suivante."""
+
+
+def check_deadline(deadline: float | None, stage: str) -> None:
+    """Lève DeadlineExceeded si l'échéance (horloge time.monotonic) est dépassée.
+
+    Args:
+        deadline: Échéance de la requête, ou None pour aucune.
+        stage: Étape qui ne sera pas exécutée (pour le message d'erreur).
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        raise DeadlineExceeded(f"Échéance dépassée avant l'étape {stage}")
+
+
+def _parse_date(value: str) -> datetime | None:
+    """Parse une date ISO 8601 (naïve = UTC)."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def upcoming_occurrences(occurrences: list[list[str]], now: datetime | None = None) -> list:
+    """Filtre les occurrences [début, fin] non terminées, triées chronologiquement.
+
+    Args:
+        occurrences: Liste compacte des occurrences d'un événement récurrent.
+        now: Date de référence (maintenant par défaut).
+
+    Returns:
+        Occurrences dont la fin est postérieure à now.
+    """
+    now = now or datetime.now(UTC)
+    upcoming = []
+    for start, end in occurrences:
+        end_date = _parse_date(end) or _parse_date(start)
+        if end_date is None or end_date >= now:
+            upcoming.append([start, end])
+    return upcoming
+
+
+def expand_occurrence(metadata: dict, now: datetime | None = None) -> dict:
+    """Positionne start_date/end_date sur la prochaine occurrence d'un événement récurrent.
+
+    Args:
+        metadata: Métadonnées du document (non modifiées).
+        now: Date de référence (maintenant par défaut).
+
+    Returns:
+        Copie des métadonnées, avec la prochaine occurrence si elles en contiennent.
+    """
+    occurrences = metadata.get("occurrences")
+    if not occurrences:
+        return metadata
+    upcoming = upcoming_occurrences(occurrences, now)
+    start, end = upcoming[0] if upcoming else occurrences[-1]
+    return {**metadata, "start_date": start, "end_date": end}
+
+
+def pool_chunk_scores(
+    parent_ids: list[str],
+    similarities: np.ndarray,
+    pooling: str = "max",
+) -> list[tuple[str, float, float, int]]:
+    """Agrège les scores des chunks par événement parent (vectorisé).
+
+    Args:
+        parent_ids: Événement parent de chaque chunk.
+        similarities: Similarité de chaque chunk, shape (n,).
+        pooling: "max" (meilleur chunk) ou "sum" (somme des chunks trouvés, qui
+            favorise les événements dont plusieurs passages correspondent).
+
+    Returns:
+        (parent_id, score agrégé, meilleure similarité, nombre de chunks) par
+        événement, triés par score décroissant (ordre de première apparition en
+        cas d'égalité).
+    """
+    unique, first_index, inverse = np.unique(
+        np.asarray(parent_ids, dtype=object), return_index=True, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    best = np.full(len(unique), -np.inf, dtype=np.float64)
+    np.maximum.at(best, inverse, similarities)
+    counts = np.bincount(inverse, minlength=len(unique))
+    scores: np.ndarray
+    if pooling == "sum":
+        scores = np.bincount(inverse, weights=similarities, minlength=len(unique))
+    else:
+        scores = best
+    order = np.lexsort((first_index, -scores))
+    return [(str(unique[i]), float(scores[i]), float(best[i]), int(counts[i])) for i in order]
 
 
 class RAGEngine:
@@ -35,9 +171,12 @@ class RAGEngine:
         - needs_rag(query: str) -> bool
         - conversation_response(query: str, history: list[dict] | None) -> str
         - encode_query(query: str) -> np.ndarray
-        - search(query: str, top_k: int) -> list[dict]
+        - search(query: str, top_k: int, city: str | None) -> list[dict]
+        - select_context(results: list[dict], max_documents: int | None) -> list[dict]
         - generate_response(query: str, results: list[dict], history: list[dict] | None) -> str
         - chat(query: str, top_k: int, history: list[dict] | None) -> dict
+        - summarize_history(summary: str | None, messages: list[dict]) -> str
+        - warm_up() -> None
         - num_documents: int (property)
         - embedding_dim: int (property)
     """
@@ -47,19 +186,64 @@ class RAGEngine:
 
         Args:
             index_dir: Chemin vers le répertoire de l'index FAISS.
-            documents_path: Chemin vers le fichier JSON des documents.
+            documents_path: Chemin vers le fichier des documents (.json ou .jsonl).
         """
         self.index_dir = index_dir or PROCESSED_DATA_DIR / "faiss_index"
-        self.documents_path = documents_path or PROCESSED_DATA_DIR / "rag_documents.json"
+        self.documents_path = documents_path or default_documents_path()
+
+        # Resolve the current index version (manifest.json), or a legacy flat directory
+        self.index_version = current_version(self.index_dir)
+        index_path = resolve_index_dir(self.index_dir)
 
-        # Load documents (for metadata access and backward compatibility)
-        if not self.documents_path.exists():
+        # Sharded index (one FAISS index per city / region): see src.rag.shards
+        self.shard_manifest = read_shard_manifest(index_path)
+        shard_keys = list(self.shard_manifest["shards"]) if self.shard_manifest else []
+
+        # Columnar document store of the index version (fields read lazily by row),
+        # or the JSON source for indexes written before it existed
+        document_store: (
+            ColumnarDocumentStore | InMemoryDocumentStore | ShardedDocumentStore | None
+        )
+        if self.shard_manifest is not None:
+            shard_stores = []
+            for key in shard_keys:
+                shard_store = open_document_store(shard_dir(index_path, key))
+                if shard_store is None:
+                    raise FileNotFoundError(f"Documents du shard manquants: {key}")
+                shard_stores.append(shard_store)
+            document_store = ShardedDocumentStore(shard_stores)
+        else:
+            document_store = open_document_store(index_path)
+        if document_store is None and not self.documents_path.exists():
             raise FileNotFoundError(f"Documents non trouvés: {self.documents_path}")
-        with open(self.documents_path, "r", encoding="utf-8") as f:
-            self.documents = json.load(f)
+
+        # Locate index files before creating any client
+        index_faiss = index_path / "index.faiss"
+        legacy_index = index_path / "events.index"
+        if self.shard_manifest is not None:
+            missing = [
+                key
+                for key in shard_keys
+                if not (shard_dir(index_path, key) / "index.faiss").exists()
+            ]
+            if missing:
+                raise FileNotFoundError(f"Shards d'index manquants: {', '.join(missing)}")
+        elif not index_faiss.exists() and not legacy_index.exists():
+            raise FileNotFoundError(
+                f"Index FAISS non trouvé. "
+                f"Attendu: {index_faiss} (LangChain) ou {legacy_index} (legacy). "
+                f"Exécutez le script de migration ou l'endpoint /rebuild."
+            )
+
+        if document_store is None:
+            document_store = InMemoryDocumentStore(read_documents(self.documents_path))
+        self.documents = document_store
+
+        # Listing index of GET /events (sort keys and filter columns)
+        self.listing = EventListing(self.documents, self.index_version)
 
         # Load config
-        config_file = self.index_dir / "config.json"
+        config_file = index_path / "config.json"
         if config_file.exists():
             with open(config_file, "r") as f:
                 self.config = json.load(f)
@@ -70,29 +254,37 @@ class RAGEngine:
         self._embeddings = get_embeddings()
         self._llm = get_llm()
         self._classification_llm = get_llm(temperature=0, max_tokens=10)
+        self._summary_llm = get_llm(temperature=0, max_tokens=settings.summary_max_tokens)
 
         # Load FAISS vector store (LangChain format)
-        index_faiss = self.index_dir / "index.faiss"
-        if index_faiss.exists():
-            self._vectorstore = load_vectorstore(self._embeddings, self.index_dir)
+        self._shards = None
+        if self.shard_manifest is not None:
+            self._shards = {
+                key: load_vectorstore(self._embeddings, shard_dir(index_path, key))
+                for key in shard_keys
+            }
+            # City (and shard label) names routed to their shard
+            self._city_to_shard = {
+                normalize_place(name): key
+                for key, shard in self.shard_manifest["shards"].items()
+                for name in [shard.get("label", ""), *shard.get("cities", [])]
+                if name
+            }
+            self._vectorstore = None
+            self._use_langchain_vectorstore = True
+        elif index_faiss.exists():
+            self._vectorstore = load_vectorstore(self._embeddings, index_path)
             self._use_langchain_vectorstore = True
         else:
-            # Fallback: check for legacy format (events.index)
-            legacy_index = self.index_dir / "events.index"
-            if legacy_index.exists():
-                self._legacy_index = faiss.read_index(str(legacy_index))
-                self._use_langchain_vectorstore = False
-            else:
-                raise FileNotFoundError(
-                    f"Index FAISS non trouvé. "
-                    f"Attendu: {index_faiss} (LangChain) ou {legacy_index} (legacy). "
-                    f"Exécutez le script de migration ou l'endpoint /rebuild."
-                )
+            # Fallback: legacy format (events.index)
+            self._legacy_index = faiss.read_index(str(legacy_index))
+            self._use_langchain_vectorstore = False
 
         # Build LCEL chains
         self._classification_chain = self._build_classification_chain()
         self._conversation_chain = self._build_conversation_chain()
         self._rag_chain = self._build_rag_chain()
+        self._summary_chain = self._build_summary_chain()
 
     def _build_classification_chain(self):
         """Build the query classification chain (SEARCH vs CHAT)."""
@@ -125,23 +317,35 @@ class RAGEngine:
         )
         return prompt | self._llm | StrOutputParser()
 
-    def _convert_history(self, history: list[dict] | None) -> list:
+    def _build_summary_chain(self):
+        """Build the rolling conversation summary chain."""
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                ("human", SUMMARY_PROMPT_TEMPLATE),
+            ]
+        )
+        return prompt | self._summary_llm | StrOutputParser()
+
+    def _convert_history(self, history: list[dict] | None) -> list[BaseMessage]:
         """Convert dict-based history to LangChain message objects.
 
         Args:
-            history: List of {"role": "user"|"assistant", "content": "..."} dicts.
+            history: List of {"role": "user"|"assistant"|"system", "content": "..."} dicts.
+                System entries carry the rolling conversation summary.
 
         Returns:
-            List of HumanMessage and AIMessage objects.
+            List of HumanMessage, AIMessage and SystemMessage objects.
         """
         if not history:
             return []
-        messages = []
+        messages: list[BaseMessage] = []
         for msg in history:
             if msg["role"] == "user":
                 messages.append(HumanMessage(content=msg["content"]))
             elif msg["role"] == "assistant":
                 messages.append(AIMessage(content=msg["content"]))
+            elif msg["role"] == "system":
+                messages.append(SystemMessage(content=msg["content"]))
         return messages
 
     def _format_context(self, results: list[dict]) -> str:
@@ -157,7 +361,15 @@ class RAGEngine:
             context = "Événements pertinents :\n\n"
             for i, result in enumerate(results, 1):
                 doc = result["document"]
-                context += f"Événement {i}:\n{doc['content']}\n\n"
+                context += f"Événement {i}:\n{doc['content']}\n"
+                occurrences = upcoming_occurrences(doc.get("metadata", {}).get("occurrences", []))
+                if len(occurrences) > 1:
+                    dates = ", ".join(start for start, _ in occurrences[:MAX_LISTED_OCCURRENCES])
+                    extra = len(occurrences) - MAX_LISTED_OCCURRENCES
+                    if extra > 0:
+                        dates += f" (+{extra} autres)"
+                    context += f"Prochaines dates: {dates}\n"
+                context += "\n"
         else:
             context = "Aucun événement trouvé pour cette recherche."
         return context
@@ -171,7 +383,8 @@ class RAGEngine:
         Returns:
             True si recherche d'événements, False si conversation simple.
         """
-        result = self._classification_chain.invoke({"query": query})
+        with observe_stage("classification"):
+            result = self._classification_chain.invoke({"query": query})
         return "SEARCH" in result.strip().upper()
 
     def conversation_response(self, query: str, history: list[dict] | None = None) -> str:
@@ -185,7 +398,9 @@ class RAGEngine:
             Réponse textuelle du LLM.
         """
         messages = self._convert_history(history)
-        return self._conversation_chain.invoke({"query": query, "history": messages})
+        with observe_stage("conversation"):
+            response: str = self._conversation_chain.invoke({"query": query, "history": messages})
+        return response
 
     def encode_query(self, query: str) -> np.ndarray:
         """Encode une requête en vecteur d'embedding.
@@ -199,45 +414,55 @@ class RAGEngine:
         Returns:
             Vecteur d'embedding normalisé, shape (1, embedding_dim).
         """
-        embedding = self._embeddings.embed_query(query)
+        with observe_stage("embedding"):
+            embedding = self._embeddings.embed_query(query)
         result = np.array([embedding], dtype=np.float32)
         faiss.normalize_L2(result)
         return result
 
-    def search(self, query: str, top_k: int = 5) -> list[dict]:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        city: str | None = None,
+        deadline: float | None = None,
+    ) -> list[dict]:
         """Effectue une recherche sémantique.
 
         Args:
             query: Requête de recherche.
             top_k: Nombre de résultats à retourner.
+            city: Ville à laquelle limiter la recherche (index shardé ; sinon
+                déduite des villes citées dans la requête).
+            deadline: Échéance (horloge time.monotonic) vérifiée entre l'embedding
+                de la requête et la recherche.
 
         Returns:
             Liste de résultats avec document, similarité et distance.
         """
-        if self._use_langchain_vectorstore:
-            # Use LangChain FAISS vector store
-            docs_with_scores = self._vectorstore.similarity_search_with_score(query, k=top_k)
-
-            results = []
-            for doc, score in docs_with_scores:
-                # Convert LangChain Document to expected format
-                results.append(
-                    {
-                        "document": {
-                            "id": doc.metadata.get("id", ""),
-                            "title": doc.metadata.get("title", ""),
-                            "content": doc.page_content,
-                            "metadata": doc.metadata,
-                        },
-                        "similarity": float(1 - score),  # L2 distance to similarity
-                        "distance": float(score),
-                    }
+        if self._shards is not None:
+            return self._search_shards(self._shards, query, top_k, city, deadline)
+        if self._use_langchain_vectorstore and self._vectorstore is not None:
+            # Use LangChain FAISS vector store. Long events are indexed as several
+            # chunks: over-fetch chunks, then pool them so top_k counts distinct events.
+            with observe_stage("embedding"):
+                embedding = self._embeddings.embed_query(query)
+            check_deadline(deadline, "search")
+            with observe_stage("search"):
+                chunks_with_scores = self._vectorstore.similarity_search_with_score_by_vector(
+                    embedding, k=top_k * settings.chunk_overfetch
                 )
-            return results
+                pooled = self._pool_chunks(chunks_with_scores)[:top_k]
+            return [
+                self._to_result(parent_id, similarity, doc)
+                for parent_id, _, similarity, doc in pooled
+            ]
         else:
             # Legacy: use raw FAISS index
             query_embedding = self.encode_query(query)
-            distances, indices = self._legacy_index.search(query_embedding, top_k)
+            check_deadline(deadline, "search")
+            with observe_stage("search"):
+                distances, indices = self._legacy_index.search(query_embedding, top_k)
 
             results = []
             for idx, dist in zip(indices[0], distances[0]):
@@ -252,6 +477,175 @@ class RAGEngine:
                     )
             return results
 
+    def _search_shards(
+        self,
+        shards: dict[str, FAISS],
+        query: str,
+        top_k: int,
+        city: str | None,
+        deadline: float | None = None,
+    ) -> list[dict]:
+        """Recherche dans un index shardé par ville / région.
+
+        Une requête limitée à une ville (paramètre city ou ville citée) n'interroge
+        que son shard ; les autres interrogent tous les shards en parallèle (pool de
+        threads, FAISS relâche le GIL). Les résultats de chaque shard, triés,
+        sont fusionnés par tas pour garder les top_k meilleurs.
+        """
+        if city is not None:
+            key = self._city_to_shard.get(normalize_place(city))
+            if key is None:
+                return []
+            keys = [key]
+        else:
+            keys = route_query(query, self._city_to_shard) or list(shards)
+
+        # Embed once for all the shards
+        with observe_stage("embedding"):
+            embedding = self._embeddings.embed_query(query)
+        check_deadline(deadline, "search")
+        k = top_k * settings.chunk_overfetch
+
+        def search_shard(key: str) -> list[tuple]:
+            vectorstore = shards[key]
+            return self._pool_chunks(
+                vectorstore.similarity_search_with_score_by_vector(embedding, k=k)
+            )
+
+        with observe_stage("search"):
+            if len(keys) == 1:
+                ranked = [search_shard(keys[0])]
+            else:
+                ranked = list(get_shard_executor().map(search_shard, keys))
+        return [
+            self._to_result(parent_id, similarity, doc)
+            for parent_id, _, similarity, doc in merge_ranked(ranked, top_k)
+        ]
+
+    @staticmethod
+    def _pool_chunks(chunks_with_scores: list[tuple]) -> list[tuple]:
+        """Regroupe les chunks trouvés par événement (voir pool_chunk_scores).
+
+        Args:
+            chunks_with_scores: (Document, distance L2) renvoyés par LangChain.
+
+        Returns:
+            (parent_id, score, similarité, meilleur chunk) par événement, triés par
+            score décroissant.
+        """
+        if not chunks_with_scores:
+            return []
+        best_chunk: dict[str, object] = {}
+        parent_ids = []
+        for doc, _ in chunks_with_scores:
+            parent_id = doc.metadata.get("parent_id") or doc.metadata.get("id", "")
+            best_chunk.setdefault(parent_id, doc)
+            parent_ids.append(parent_id)
+        # L2 distance to similarity
+        similarities = 1 - np.array([score for _, score in chunks_with_scores])
+        pooled = pool_chunk_scores(parent_ids, similarities, settings.chunk_pooling)
+        return [
+            (parent_id, score, similarity, best_chunk[parent_id])
+            for parent_id, score, similarity, _ in pooled
+        ]
+
+    def _to_result(self, parent_id: str, similarity: float, doc) -> dict:
+        """Construit un résultat de recherche à partir du meilleur chunk d'un événement.
+
+        Les événements récurrents sont positionnés sur leur prochaine occurrence.
+        """
+        document = self._hydrate(parent_id, doc)
+        return {
+            "document": {
+                **document,
+                "metadata": expand_occurrence(document["metadata"]),
+            },
+            "similarity": similarity,
+            "distance": 1 - similarity,
+        }
+
+    def _hydrate(self, doc_id: str, doc) -> dict:
+        """Reconstitue un événement à partir d'un chunk renvoyé par LangChain.
+
+        Les index récents ne gardent que les ids dans le pickle : l'événement est
+        lu dans le docstore colonnaire. Les anciens index portent encore le
+        document complet, utilisé tel quel.
+
+        Args:
+            doc_id: Id de l'événement parent.
+            doc: Meilleur chunk de l'événement (Document LangChain).
+        """
+        stored = None if doc.page_content else self.documents.get_by_id(doc_id)
+        if stored is None:
+            return {
+                "id": doc_id,
+                "title": doc.metadata.get("title", ""),
+                "content": doc.page_content,
+                "metadata": doc.metadata,
+            }
+        return {
+            "id": doc_id,
+            "title": stored["title"],
+            "content": stored["content"],
+            "metadata": {"id": doc_id, "title": stored["title"], **stored["metadata"]},
+        }
+
+    def get_events(self, doc_ids: list[str]) -> dict[str, dict]:
+        """Lit des événements par id dans la table id → ligne du docstore (O(1) par id).
+
+        Args:
+            doc_ids: Ids des événements.
+
+        Returns:
+            Événements trouvés par id (ids inconnus absents), positionnés sur
+            leur prochaine occurrence comme les résultats de recherche.
+        """
+        events = {}
+        for doc_id in doc_ids:
+            document = self.documents.get_by_id(doc_id)
+            if document is not None:
+                events[doc_id] = {
+                    **document,
+                    "metadata": expand_occurrence(document.get("metadata", {})),
+                }
+        return events
+
+    def select_context(
+        self,
+        results: list[dict],
+        max_documents: int | None = None,
+    ) -> list[dict]:
+        """Sélectionne les documents à envoyer au LLM (top_k adaptatif).
+
+        Les résultats (triés par similarité décroissante) sont conservés tant que :
+        - la similarité reste au-dessus de settings.min_similarity_score ;
+        - la chute relative par rapport au résultat précédent ne dépasse pas
+          settings.score_gap_ratio ;
+        - le plafond max_documents (ou settings.max_context_documents) n'est pas atteint.
+
+        Args:
+            results: Résultats de la recherche sémantique, triés par pertinence.
+            max_documents: Plafond optionnel (typiquement le top_k de la requête).
+
+        Returns:
+            Sous-liste des résultats retenus comme contexte.
+        """
+        cap = settings.max_context_documents
+        if max_documents is not None:
+            cap = min(cap, max_documents)
+
+        selected: list[dict] = []
+        previous: float | None = None
+        for result in results[:cap]:
+            score = result["similarity"]
+            if score < settings.min_similarity_score:
+                break
+            if previous is not None and previous - score > settings.score_gap_ratio * abs(previous):
+                break
+            selected.append(result)
+            previous = score
+        return selected
+
     def generate_response(
         self,
         query: str,
@@ -270,26 +664,62 @@ class RAGEngine:
         """
         context = self._format_context(results)
         messages = self._convert_history(history)
-        return self._rag_chain.invoke(
-            {
-                "context": context,
-                "query": query,
-                "history": messages,
-            }
+        with observe_stage("generation"):
+            response: str = self._rag_chain.invoke(
+                {
+                    "context": context,
+                    "query": query,
+                    "history": messages,
+                }
+            )
+        return response
+
+    def retrieve_context(
+        self, query: str, top_k: int = 5, deadline: float | None = None
+    ) -> tuple[bool, list[dict], list[dict]]:
+        """Classe la requête puis, si besoin, sélectionne le contexte à envoyer au LLM.
+
+        Args:
+            query: Question de l'utilisateur.
+            top_k: Nombre maximum de documents à récupérer.
+            deadline: Échéance (horloge time.monotonic) vérifiée entre les étapes.
+
+        Returns:
+            (used_rag, résultats retenus, candidats de la recherche) ; listes vides
+            pour une conversation simple.
+        """
+        check_deadline(deadline, "classification")
+        if not self.needs_rag(query):
+            return False, [], []
+
+        check_deadline(deadline, "search")
+        candidates = self.search(query, top_k=top_k, deadline=deadline)
+        results = self.select_context(candidates, max_documents=top_k)
+        logger.info(
+            "Contexte adaptatif: %d/%d documents envoyés au LLM (top_k=%d, %d caractères)",
+            len(results),
+            len(candidates),
+            top_k,
+            sum(len(r["document"]["content"]) for r in results),
         )
+        return True, results, candidates
 
     def chat(
         self,
         query: str,
         top_k: int = 5,
         history: list[dict] | None = None,
+        deadline: float | None = None,
     ) -> dict:
         """Pipeline intelligent : détecte si RAG nécessaire.
 
         Args:
             query: Question de l'utilisateur.
-            top_k: Nombre de documents à récupérer.
+            top_k: Nombre maximum de documents à récupérer. Le nombre réellement
+                envoyé au LLM est choisi par select_context.
             history: Historique de conversation.
+            deadline: Échéance (horloge time.monotonic) vérifiée entre les étapes :
+                une étape qui ne peut plus aboutir à temps n'est pas lancée.
 
         Returns:
             Dictionnaire avec la réponse, sources et indicateur RAG:
@@ -297,17 +727,16 @@ class RAGEngine:
                 "response": str,
                 "sources": list[dict],
                 "query": str,
-                "used_rag": bool
+                "used_rag": bool,
+                "candidates": list[dict]  # Résultats de recherche avant select_context
             }
         """
-        # Determine if we need RAG
-        use_rag = self.needs_rag(query)
-
+        use_rag, results, candidates = self.retrieve_context(query, top_k=top_k, deadline=deadline)
         if use_rag:
-            results = self.search(query, top_k=top_k)
+            check_deadline(deadline, "generation")
             response = self.generate_response(query, results, history=history)
         else:
-            results = []
+            check_deadline(deadline, "conversation")
             response = self.conversation_response(query, history=history)
 
         return {
@@ -315,8 +744,113 @@ class RAGEngine:
             "sources": results,
             "query": query,
             "used_rag": use_rag,
+            "candidates": candidates,
         }
 
+    def chat_stream(
+        self,
+        query: str,
+        top_k: int = 5,
+        history: list[dict] | None = None,
+        deadline: float | None = None,
+    ) -> Iterator[dict]:
+        """Pipeline de chat en flux : les sources, puis la réponse morceau par morceau.
+
+        Args:
+            query: Question de l'utilisateur.
+            top_k: Nombre maximum de documents à récupérer.
+            history: Historique de conversation.
+            deadline: Échéance (horloge time.monotonic) vérifiée entre les étapes.
+
+        Yields:
+            {"type": "sources", "sources": list[dict], "used_rag": bool}, puis
+            {"type": "token", "content": str} pour chaque morceau généré.
+        """
+        use_rag, results, _ = self.retrieve_context(query, top_k=top_k, deadline=deadline)
+        yield {"type": "sources", "sources": results, "used_rag": use_rag}
+
+        inputs = {"query": query, "history": self._convert_history(history)}
+        if use_rag:
+            stage, chain = "generation", self._rag_chain
+            inputs["context"] = self._format_context(results)
+        else:
+            stage, chain = "conversation", self._conversation_chain
+        check_deadline(deadline, stage)
+        with observe_stage(stage):
+            for chunk in chain.stream(inputs):
+                if chunk:
+                    yield {"type": "token", "content": chunk}
+
+    def warm_up(self) -> None:
+        """Parcourt l'index une fois pour que la première requête ne paie pas le chargement."""
+        if self._shards is not None:
+            indexes = [vectorstore.index for vectorstore in self._shards.values()]
+        elif self._use_langchain_vectorstore and self._vectorstore is not None:
+            indexes = [self._vectorstore.index]
+        else:
+            indexes = [self._legacy_index]
+        for index in indexes:
+            if index.ntotal:
+                index.search(np.zeros((1, index.d), dtype=np.float32), 1)
+
+    def apply_delta(
+        self,
+        vectorstore,
+        upserted: list[dict],
+        deleted_ids: list[str],
+        version: str | None = None,
+    ) -> None:
+        """Remplace le vector store et répercute un delta d'index sur les documents.
+
+        Le vector store modifié est une copie (voir clone_vectorstore) : les requêtes
+        en cours continuent d'utiliser l'ancien jusqu'au changement de référence.
+
+        Args:
+            vectorstore: Vector store mis à jour (IndexBuilder.upsert / delete).
+            upserted: Documents ajoutés ou remplacés (format rag_documents).
+            deleted_ids: Identifiants des documents supprimés.
+            version: Version d'index publiée par le delta. Son docstore colonnaire
+                remplace les documents ; à défaut, le delta est appliqué en mémoire.
+        """
+        document_store: ColumnarDocumentStore | InMemoryDocumentStore | None = None
+        if version is not None:
+            document_store = open_document_store(self.index_dir / VERSIONS_DIR / version)
+        if document_store is None:
+            removed = {doc.get("id") for doc in upserted} | set(deleted_ids)
+            document_store = InMemoryDocumentStore(
+                [doc for doc in self.documents if doc.get("id") not in removed] + list(upserted)
+            )
+        self.documents = document_store
+        self._vectorstore = vectorstore
+        if version is not None:
+            self.index_version = version
+        self.listing = EventListing(document_store, self.index_version)
+
+    def summarize_history(self, summary: str | None, messages: list[dict]) -> str:
+        """Intègre des messages sortis de la fenêtre d'historique dans le résumé.
+
+        Args:
+            summary: Résumé courant de la conversation (None si aucun).
+            messages: Messages à intégrer, du plus ancien au plus récent.
+
+        Returns:
+            Résumé mis à jour.
+        """
+        transcript = "\n".join(
+            f"{'Utilisateur' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+            for msg in messages
+        )
+        with observe_stage("summary"):
+            new_summary: str = self._summary_chain.invoke(
+                {"summary": summary or "(aucun)", "messages": transcript}
+            )
+        return new_summary.strip()
+
+    @property
+    def is_sharded(self) -> bool:
+        """Index découpé en shards par ville / région."""
+        return self._shards is not None
+
     @property
     def num_documents(self) -> int:
         """Nombre de documents indexés."""
@@ -5,31 +5,96 @@ FAISS vector stores using LangChain's document and embedding abstractions.
 """
 
 import json
+import os
+import re
 import time
+import unicodedata
 from pathlib import Path
-from typing import Callable
+from typing import Callable, cast
 
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.config.constants import PROCESSED_DATA_DIR
 from src.config.settings import settings
+from src.data.documents import (
+    copy_jsonl_except,
+    default_documents_path,
+    read_documents,
+    write_jsonl,
+)
+from src.rag.checkpoint import BuildCheckpoint, build_fingerprint
+from src.rag.dedup import (
+    build_report,
+    find_duplicate_clusters,
+    may_be_duplicates,
+    merge_duplicates,
+    normalized,
+    select_canonical,
+)
+from src.rag.docstore import open_document_store, write_docstore
 from src.rag.embeddings import get_embeddings
+from src.rag.shards import (
+    link_shards,
+    read_shard_manifest,
+    shard_dir,
+    shard_key,
+    write_shard_manifest,
+)
+from src.rag.vectorstore import (
+    add_documents_with_ids,
+    add_embedded_documents,
+    chunk_ids_of,
+    chunk_map,
+    create_id_mapped_vectorstore,
+    is_id_mapped,
+    load_vectorstore,
+    parent_id_of,
+    remove_ids,
+    slim_docstore,
+    stable_id,
+)
+from src.rag.versions import (
+    create_version_dir,
+    current_version,
+    gc_versions,
+    index_lock,
+    publish_version,
+    resolve_index_dir,
+)
+
+
+def _normalize_key(text: str) -> str:
+    """Normalise un texte pour la comparaison (minuscules, sans accents ni ponctuation)."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
 
 
 class IndexBuilder:
     """Construit l'index FAISS avec LangChain à partir des documents."""
 
-    def __init__(self, progress_callback: Callable[[str, float], None] | None = None):
+    def __init__(
+        self,
+        progress_callback: Callable[[str, float], None] | None = None,
+        documents_path: Path | None = None,
+        index_dir: Path | None = None,
+    ):
         """Initialise le constructeur d'index.
 
         Args:
             progress_callback: Callback optionnel pour les mises à jour de progression
                               (message, pourcentage entre 0 et 1)
+            documents_path: Fichier source des documents (.json ou .jsonl produit par
+                            src.ingest). Par défaut rag_documents.jsonl s'il existe.
+            index_dir: Répertoire de l'index FAISS (PROCESSED_DATA_DIR/faiss_index par défaut).
         """
         self.progress_callback = progress_callback
-        self.documents_path = PROCESSED_DATA_DIR / "rag_documents.json"
-        self.index_dir = PROCESSED_DATA_DIR / "faiss_index"
+        self.documents_path = documents_path or default_documents_path()
+        self.index_dir = index_dir or PROCESSED_DATA_DIR / "faiss_index"
 
     def _report_progress(self, message: str, percentage: float) -> None:
         """Rapporte la progression si un callback est défini."""
@@ -48,10 +113,18 @@ class IndexBuilder:
         if not self.documents_path.exists():
             raise FileNotFoundError(f"Documents non trouvés: {self.documents_path}")
 
-        with open(self.documents_path, "r", encoding="utf-8") as f:
-            raw_docs = json.load(f)
+        return self.to_langchain_documents(read_documents(self.documents_path))
 
-        # Convert to LangChain Documents
+    @staticmethod
+    def to_langchain_documents(raw_docs: list[dict]) -> list[Document]:
+        """Convertit des documents au format rag_documents en Documents LangChain.
+
+        Args:
+            raw_docs: Dictionnaires (id, title, content, metadata).
+
+        Returns:
+            Liste de LangChain Document objects.
+        """
         documents = []
         for doc in raw_docs:
             lc_doc = Document(
@@ -66,9 +139,209 @@ class IndexBuilder:
 
         return documents
 
+    @staticmethod
+    def to_rag_document(doc: Document) -> dict:
+        """Convertit un Document LangChain au format rag_documents (inverse de la méthode
+        to_langchain_documents)."""
+        metadata = {k: v for k, v in doc.metadata.items() if k not in ("id", "title")}
+        return {
+            "id": IndexBuilder._document_id(doc),
+            "title": doc.metadata.get("title", ""),
+            "content": doc.page_content,
+            "metadata": metadata,
+        }
+
+    @staticmethod
+    def _title_venue_key(metadata: dict) -> str | None:
+        """Clé titre + adresse normalisés d'un document sans uid (None si trop vague)."""
+        title = _normalize_key(metadata.get("title") or "")
+        venue = _normalize_key(metadata.get("address") or "")
+        if not title or not venue or venue == _normalize_key(metadata.get("city") or ""):
+            return None
+        return f"title:{title}|{venue}"
+
+    def collapse_recurring(self, documents: list[Document]) -> list[Document]:
+        """Regroupe les occurrences d'un même événement en un seul document.
+
+        OpenAgenda publie un enregistrement par occurrence. Les documents sont
+        regroupés par uid. Seuls les documents sans uid sont regroupés par titre +
+        adresse normalisés, et seulement si l'adresse est connue et n'est pas la
+        simple ville : deux uid différents ne sont jamais fusionnés. Chaque groupe
+        produit un seul vecteur dont les métadonnées portent la liste compacte des
+        occurrences ([début, fin], triées et dédoublonnées).
+
+        Args:
+            documents: Documents LangChain (une entrée par occurrence).
+
+        Returns:
+            Un document par événement, dans l'ordre de première apparition.
+        """
+        groups: list[list[Document]] = []
+        group_by_key: dict[str, int] = {}
+
+        for doc in documents:
+            metadata = doc.metadata
+            uid = metadata.get("uid") or metadata.get("id")
+            key = f"uid:{uid}" if uid else self._title_venue_key(metadata)
+
+            group = group_by_key.get(key) if key else None
+            if group is None:
+                group = len(groups)
+                groups.append([])
+                if key:
+                    group_by_key[key] = group
+            groups[group].append(doc)
+
+        collapsed = []
+        for members in groups:
+            if len(members) == 1:
+                collapsed.append(members[0])
+                continue
+
+            occurrences = sorted(
+                {
+                    (m.metadata.get("start_date", ""), m.metadata.get("end_date", ""))
+                    for m in members
+                }
+            )
+            first = min(members, key=lambda m: m.metadata.get("start_date", ""))
+            collapsed.append(
+                Document(
+                    page_content=first.page_content,
+                    metadata={
+                        **first.metadata,
+                        "occurrences": [list(occurrence) for occurrence in occurrences],
+                    },
+                )
+            )
+
+        return collapsed
+
+    def split_into_chunks(self, documents: list[Document]) -> list[Document]:
+        """Découpe les documents longs en chunks qui se chevauchent.
+
+        Les documents de moins de settings.chunk_size caractères donnent un seul
+        chunk portant l'id de l'événement. Les autres sont découpés en chunks
+        "<id>#<n>" de settings.chunk_size caractères (chevauchement
+        settings.chunk_overlap), chacun préfixé par le titre de l'événement.
+        Chaque chunk porte l'id de son événement parent (parent_id).
+
+        Args:
+            documents: Un document LangChain par événement.
+
+        Returns:
+            Chunks à embedder, dans l'ordre des événements.
+        """
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=settings.chunk_size,
+            chunk_overlap=settings.chunk_overlap,
+        )
+        chunks = []
+        for doc in documents:
+            parent_id = self._document_id(doc)
+            if len(doc.page_content) <= settings.chunk_size:
+                chunks.append(
+                    Document(
+                        page_content=doc.page_content,
+                        metadata={"id": parent_id, "parent_id": parent_id},
+                    )
+                )
+                continue
+
+            title = doc.metadata.get("title", "")
+            for i, text in enumerate(splitter.split_text(doc.page_content)):
+                if i and title:
+                    text = f"Titre: {title}\n{text}"
+                chunks.append(
+                    Document(
+                        page_content=text,
+                        metadata={"id": f"{parent_id}#{i}", "parent_id": parent_id},
+                    )
+                )
+        return chunks
+
+    def deduplicate(
+        self,
+        vectorstore: FAISS,
+        documents: list[Document],
+    ) -> tuple[list[Document], dict]:
+        """Fusionne les quasi-doublons (même événement publié par plusieurs organisateurs).
+
+        Exécuté après l'embedding : chaque événement est représenté par le vecteur
+        de son premier chunk. Les paires au-dessus de
+        settings.dedup_similarity_threshold (similarité cosinus) sont trouvées par
+        range search, retenues si même ville et dates qui se chevauchent
+        (may_be_duplicates), regroupées, et chaque groupe est réduit à un document
+        canonique (le plus détaillé) aux métadonnées fusionnées. Les chunks des
+        doublons sont retirés du vector store.
+
+        Args:
+            vectorstore: Vector store contenant les chunks des documents (modifié en place).
+            documents: Un document LangChain par événement.
+
+        Returns:
+            (documents conservés, rapport de déduplication)
+        """
+        threshold = settings.dedup_similarity_threshold
+        first_chunks: dict[str, str] = {}
+        for chunk_id in vectorstore.index_to_docstore_id.values():
+            first_chunks.setdefault(parent_id_of(vectorstore, chunk_id), chunk_id)
+
+        ids = [self._document_id(doc) for doc in documents]
+        faiss_ids = np.array([stable_id(first_chunks[doc_id]) for doc_id in ids], dtype=np.int64)
+        vectors = normalized(vectorstore.index.reconstruct_batch(faiss_ids))
+        clusters = find_duplicate_clusters(
+            vectors,
+            threshold,
+            compatible=lambda i, j: may_be_duplicates(documents[i].metadata, documents[j].metadata),
+        )
+
+        replaced: dict[int, Document] = {}
+        removed_rows: set[int] = set()
+        report_clusters = []
+        for rows in clusters:
+            canonical_row = rows[select_canonical([documents[row] for row in rows])]
+            duplicate_rows = [row for row in rows if row != canonical_row]
+            replaced[canonical_row] = merge_duplicates(
+                documents[canonical_row], [documents[row] for row in duplicate_rows]
+            )
+            removed_rows.update(duplicate_rows)
+            similarities = vectors[duplicate_rows] @ vectors[canonical_row]
+            report_clusters.append(
+                {
+                    "canonical": {
+                        "id": ids[canonical_row],
+                        "title": documents[canonical_row].metadata.get("title", ""),
+                    },
+                    "duplicates": [
+                        {
+                            "id": ids[row],
+                            "title": documents[row].metadata.get("title", ""),
+                            "similarity": round(float(similarity), 4),
+                        }
+                        for row, similarity in zip(duplicate_rows, similarities, strict=True)
+                    ],
+                }
+            )
+
+        if removed_rows:
+            remove_ids(vectorstore, chunk_ids_of(vectorstore, [ids[row] for row in removed_rows]))
+
+        kept = [
+            replaced.get(row, doc) for row, doc in enumerate(documents) if row not in removed_rows
+        ]
+        return kept, build_report(threshold, len(documents), report_clusters)
+
     def build_and_save(self, documents: list[Document], batch_size: int = 32) -> dict:
         """Construit et sauvegarde l'index FAISS avec LangChain.
 
+        L'index est un IndexIDMap2 : chaque vecteur est adressé par un id stable
+        dérivé de l'uid de l'événement, ce qui permet les mises à jour
+        incrémentales (upsert / delete).
+
+        Avec settings.index_shard_by ("city" ou "region"), la version publiée
+        contient un index par ville / région (voir src.rag.shards).
+
         Args:
             documents: Liste de LangChain Document objects.
             batch_size: Taille des lots pour le traitement.
@@ -76,57 +349,425 @@ class IndexBuilder:
         Returns:
             Configuration de l'index créé.
         """
+        vectorstore, checkpoint = self._embed(documents, batch_size)
+
+        # Merge near-duplicate events (same event posted by several organizers)
+        dedup_report = None
+        if settings.dedup_enabled:
+            documents, dedup_report = self.deduplicate(vectorstore, documents)
+            self._report_progress(
+                f"Déduplication: {dedup_report['duplicates_removed']} doublons fusionnés", 0.75
+            )
+
+        # Save using LangChain format
+        self._report_progress("Sauvegarde de l'index", 0.80)
+        rag_documents = [self.to_rag_document(doc) for doc in documents]
+        if settings.index_shard_by != "none":
+            config = self._save_sharded(
+                vectorstore, rag_documents, dedup_report, settings.index_shard_by
+            )
+        else:
+            config = self._save(vectorstore, rag_documents, dedup_report)
+        checkpoint.clear()
+
+        self._report_progress("Sauvegarde terminée", 0.95)
+
+        return config
+
+    def _embed(self, documents: list[Document], batch_size: int) -> tuple[FAISS, BuildCheckpoint]:
+        """Embedde les chunks des documents et assemble le vector store.
+
+        Chaque lot d'embeddings est ajouté à un checkpoint sur disque
+        (src.rag.checkpoint) : une construction interrompue reprend au dernier
+        lot terminé au lieu de tout recalculer. L'index est ensuite assemblé en
+        une seule passe à partir des vecteurs du checkpoint, à supprimer une fois
+        la version publiée.
+
+        Args:
+            documents: Un document LangChain par événement.
+            batch_size: Nombre de chunks par appel d'embedding.
+
+        Returns:
+            (vector store à ids stables, checkpoint de la construction)
+        """
         self._report_progress("Initialisation du modèle d'embeddings", 0.05)
         embeddings = get_embeddings()
 
-        total = len(documents)
-        self._report_progress(f"Génération des embeddings pour {total} documents", 0.10)
-
-        # Build vectorstore with batch processing for progress reporting
-        if total <= batch_size:
-            vectorstore = FAISS.from_documents(documents, embeddings)
-            self._report_progress("Embeddings générés", 0.70)
+        chunks = self.split_into_chunks(documents)
+        total = len(chunks)
+        ids = [chunk.metadata["id"] for chunk in chunks]
+        checkpoint = BuildCheckpoint(
+            self.index_dir,
+            build_fingerprint(
+                ids,
+                (chunk.page_content for chunk in chunks),
+                settings.embedding_model,
+                settings.embedding_dimension,
+            ),
+        )
+        if checkpoint.rows:
+            self._report_progress(
+                f"Reprise de la construction : {checkpoint.rows}/{total} chunks déjà embeddés",
+                0.10 + (checkpoint.rows / total) * 0.60,
+            )
         else:
-            # Build incrementally for progress reporting
-            first_batch = documents[:batch_size]
-            vectorstore = FAISS.from_documents(first_batch, embeddings)
-            self._report_progress(f"Embeddings: {batch_size}/{total}", 0.15)
+            self._report_progress(
+                f"Génération des embeddings pour {total} chunks ({len(documents)} documents)",
+                0.10,
+            )
 
-            for i in range(batch_size, total, batch_size):
-                batch = documents[i : i + batch_size]
-                vectorstore.add_documents(batch)
+        # Embed the remaining batches, each one checkpointed before the next
+        for i in range(checkpoint.rows, total, batch_size):
+            batch = chunks[i : i + batch_size]
+            checkpoint.append(embeddings.embed_documents([chunk.page_content for chunk in batch]))
+
+            # Progress from 10% to 70% during embedding generation
+            done = min(i + batch_size, total)
+            self._report_progress(f"Embeddings: {done}/{total}", 0.10 + (done / total) * 0.60)
+
+        # Assemble the index in one pass from the checkpointed vectors
+        vectorstore = create_id_mapped_vectorstore(embeddings, settings.embedding_dimension)
+        add_embedded_documents(vectorstore, chunks, ids, checkpoint.vectors())
+        self._report_progress("Construction de l'index FAISS terminée", 0.72)
+
+        return vectorstore, checkpoint
+
+    @staticmethod
+    def _document_id(doc: Document) -> str:
+        """Identifiant stable d'un document (uid de l'événement)."""
+        return doc.metadata.get("id") or doc.metadata.get("uid") or doc.page_content
+
+    def _save(
+        self,
+        vectorstore: FAISS,
+        changed: list[dict] | None = None,
+        dedup_report: dict | None = None,
+        new_chunk_ids: list[str] | None = None,
+    ) -> dict:
+        """Sauvegarde le vector store dans une nouvelle version de l'index et la publie.
+
+        Les fichiers sont écrits dans un répertoire de version neuf, puis le
+        manifest est remplacé atomiquement : un chargement concurrent ne voit
+        jamais un index à moitié écrit. Les anciennes versions sont supprimées
+        au-delà de settings.index_keep_versions.
+
+        Les documents indexés sont écrits dans le docstore colonnaire de la version
+        (src.rag.docstore) ; le pickle LangChain ne garde que leurs identifiants.
+        Les documents inchangés sont recopiés octet par octet depuis le docstore de
+        la version courante, sans être décodés. L'index FAISS et le pickle restent
+        réécrits en entier (voir scripts/benchmark_index_delta.py).
 
-                # Progress from 15% to 70% during embedding generation
-                progress = 0.15 + (min(i + batch_size, total) / total) * 0.55
-                self._report_progress(f"Embeddings: {min(i + batch_size, total)}/{total}", progress)
+        Args:
+            vectorstore: Vector store à sauvegarder.
+            changed: Documents (format rag_documents) ajoutés ou remplacés depuis la
+                     version courante ; les autres sont recopiés depuis celle-ci.
+            dedup_report: Rapport de déduplication, écrit dans dedup_report.json.
+            new_chunk_ids: Chunks ajoutés à un vector store déjà allégé : seuls
+                           ceux-ci sont allégés (None : tout le docstore).
+
+        Returns:
+            Configuration de l'index sauvegardé (avec sa version).
+        """
+        changed_by_id = {doc["id"]: doc for doc in changed or []}
+        previous = open_document_store(resolve_index_dir(self.index_dir))
+        parent_ids = chunk_map(vectorstore)
+        kept_ids = set()
+        if previous is not None:
+            kept_ids = {
+                doc_id
+                for doc_id in parent_ids
+                if doc_id not in changed_by_id and previous.row_of(doc_id) is not None
+            }
 
-        self._report_progress("Construction de l'index FAISS terminée", 0.75)
+        def new_documents():
+            for doc_id in parent_ids:
+                if doc_id in changed_by_id:
+                    yield changed_by_id[doc_id]
+                elif doc_id not in kept_ids:
+                    # Index written before the columnar store: contents are in the pickle
+                    yield self.to_rag_document(cast(Document, vectorstore.docstore.search(doc_id)))
 
-        # Save using LangChain format
-        self._report_progress("Sauvegarde de l'index", 0.80)
-        self.index_dir.mkdir(parents=True, exist_ok=True)
-        vectorstore.save_local(str(self.index_dir))
+        version_dir = create_version_dir(self.index_dir)
+        num_documents = write_docstore(new_documents(), version_dir, previous, kept_ids)
+        slim_docstore(vectorstore, new_chunk_ids if previous is not None else None)
+        vectorstore.save_local(str(version_dir))
+
+        return self._publish(
+            version_dir,
+            {"num_vectors": vectorstore.index.ntotal, "num_documents": num_documents},
+            dedup_report,
+        )
 
+    def _publish(self, version_dir: Path, stats: dict, dedup_report: dict | None) -> dict:
+        """Écrit config.json (et dedup_report.json) d'une version, puis la publie.
+
+        Args:
+            version_dir: Version entièrement écrite (index ou shards).
+            stats: Compteurs de la version (num_vectors, num_documents, ...).
+            dedup_report: Rapport de déduplication éventuel.
+
+        Returns:
+            Configuration de l'index publié.
+        """
         # Save config.json for compatibility
         config = {
             "provider": "mistral",
             "model_name": settings.embedding_model,
-            "index_type": "FAISS_LangChain",
+            "index_type": "FAISS_IDMap_LangChain",
             "embedding_dim": settings.embedding_dimension,
-            "num_vectors": total,
             "normalized": True,
             "documents_path": str(self.documents_path),
             "format": "langchain",
+            "id_scheme": "blake2b64(uid)",
+            "docstore": "columnar",
+            "chunk_size": settings.chunk_size,
+            "chunk_overlap": settings.chunk_overlap,
+            **stats,
+            "version": version_dir.name,
         }
 
-        config_path = self.index_dir / "config.json"
+        if dedup_report is not None:
+            config["duplicates_removed"] = dedup_report["duplicates_removed"]
+            with open(version_dir / "dedup_report.json", "w", encoding="utf-8") as f:
+                json.dump(dedup_report, f, ensure_ascii=False, indent=2)
+
+        config_path = version_dir / "config.json"
         with open(config_path, "w", encoding="utf-8") as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
 
-        self._report_progress("Sauvegarde terminée", 0.95)
+        publish_version(self.index_dir, version_dir)
+        gc_versions(self.index_dir, keep=settings.index_keep_versions)
 
         return config
 
+    def _save_sharded(
+        self,
+        vectorstore: FAISS,
+        documents: list[dict],
+        dedup_report: dict | None,
+        shard_by: str,
+        base_dir: Path | None = None,
+        replaced: frozenset[str] = frozenset(),
+    ) -> dict:
+        """Sauvegarde un index par ville / région dans une nouvelle version et la publie.
+
+        Chaque shard est un index complet (FAISS, pickle allégé, docstore
+        colonnaire) sous shards/<clé>/, décrit dans shards.json.
+
+        Args:
+            vectorstore: Vector store contenant les chunks de tous les documents.
+            documents: Documents indexés (format rag_documents).
+            dedup_report: Rapport de déduplication éventuel.
+            shard_by: "city" ou "region".
+            base_dir: Version shardée dont les shards absents de documents sont
+                repris tels quels (reconstruction d'un seul shard).
+            replaced: Shards de base_dir à ne pas reprendre (shard reconstruit).
+
+        Returns:
+            Configuration de l'index publié.
+        """
+        groups: dict[str, list[dict]] = {}
+        for doc in documents:
+            groups.setdefault(shard_key(doc["metadata"], shard_by), []).append(doc)
+
+        chunk_ids = chunk_map(vectorstore)
+
+        version_dir = create_version_dir(self.index_dir)
+        shards = {}
+        for key, shard_documents in groups.items():
+            ids = [chunk_id for doc in shard_documents for chunk_id in chunk_ids[doc["id"]]]
+            shard = create_id_mapped_vectorstore(
+                cast(Embeddings, vectorstore.embedding_function), vectorstore.index.d
+            )
+            add_embedded_documents(
+                shard,
+                [cast(Document, vectorstore.docstore.search(chunk_id)) for chunk_id in ids],
+                ids,
+                vectorstore.index.reconstruct_batch(
+                    np.array([stable_id(chunk_id) for chunk_id in ids], dtype=np.int64)
+                ),
+            )
+            directory = shard_dir(version_dir, key)
+            write_docstore(shard_documents, directory)
+            slim_docstore(shard)
+            shard.save_local(str(directory))
+
+            places = sorted({doc["metadata"].get(shard_by) or "" for doc in shard_documents})
+            cities = sorted({doc["metadata"].get("city") or "" for doc in shard_documents})
+            shards[key] = {
+                "label": next((place for place in places if place), ""),
+                "cities": [city for city in cities if city],
+                "documents": len(shard_documents),
+                "vectors": shard.index.ntotal,
+            }
+
+        if base_dir is not None:
+            base_shards = (read_shard_manifest(base_dir) or {}).get("shards", {})
+            reused = {
+                key: shard
+                for key, shard in base_shards.items()
+                if key not in groups and key not in replaced
+            }
+            link_shards(base_dir, version_dir, reused)
+            shards.update(reused)
+
+        write_shard_manifest(version_dir, shard_by, shards)
+        return self._publish(
+            version_dir,
+            {
+                "num_vectors": sum(shard["vectors"] for shard in shards.values()),
+                "num_documents": sum(shard["documents"] for shard in shards.values()),
+                "shard_by": shard_by,
+                "num_shards": len(shards),
+            },
+            dedup_report,
+        )
+
+    def _load_incremental_vectorstore(self, vectorstore: FAISS | None) -> FAISS:
+        """Charge (ou valide) un vector store supportant les mises à jour incrémentales.
+
+        Raises:
+            ValueError: Si l'index n'est pas un index à ids stables (ancien format).
+        """
+        if vectorstore is None and read_shard_manifest(resolve_index_dir(self.index_dir)):
+            raise ValueError(
+                "L'index actuel est découpé en shards : reconstruisez le shard concerné."
+            )
+        vectorstore = vectorstore or load_vectorstore(
+            get_embeddings(), resolve_index_dir(self.index_dir)
+        )
+        if not is_id_mapped(vectorstore):
+            raise ValueError(
+                "L'index actuel ne supporte pas les mises à jour incrémentales. "
+                "Reconstruisez-le une fois via /rebuild."
+            )
+        return vectorstore
+
+    def _update_source(self, upserted: list[dict], deleted_ids: set[str]) -> None:
+        """Répercute un delta sur le fichier source des documents (écriture atomique)."""
+        replaced_ids = {doc.get("id", "") for doc in upserted} | deleted_ids
+        tmp_path = self.documents_path.with_suffix(self.documents_path.suffix + ".tmp")
+        exists = self.documents_path.exists()
+
+        if self.documents_path.suffix == ".jsonl":
+            # Unchanged lines are copied as is, without decoding them
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if exists:
+                    with open(self.documents_path, encoding="utf-8") as source:
+                        copy_jsonl_except(source, f, replaced_ids)
+                write_jsonl(upserted, f)
+        else:
+            raw_docs = []
+            if exists:
+                raw_docs = [
+                    doc
+                    for doc in read_documents(self.documents_path)
+                    if doc.get("id") not in replaced_ids
+                ]
+            raw_docs.extend(upserted)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(raw_docs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.documents_path)
+
+    def apply_delta(
+        self,
+        upsert: list[dict] | None = None,
+        delete: list[str] | None = None,
+        vectorstore: FAISS | None = None,
+        base_version: str | None = None,
+        lock_timeout: float | None = None,
+    ) -> dict:
+        """Applique un delta (suppressions puis ajouts) à l'index, sans reconstruction.
+
+        Seuls les documents ajoutés sont (ré)embeddés. Le delta est appliqué sous
+        le verrou de l'index (index_lock), partagé avec les reconstructions et les
+        autres processus, puis publié en une seule version : un seul _save et une
+        seule réécriture du fichier source.
+
+        Args:
+            upsert: Documents au format rag_documents (id, title, content, metadata).
+                    Les occurrences d'un même événement sont regroupées.
+            delete: Identifiants (uid) des événements à supprimer.
+            vectorstore: Vector store à modifier en place (chargé depuis index_dir sinon).
+            base_version: Version d'index dont vectorstore est issu. Si une autre
+                version a été publiée depuis, l'index est rechargé depuis le disque
+                pour ne pas perdre l'écriture concurrente.
+            lock_timeout: Attente maximale du verrou en secondes (None : sans limite).
+
+        Returns:
+            {"upserted": int, "deleted": int, "index_vectors": int, "version": str,
+             "vectorstore": FAISS, "elapsed_ms": float} ; vectorstore est l'index publié.
+
+        Raises:
+            ValueError: Si l'index n'est pas un index à ids stables.
+            IndexLocked: Si le verrou n'est pas obtenu avant lock_timeout.
+        """
+        upsert = upsert or []
+        delete = delete or []
+        start_time = time.perf_counter()
+        with index_lock(self.index_dir, timeout=lock_timeout):
+            if vectorstore is not None and base_version != current_version(self.index_dir):
+                vectorstore = None  # Stale copy: start from the published version
+            vectorstore = self._load_incremental_vectorstore(vectorstore)
+            if not upsert and not delete:
+                return {
+                    "upserted": 0,
+                    "deleted": 0,
+                    "index_vectors": vectorstore.index.ntotal,
+                    "version": current_version(self.index_dir),
+                    "vectorstore": vectorstore,
+                    "elapsed_ms": 0.0,
+                }
+
+            deleted = sum(doc_id in chunk_map(vectorstore) for doc_id in set(delete))
+            remove_ids(vectorstore, chunk_ids_of(vectorstore, delete))
+
+            events = self.collapse_recurring(self.to_langchain_documents(upsert))
+            remove_ids(
+                vectorstore, chunk_ids_of(vectorstore, [self._document_id(e) for e in events])
+            )
+            chunks = self.split_into_chunks(events)
+            new_chunk_ids = [chunk.metadata["id"] for chunk in chunks]
+            add_documents_with_ids(vectorstore, chunks, new_chunk_ids)
+
+            config = self._save(
+                vectorstore,
+                [self.to_rag_document(doc) for doc in events],
+                new_chunk_ids=new_chunk_ids,
+            )
+            self._update_source(upsert, set(delete))
+
+        return {
+            "upserted": len(events),
+            "deleted": deleted,
+            "index_vectors": config["num_vectors"],
+            "version": config["version"],
+            "vectorstore": vectorstore,
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+
+    def upsert(self, docs: list[dict], vectorstore: FAISS | None = None) -> dict:
+        """Ajoute ou remplace des événements dans l'index (voir apply_delta).
+
+        Returns:
+            {"upserted": int, "index_vectors": int, "version": str, "elapsed_ms": float}
+        """
+        result = self.apply_delta(
+            upsert=docs, vectorstore=vectorstore, base_version=current_version(self.index_dir)
+        )
+        return {k: result[k] for k in ("upserted", "index_vectors", "version", "elapsed_ms")}
+
+    def delete(self, ids: list[str], vectorstore: FAISS | None = None) -> dict:
+        """Supprime des événements de l'index (voir apply_delta).
+
+        Returns:
+            {"deleted": int, "index_vectors": int, "version": str, "elapsed_ms": float}
+        """
+        result = self.apply_delta(
+            delete=ids, vectorstore=vectorstore, base_version=current_version(self.index_dir)
+        )
+        return {k: result[k] for k in ("deleted", "index_vectors", "version", "elapsed_ms")}
+
     def rebuild(self) -> dict:
         """Exécute le pipeline complet de reconstruction de l'index.
 
@@ -137,6 +778,10 @@ class IndexBuilder:
                 "documents_processed": int,
                 "embedding_dimension": int,
                 "index_vectors": int,
+                "index_version": str,
+                "vectors_saved": int,
+                "duplicates_removed": int,
+                "memory_saved_mb": float,
                 "elapsed_seconds": float,
                 "provider": str,
                 "model": str
@@ -149,14 +794,24 @@ class IndexBuilder:
 
         self._report_progress("Démarrage de la reconstruction", 0.0)
 
-        # Load documents
-        self._report_progress("Chargement des documents", 0.02)
-        documents = self.load_documents()
+        # Deltas wait until the new version is published: the source file read
+        # here cannot change before it, and no delta is lost
+        with index_lock(self.index_dir):
+            # Load documents
+            self._report_progress("Chargement des documents", 0.02)
+            documents = self.load_documents()
+
+            self._report_progress(f"{len(documents)} documents chargés", 0.05)
 
-        self._report_progress(f"{len(documents)} documents chargés", 0.05)
+            # Collapse recurring events (one vector per event, dates kept in metadata)
+            events = self.collapse_recurring(documents)
+            vectors_saved = len(documents) - len(events)
+            self._report_progress(
+                f"{len(events)} événements uniques ({vectors_saved} occurrences regroupées)", 0.06
+            )
 
-        # Build and save index
-        config = self.build_and_save(documents)
+            # Build and save index
+            config = self.build_and_save(events)
 
         self._report_progress("Reconstruction terminée", 1.0)
 
@@ -167,7 +822,60 @@ class IndexBuilder:
             "documents_processed": len(documents),
             "embedding_dimension": config["embedding_dim"],
             "index_vectors": config["num_vectors"],
+            "index_version": config["version"],
+            "vectors_saved": vectors_saved,
+            "duplicates_removed": config.get("duplicates_removed", 0),
+            # float32 vectors in a flat index: 4 bytes per dimension
+            "memory_saved_mb": round(vectors_saved * config["embedding_dim"] * 4 / 1024**2, 2),
             "elapsed_seconds": round(elapsed, 2),
             "provider": "mistral",
             "model": settings.embedding_model,
         }
+
+    def rebuild_shard(self, key: str) -> dict:
+        """Reconstruit un seul shard d'un index shardé.
+
+        Seuls les événements du shard sont embeddés ; les autres shards de la
+        version courante sont repris par liens physiques dans la nouvelle version.
+
+        Args:
+            key: Clé du shard (voir src.rag.shards.shard_key), par exemple "marseille".
+
+        Returns:
+            Configuration de l'index publié.
+
+        Raises:
+            ValueError: Si l'index courant n'est pas shardé.
+            FileNotFoundError: Si les documents source n'existent pas.
+        """
+        with index_lock(self.index_dir):
+            base_dir = resolve_index_dir(self.index_dir)
+            manifest = read_shard_manifest(base_dir)
+            if manifest is None:
+                raise ValueError("L'index actuel n'est pas découpé en shards : utilisez rebuild().")
+            shard_by = manifest["shard_by"]
+
+            self._report_progress(f"Reconstruction du shard {key}", 0.0)
+            events = [
+                event
+                for event in self.collapse_recurring(self.load_documents())
+                if shard_key(event.metadata, shard_by) == key
+            ]
+            vectorstore, checkpoint = self._embed(events, batch_size=32)
+
+            dedup_report = None
+            if settings.dedup_enabled and events:
+                events, dedup_report = self.deduplicate(vectorstore, events)
+
+            self._report_progress("Sauvegarde de l'index", 0.80)
+            config = self._save_sharded(
+                vectorstore,
+                [self.to_rag_document(event) for event in events],
+                dedup_report,
+                shard_by,
+                base_dir=base_dir,
+                replaced=frozenset({key}),
+            )
+        checkpoint.clear()
+        self._report_progress("Reconstruction terminée", 1.0)
+        return config
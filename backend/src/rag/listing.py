@@ -0,0 +1,240 @@
+"""Precomputed listing index of the indexed events (GET /events).
+
+The index is built once per engine from the document metadata. It holds the
+sort keys and the filter columns of every row as numpy arrays, so a page is
+located by binary search and filled by scanning forward only as far as needed:
+
+- sort orders: start date, or city then start date (ties broken by event id);
+- filters: city (a contiguous range of the city order), date range (events
+  overlapping it: the range ends at the first event starting after date_to and
+  starts at the first event whose running max end date reaches date_from) and
+  free events;
+- keyset pagination: the cursor carries the sort key of the last event of a
+  page, so a page costs O(log n + limit) whatever its depth and stays
+  consistent when the index is replaced between two requests.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import numpy as np
+
+from src.rag.shards import normalize_place
+
+SORT_KEYS = ("start_date", "city")
+
+_SEP = "\x1f"  # Sorts before every character of normalized cities and dates
+_AFTER_SEP = "\x20"  # Upper bound of the keys starting with "<prefix>\x1f"
+_NO_DATE = "~"  # Events without a (parsable) start date are listed last
+_FREE_UNKNOWN = -1
+
+
+def normalize_date(value: str | None, end_of_day: bool = False) -> str:
+    """Convert an ISO 8601 date to a sortable UTC key (YYYY-MM-DDTHH:MM:SS).
+
+    Args:
+        value: ISO date or datetime (naive values are UTC).
+        end_of_day: For a bare date, use its last second instead of midnight
+            (inclusive upper bound of a date range).
+
+    Returns:
+        The key, or an empty string if the value cannot be parsed.
+    """
+    if not value:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return ""
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UTC).replace(tzinfo=None)
+    if end_of_day and len(value) == 10:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def encode_cursor(key: tuple[str, str, str]) -> str:
+    """Encode the (city, start, id) key of the last listed event as an opaque cursor."""
+    payload = json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, str]:
+    """Decode a cursor returned by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not (isinstance(key, list) and len(key) == 3 and all(isinstance(k, str) for k in key)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key[0], key[1], key[2]
+
+
+@dataclass
+class ListingPage:
+    """One page of the listing."""
+
+    rows: list[int]  # Document store rows, in listing order
+    next_cursor: str | None  # None on the last page (the page after a full one may be empty)
+    scanned: int = 0  # Rows of the sort order examined to fill the page
+
+
+class EventListing:
+    """Sort keys and filter columns of the events of a document store."""
+
+    def __init__(self, documents, version: str | None = None):
+        """Build the listing index of a document store.
+
+        Args:
+            documents: Document store (rows in rag_documents format).
+            version: Index version the documents belong to (see etag).
+        """
+        self.version = version
+        ids, cities, starts, ends, free = [], [], [], [], []
+        for document in documents:
+            metadata = document.get("metadata", {})
+            start = normalize_date(metadata.get("start_date"))
+            ids.append(str(document.get("id", "")))
+            cities.append(normalize_place(metadata.get("city") or ""))
+            starts.append(start or _NO_DATE)
+            ends.append(normalize_date(metadata.get("end_date")) or start)
+            is_free = metadata.get("is_free")
+            free.append(_FREE_UNKNOWN if is_free is None else int(bool(is_free)))
+
+        self._ids = np.array(ids, dtype=str)
+        self._cities = np.array(cities, dtype=str)
+        self._starts = np.array(starts, dtype=str)
+        self._ends = np.array(ends, dtype=str)
+        self._free = np.array(free, dtype=np.int8)
+
+        by_start = np.char.add(np.char.add(self._starts, _SEP), self._ids)
+        by_city = np.char.add(np.char.add(self._cities, _SEP), by_start)
+        # End dates as ranks, so that their running max is a numpy accumulate
+        self._end_values, end_ranks = np.unique(self._ends, return_inverse=True)
+        city_ranks = np.unique(self._cities, return_inverse=True)[1].astype(np.int64)
+        self._stride = len(self._end_values) + 1
+        self._orders = {}
+        for sort, keys in (("start_date", by_start), ("city", by_city)):
+            rows = np.argsort(keys, kind="stable")
+            # Running max end rank along the order, restarted at each city of the city
+            # order: the city rank is non-decreasing there and outweighs any end rank
+            segments = city_ranks[rows] if sort == "city" else np.zeros(len(rows), dtype=np.int64)
+            reach = np.maximum.accumulate(segments * self._stride + end_ranks[rows])
+            self._orders[sort] = (keys[rows], rows, reach)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def etag(self) -> str:
+        """Entity tag of the listing: changes with the index version."""
+        return f"{self.version or 'legacy'}-{len(self)}"
+
+    def _key_of(self, row: int) -> tuple[str, str, str]:
+        """Sort key (city, start, id) of a row."""
+        return str(self._cities[row]), str(self._starts[row]), str(self._ids[row])
+
+    def page(
+        self,
+        limit: int,
+        sort: str = "start_date",
+        cursor: str | None = None,
+        offset: int = 0,
+        city: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        free: bool | None = None,
+    ) -> ListingPage:
+        """Get a page of the listing.
+
+        Args:
+            limit: Maximum number of events.
+            sort: One of SORT_KEYS.
+            cursor: next_cursor of the previous page (None: first page).
+            offset: Events skipped after the cursor (offset pagination).
+            city: Only events of this city.
+            date_from: Only events ending on or after this ISO date.
+            date_to: Only events starting on or before this ISO date (inclusive).
+            free: Only free (True) or paying (False) events; events whose price
+                is unknown match neither.
+
+        Returns:
+            The rows of the page and the cursor of the next one.
+
+        Raises:
+            ValueError: If sort or cursor is invalid.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort!r} (expected one of {SORT_KEYS})")
+
+        # A city is a contiguous range of the city order, itself sorted by start date
+        prefix = ""
+        if city is not None:
+            prefix = normalize_place(city) + _SEP
+            sort = "city"
+        keys, rows, reach = self._orders[sort]
+        lo = int(np.searchsorted(keys, prefix)) if prefix else 0
+        hi = int(np.searchsorted(keys, prefix[:-1] + _AFTER_SEP)) if prefix else len(keys)
+
+        # Events are sorted by start date: the ones starting after date_to end the range
+        upper = normalize_date(date_to, end_of_day=True) if date_to else ""
+        if upper and (prefix or sort == "start_date"):
+            hi = int(np.searchsorted(keys[lo:hi], prefix + upper + _AFTER_SEP)) + lo
+            upper = ""
+
+        if cursor is not None:
+            last_city, last_start, last_id = decode_cursor(cursor)
+            seek = f"{last_start}{_SEP}{last_id}"
+            if sort == "city":
+                seek = f"{last_city}{_SEP}{seek}"
+            lo = max(lo, int(np.searchsorted(keys, seek, side="right")))
+
+        # The events before the first one whose running max end reaches date_from all
+        # end before it: skip them (the rows after still need the end date mask)
+        lower = normalize_date(date_from) if date_from else ""
+        if lower and (prefix or sort == "start_date") and lo < hi:
+            segment = reach[lo] // self._stride * self._stride
+            target = segment + int(np.searchsorted(self._end_values, lower))
+            lo = int(np.searchsorted(reach[lo:hi], target)) + lo
+        filtered = bool(lower or upper or free is not None)
+        if not filtered:
+            # Offset pagination jumps straight to the page
+            lo, offset = min(lo + max(offset, 0), hi), 0
+
+        selected: list[int] = []
+        wanted = limit + offset
+        more = False
+        position, window = lo, max(limit, 1)
+        scanned = 0
+        while position < hi and not more:
+            candidates = rows[position : min(hi, position + window)]
+            scanned += len(candidates)
+            if filtered:
+                mask = np.ones(len(candidates), dtype=bool)
+                if lower:
+                    mask &= self._ends[candidates] >= lower
+                if upper:
+                    mask &= self._starts[candidates] <= upper
+                if free is not None:
+                    mask &= self._free[candidates] == int(free)
+                candidates = candidates[mask]
+            taken = candidates[: wanted - len(selected)]
+            selected.extend(taken.tolist())
+            position += window
+            window *= 2  # Selective filters: widen the scan geometrically
+            # Page full: there is a next page if any event is left to scan
+            more = len(selected) == wanted and (len(taken) < len(candidates) or position < hi)
+
+        selected = selected[offset:]
+        next_cursor = None
+        if more and selected:
+            next_cursor = encode_cursor(self._key_of(selected[-1]))
+        return ListingPage(rows=selected, next_cursor=next_cursor, scanned=scanned)
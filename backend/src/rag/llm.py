@@ -4,9 +4,29 @@ This module provides factory functions to create ChatMistralAI instances
 with configurable parameters for different use cases (generation, classification).
 """
 
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
 from langchain_mistralai import ChatMistralAI
 
 from src.config.settings import settings
+from src.utils.metrics import LLM_TOKENS
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Count the tokens reported by each LLM call (rag_llm_tokens_total metric)."""
+
+    def on_llm_end(self, response: LLMResult, **kwargs) -> None:
+        """Record the token usage of a finished call."""
+        output = response.llm_output or {}
+        usage = output.get("token_usage") or {}
+        model = output.get("model_name") or "unknown"
+        for kind in ("prompt", "completion"):
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                LLM_TOKENS.inc(tokens, model=model, kind=kind)
+
+
+token_usage_callback = TokenUsageCallback()
 
 
 def get_llm(
@@ -39,4 +59,5 @@ def get_llm(
         api_key=settings.mistral_api_key,
         temperature=temperature if temperature is not None else settings.llm_temperature,
         max_tokens=max_tokens if max_tokens is not None else settings.max_tokens,
+        callbacks=[token_usage_callback],
     )
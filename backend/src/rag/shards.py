@@ -0,0 +1,144 @@
+"""Index shards by city or region.
+
+A sharded index version holds one complete FAISS index per shard instead of a
+single index at the version root:
+
+    versions/<version>/
+        config.json
+        shards.json                 # shard manifest (see write_shard_manifest)
+        shards/
+            marseille/              # index.faiss, index.pkl, config.json, docstore/
+            lyon/
+
+Queries naming a city are routed to the shard holding it; the others are
+fanned out across shards and the per-shard results merged. A single shard can
+be rebuilt on its own: the new version hard-links the files of the other
+shards from the current one (see link_shards).
+"""
+
+import heapq
+import json
+import os
+import re
+import shutil
+import unicodedata
+from collections.abc import Iterable
+from itertools import islice
+from pathlib import Path
+
+SHARDS_FILE = "shards.json"
+SHARDS_DIR = "shards"
+UNKNOWN_SHARD = "inconnu"  # Events without city / region
+
+
+def normalize_place(name: str) -> str:
+    """Normalize a place name for matching (lowercase, no accents or punctuation)."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+def shard_slug(name: str) -> str:
+    """Directory-safe shard key of a city or region name (UNKNOWN_SHARD if empty)."""
+    return normalize_place(name).replace(" ", "-") or UNKNOWN_SHARD
+
+
+def shard_key(metadata: dict, shard_by: str) -> str:
+    """Shard of an event: slug of its city or region.
+
+    Args:
+        metadata: Event metadata (rag_documents format).
+        shard_by: "city" or "region".
+
+    Returns:
+        Directory-safe shard key.
+    """
+    return shard_slug(metadata.get(shard_by) or "")
+
+
+def read_shard_manifest(index_path: Path) -> dict | None:
+    """Read the shard manifest of an index version.
+
+    Args:
+        index_path: Index version directory.
+
+    Returns:
+        Manifest dictionary, or None for an unsharded index.
+    """
+    manifest_path = index_path / SHARDS_FILE
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest: dict = json.load(f)
+    return manifest
+
+
+def write_shard_manifest(index_path: Path, shard_by: str, shards: dict[str, dict]) -> dict:
+    """Write the shard manifest of an index version.
+
+    Args:
+        index_path: Index version directory.
+        shard_by: "city" or "region".
+        shards: Per shard key: {"label", "cities", "documents", "vectors"}.
+
+    Returns:
+        The written manifest.
+    """
+    manifest = {"shard_by": shard_by, "shards": dict(sorted(shards.items()))}
+    with open(index_path / SHARDS_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def shard_dir(index_path: Path, key: str) -> Path:
+    """Directory of a shard inside an index version."""
+    return index_path / SHARDS_DIR / key
+
+
+def link_shards(source: Path, target: Path, keys: Iterable[str]) -> None:
+    """Reuse shards of a published version in a new version, without copying.
+
+    Files are hard-linked (copied when the filesystem does not support it):
+    versions are never modified after publication, so sharing is safe.
+
+    Args:
+        source: Published index version directory.
+        target: New index version directory.
+        keys: Shards to reuse.
+    """
+
+    def link(src: str, dst: str) -> None:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    for key in keys:
+        shutil.copytree(shard_dir(source, key), shard_dir(target, key), copy_function=link)
+
+
+def route_query(query: str, city_to_shard: dict[str, str]) -> list[str]:
+    """Find the shards of the cities named in a query.
+
+    Args:
+        query: User query.
+        city_to_shard: Normalized city (or region) name -> shard key.
+
+    Returns:
+        Shard keys of the places mentioned as whole words (empty: fan out).
+    """
+    text = f" {normalize_place(query)} "
+    return sorted({key for city, key in city_to_shard.items() if city and f" {city} " in text})
+
+
+def merge_ranked(ranked_lists: Iterable[list[tuple]], top_k: int) -> list[tuple]:
+    """Merge per-shard results, each sorted by decreasing score (second field).
+
+    Args:
+        ranked_lists: One list per shard, sorted by decreasing score.
+        top_k: Number of results to keep.
+
+    Returns:
+        The top_k results across shards, by decreasing score.
+    """
+    return list(islice(heapq.merge(*ranked_lists, key=lambda hit: -hit[1]), top_k))
@@ -1,12 +1,17 @@
 """LangChain FAISS vector store management module.
 
 This module provides functions to load and build FAISS vector stores
-using LangChain's FAISS wrapper for semantic search.
+using LangChain's FAISS wrapper for semantic search, and to update
+ID-mapped stores in place (stable int64 ids derived from event uids).
 """
 
+import hashlib
 from pathlib import Path
-from typing import Callable
+from typing import Callable, cast
 
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
@@ -14,6 +19,9 @@ from langchain_core.embeddings import Embeddings
 from src.config.constants import PROCESSED_DATA_DIR
 from src.config.settings import settings
 
+# Attribute holding the event id -> chunk ids map of a vector store (see chunk_map)
+CHUNK_MAP_ATTR = "_chunk_map"
+
 
 def load_vectorstore(
     embeddings: Embeddings,
@@ -44,11 +52,13 @@ def load_vectorstore(
             f"Run the migration script or /rebuild endpoint to create it."
         )
 
-    return FAISS.load_local(
+    vectorstore = FAISS.load_local(
         folder_path=str(index_dir),
         embeddings=embeddings,
         allow_dangerous_deserialization=True,  # Required for pickle-based metadata
     )
+    chunk_map(vectorstore)
+    return vectorstore
 
 
 def build_vectorstore(
@@ -125,3 +135,216 @@ def save_vectorstore(
 
     if progress_callback:
         progress_callback("Index sauvegardé", 0.95)
+
+
+def stable_id(doc_id: str) -> int:
+    """Derive a stable FAISS id (non-negative int64) from a document id.
+
+    Args:
+        doc_id: Document identifier (OpenAgenda event uid).
+
+    Returns:
+        int: 63-bit id, identical across builds for the same doc_id.
+    """
+    digest = hashlib.blake2b(doc_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def create_id_mapped_vectorstore(embeddings: Embeddings, dimension: int) -> FAISS:
+    """Create an empty FAISS vector store backed by an ID-mapped index.
+
+    Vectors are addressed by stable_id(doc_id), so they can be replaced or
+    removed individually without rebuilding the index.
+
+    Args:
+        embeddings: LangChain Embeddings instance for encoding.
+        dimension: Embedding dimension.
+
+    Returns:
+        FAISS: An empty vector store (IndexIDMap2 over IndexFlatL2).
+    """
+    return FAISS(
+        embedding_function=embeddings,
+        index=faiss.IndexIDMap2(faiss.IndexFlatL2(dimension)),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
+
+
+def clone_vectorstore(vectorstore: FAISS) -> FAISS:
+    """Copy a vector store so it can be modified while the original keeps serving.
+
+    The FAISS index and the id mappings are copied; LangChain Documents are
+    immutable in practice and are shared between both stores.
+
+    Args:
+        vectorstore: Vector store to copy.
+
+    Returns:
+        FAISS: An independent vector store with the same content.
+    """
+    clone = FAISS(
+        embedding_function=vectorstore.embedding_function,
+        index=faiss.clone_index(vectorstore.index),
+        docstore=InMemoryDocstore(dict(cast(InMemoryDocstore, vectorstore.docstore)._dict)),
+        index_to_docstore_id=dict(vectorstore.index_to_docstore_id),
+    )
+    setattr(
+        clone,
+        CHUNK_MAP_ATTR,
+        {parent_id: list(ids) for parent_id, ids in chunk_map(vectorstore).items()},
+    )
+    return clone
+
+
+def parent_id_of(vectorstore: FAISS, doc_id: str) -> str:
+    """Get the event id a docstore entry belongs to (itself for unchunked stores)."""
+    doc = vectorstore.docstore.search(doc_id)
+    if isinstance(doc, Document):
+        return doc.metadata.get("parent_id") or doc_id
+    return doc_id
+
+
+def chunk_map(vectorstore: FAISS) -> dict[str, list[str]]:
+    """Get the event id -> docstore ids of its chunks map of a vector store.
+
+    The map is built once (at load time, see load_vectorstore), kept on the
+    vector store and maintained by add_embedded_documents and remove_ids, so
+    finding the chunks of a few events does not scan the whole index.
+
+    Args:
+        vectorstore: FAISS vector store whose documents carry a parent_id.
+
+    Returns:
+        dict[str, list[str]]: Chunk ids per event, in insertion order.
+    """
+    chunks: dict[str, list[str]] | None = getattr(vectorstore, CHUNK_MAP_ATTR, None)
+    if chunks is None:
+        chunks = {}
+        for doc_id in vectorstore.index_to_docstore_id.values():
+            chunks.setdefault(parent_id_of(vectorstore, doc_id), []).append(doc_id)
+        setattr(vectorstore, CHUNK_MAP_ATTR, chunks)
+    return chunks
+
+
+def chunk_ids_of(vectorstore: FAISS, parent_ids: list[str]) -> list[str]:
+    """List the docstore ids of all chunks of the given events.
+
+    Args:
+        vectorstore: FAISS vector store whose documents carry a parent_id.
+        parent_ids: Event ids.
+
+    Returns:
+        list[str]: Ids of the chunks, grouped by event.
+    """
+    chunks = chunk_map(vectorstore)
+    return [
+        doc_id for parent_id in dict.fromkeys(parent_ids) for doc_id in chunks.get(parent_id, [])
+    ]
+
+
+def slim_docstore(vectorstore: FAISS, ids: list[str] | None = None) -> None:
+    """Drop document contents from the LangChain docstore, in place.
+
+    Only the chunk id and its parent event id are kept in each Document;
+    contents and metadata are read from the columnar document store (see
+    src.rag.docstore), so the pickle no longer holds a second copy of the corpus.
+
+    Args:
+        vectorstore: Vector store whose docstore is replaced.
+        ids: Only slim these docstore ids (the others are already slim),
+            None for the whole docstore.
+    """
+    slim = {
+        doc_id: Document(
+            page_content="",
+            metadata={"id": doc_id, "parent_id": parent_id_of(vectorstore, doc_id)},
+        )
+        for doc_id in (vectorstore.index_to_docstore_id.values() if ids is None else ids)
+    }
+    if ids is None:
+        vectorstore.docstore = InMemoryDocstore(slim)
+    else:
+        cast(InMemoryDocstore, vectorstore.docstore)._dict.update(slim)
+
+
+def is_id_mapped(vectorstore: FAISS) -> bool:
+    """Check whether a vector store supports in-place upserts and deletes."""
+    return isinstance(vectorstore.index, faiss.IndexIDMap)
+
+
+def add_documents_with_ids(
+    vectorstore: FAISS,
+    documents: list[Document],
+    ids: list[str],
+) -> None:
+    """Embed documents and add them to an ID-mapped vector store.
+
+    Args:
+        vectorstore: ID-mapped FAISS vector store (see create_id_mapped_vectorstore).
+        documents: Documents to embed and add.
+        ids: Docstore ids (one per document), hashed with stable_id for FAISS.
+    """
+    if not documents:
+        return
+    embeddings = cast(Embeddings, vectorstore.embedding_function)
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+    add_embedded_documents(vectorstore, documents, ids, vectors)
+
+
+def add_embedded_documents(
+    vectorstore: FAISS,
+    documents: list[Document],
+    ids: list[str],
+    vectors: np.ndarray | list[list[float]],
+) -> None:
+    """Add already embedded documents to an ID-mapped vector store.
+
+    Args:
+        vectorstore: ID-mapped FAISS vector store (see create_id_mapped_vectorstore).
+        documents: Documents matching the vectors.
+        ids: Docstore ids (one per document), hashed with stable_id for FAISS.
+        vectors: Embeddings of the documents, shape (n, d).
+    """
+    if not documents:
+        return
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss_ids = np.array([stable_id(doc_id) for doc_id in ids], dtype=np.int64)
+    vectorstore.index.add_with_ids(vectors, faiss_ids)
+    cast(InMemoryDocstore, vectorstore.docstore).add(dict(zip(ids, documents, strict=True)))
+    vectorstore.index_to_docstore_id.update(zip(faiss_ids.tolist(), ids, strict=True))
+    chunks: dict[str, list[str]] | None = getattr(vectorstore, CHUNK_MAP_ATTR, None)
+    if chunks is not None:
+        for doc_id in ids:
+            chunks.setdefault(parent_id_of(vectorstore, doc_id), []).append(doc_id)
+
+
+def remove_ids(vectorstore: FAISS, ids: list[str]) -> int:
+    """Remove documents from an ID-mapped vector store, in place.
+
+    Args:
+        vectorstore: ID-mapped FAISS vector store.
+        ids: Docstore ids to remove (unknown ids are ignored).
+
+    Returns:
+        int: Number of documents removed.
+    """
+    faiss_ids = [stable_id(doc_id) for doc_id in ids]
+    present = [fid for fid in faiss_ids if fid in vectorstore.index_to_docstore_id]
+    if not present:
+        return 0
+    removed = [vectorstore.index_to_docstore_id[fid] for fid in present]
+    chunks: dict[str, list[str]] | None = getattr(vectorstore, CHUNK_MAP_ATTR, None)
+    if chunks is not None:
+        for doc_id in removed:
+            parent_id = parent_id_of(vectorstore, doc_id)
+            siblings = [chunk_id for chunk_id in chunks.get(parent_id, []) if chunk_id != doc_id]
+            if siblings:
+                chunks[parent_id] = siblings
+            else:
+                chunks.pop(parent_id, None)
+    vectorstore.index.remove_ids(np.array(present, dtype=np.int64))
+    vectorstore.docstore.delete(removed)
+    for fid in present:
+        del vectorstore.index_to_docstore_id[fid]
+    return len(present)
@@ -0,0 +1,189 @@
+"""Versioned index directories with an atomically swapped manifest.
+
+Layout of an index root directory:
+
+    faiss_index/
+        manifest.json            # {"current": "<version>", "updated_at": "..."}
+        versions/
+            20260301T101500_123456/   # index.faiss, index.pkl, config.json, ...
+            20260302T093000_654321/
+
+Builders always write a brand new version directory, then replace
+manifest.json with os.replace, so readers see either the old or the new
+index, never a half-written one. Roots without a manifest (legacy layout)
+are used as-is.
+
+Writers (rebuilds, deltas) hold index_lock on the root while they read the
+current version and publish the next one, across threads and processes:
+otherwise two writers starting from the same version would each publish
+their own result and one of them would be lost.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+try:  # Unix only
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+MANIFEST_FILE = "manifest.json"
+VERSIONS_DIR = "versions"
+LOCK_FILE = ".lock"
+
+# Roots locked by the current thread (the lock is re-entrant per thread)
+_held = threading.local()
+
+
+class IndexLocked(TimeoutError):
+    """Raised when the index lock is not acquired within the timeout."""
+
+
+@contextmanager
+def index_lock(root: Path, timeout: float | None = None) -> Iterator[None]:
+    """Hold the exclusive write lock of an index root (flock on root/.lock).
+
+    Re-entrant within a thread: a writer calling another writer (a delta
+    made of a delete and an upsert) takes the file lock once.
+
+    Args:
+        root: Index root directory.
+        timeout: Seconds to wait for the lock (None: wait as long as needed).
+
+    Raises:
+        IndexLocked: If another writer still holds the lock after timeout.
+    """
+    key = str(Path(root).resolve())
+    held: dict[str, int] = _held.__dict__.setdefault("roots", {})
+    if held.get(key) or fcntl is None:
+        held[key] = held.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    Path(root).mkdir(parents=True, exist_ok=True)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with open(Path(root) / LOCK_FILE, "a+") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise IndexLocked(f"Index locked by another writer: {root}") from None
+                time.sleep(0.05)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            held[key] = 0
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_manifest(root: Path) -> dict | None:
+    """Read the manifest of an index root.
+
+    Args:
+        root: Index root directory.
+
+    Returns:
+        Manifest dictionary, or None for a legacy (unversioned) root.
+    """
+    manifest_path = root / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest: dict = json.load(f)
+    return manifest
+
+
+def current_version(root: Path) -> str | None:
+    """Get the version published in the manifest (None for a legacy root)."""
+    manifest = read_manifest(root)
+    return manifest["current"] if manifest else None
+
+
+def resolve_index_dir(root: Path) -> Path:
+    """Get the directory holding the files of the current index version.
+
+    Args:
+        root: Index root directory.
+
+    Returns:
+        The current version directory, or root itself for a legacy layout.
+    """
+    version = current_version(root)
+    if version is None:
+        return root
+    return root / VERSIONS_DIR / version
+
+
+def create_version_dir(root: Path) -> Path:
+    """Create an empty directory for a new index version.
+
+    Args:
+        root: Index root directory.
+
+    Returns:
+        Path of the new version directory (named after the UTC creation time).
+    """
+    version = datetime.now(UTC).strftime("%Y%m%dT%H%M%S_%f")
+    version_dir = root / VERSIONS_DIR / version
+    version_dir.mkdir(parents=True)
+    return version_dir
+
+
+def publish_version(root: Path, version_dir: Path) -> str:
+    """Atomically make a fully written version directory the current index.
+
+    Args:
+        root: Index root directory.
+        version_dir: Directory created by create_version_dir.
+
+    Returns:
+        The published version name.
+    """
+    manifest = {
+        "current": version_dir.name,
+        "updated_at": datetime.now(UTC).isoformat(),
+    }
+    tmp_path = root / f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, root / MANIFEST_FILE)
+    return version_dir.name
+
+
+def gc_versions(root: Path, keep: int) -> list[str]:
+    """Delete old index versions, keeping the current one and the most recent ones.
+
+    Engines load the index in memory, so removing the directory of a version
+    still served by another process is safe.
+
+    Args:
+        root: Index root directory.
+        keep: Number of most recent versions to keep (the current one is always kept).
+
+    Returns:
+        Names of the deleted versions.
+    """
+    versions_root = root / VERSIONS_DIR
+    if not versions_root.exists():
+        return []
+    current = current_version(root)
+    versions = sorted(p.name for p in versions_root.iterdir() if p.is_dir())
+    stale = [v for v in versions[: max(len(versions) - keep, 0)] if v != current]
+    for version in stale:
+        shutil.rmtree(versions_root / version, ignore_errors=True)
+    return stale
@@ -0,0 +1,37 @@
+"""Token budgeting helpers for conversation history."""
+
+CHARS_PER_TOKEN = 4  # Approximation for French text with Mistral tokenizers
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text without calling a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count (at least 1 for non-empty text)
+    """
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def trim_history_to_tokens(history: list[dict], max_tokens: int) -> list[dict]:
+    """Keep the most recent messages that fit in a token budget.
+
+    Args:
+        history: Messages ordered chronologically (oldest first), with 'content' keys
+        max_tokens: Maximum number of tokens for the returned messages
+
+    Returns:
+        Suffix of history whose estimated size is within max_tokens
+    """
+    total = 0
+    start = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        total += estimate_tokens(history[i]["content"])
+        if total > max_tokens:
+            break
+        start = i
+    return history[start:]
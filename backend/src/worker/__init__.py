@@ -0,0 +1,23 @@
+"""Out-of-process workers.
+
+- run_worker: Rebuild worker polling the rebuild_jobs queue (``python -m src.worker``)
+- run_job: Runs one claimed rebuild job with progress, heartbeat and cancellation
+- run_retention: Purges expired sessions and rotates the monthly messages partitions
+"""
+
+from src.worker.rebuild import JobProgress, RebuildCancelled, run_job, run_worker
+from src.worker.retention import (
+    maintain_message_partitions,
+    purge_expired_sessions,
+    run_retention,
+)
+
+__all__ = [
+    "JobProgress",
+    "RebuildCancelled",
+    "maintain_message_partitions",
+    "purge_expired_sessions",
+    "run_job",
+    "run_retention",
+    "run_worker",
+]
@@ -0,0 +1,5 @@
+"""Allow ``python -m src.worker``."""
+
+from src.worker.cli import main
+
+main()
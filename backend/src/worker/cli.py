@@ -0,0 +1,80 @@
+"""Command line entry point of the rebuild worker.
+
+The worker also runs the retention pass (session TTL, messages partitions,
+see src.worker.retention) next to the rebuild queue.
+
+Usage:
+    uv run rag-worker
+    uv run python -m src.worker --once
+"""
+
+import argparse
+import asyncio
+import logging
+
+from src.config.constants import LOG_DATE_FORMAT, LOG_FORMAT
+from src.config.settings import settings
+from src.database.connection import close_db, get_session_maker, init_db
+from src.worker.rebuild import apply_resource_limits, run_worker
+from src.worker.retention import run_retention
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Exécute les reconstructions d'index demandées via POST /rebuild",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Traite les jobs en attente puis s'arrête"
+    )
+    parser.add_argument(
+        "--no-retention",
+        action="store_true",
+        help="Ne purge pas les sessions expirées (autre worker chargé de la rétention)",
+    )
+    parser.add_argument("--worker-id", default=None, help="Identifiant du worker (hôte:pid)")
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=settings.rebuild_worker_max_memory_mb,
+        help="Limite d'espace d'adressage en Mo (0 sans limite)",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=settings.rebuild_worker_nice,
+        help="Priorité CPU abaissée de cette valeur",
+    )
+    return parser.parse_args(argv)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Create the tables if needed and run the worker and retention loops."""
+    await init_db()
+    retention = None
+    try:
+        if not args.no_retention:
+            retention = asyncio.create_task(run_retention(get_session_maker(), once=args.once))
+        await run_worker(get_session_maker(), worker_id=args.worker_id, once=args.once)
+        if args.once and retention is not None:
+            await retention
+    finally:
+        if retention is not None:
+            retention.cancel()
+        await close_db()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Apply the resource limits and run the rebuild worker."""
+    args = parse_args(argv)
+    logging.basicConfig(level=settings.log_level, format=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+    apply_resource_limits(args.max_memory_mb, args.nice)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
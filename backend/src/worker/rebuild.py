@@ -0,0 +1,194 @@
+"""Rebuild worker: runs the index rebuild jobs queued by POST /rebuild.
+
+The worker is a separate process (``python -m src.worker``), so embedding and
+FAISS construction never compete with live API traffic for CPU or the GIL.
+Jobs live in the rebuild_jobs table:
+
+- the API queues a job (one queued or running job at a time);
+- the worker claims it, runs IndexBuilder.rebuild (rebuild_shard for a job
+  naming a shard) in a thread and writes the progress and a heartbeat every
+  settings.rebuild_worker_poll_interval;
+- a cancellation requested through the API is read back with the progress
+  and stops the build at its next progress report;
+- the published index version is picked up by the API processes through the
+  manifest watcher (see src.api.main.watch_index_manifest).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+from collections.abc import Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.settings import settings
+from src.database.repository import RebuildJobRepository
+
+try:  # Unix only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# IndexBuilder reports 0.80 right before writing and publishing the new version:
+# from there on the build is no longer interrupted, so no half-published index
+CANCEL_DEADLINE = 0.80
+
+
+class RebuildCancelled(Exception):
+    """Raised in the build thread when the job was cancelled."""
+
+
+class JobProgress:
+    """Progress callback shared between the build thread and the worker loop.
+
+    IndexBuilder calls it from the build thread; the worker loop reads the
+    last reported state and sets ``cancelled`` when the API asks for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.message: str | None = "Demarrage"
+        self.progress = 0.0
+        self.cancelled = threading.Event()
+
+    def __call__(self, message: str, percentage: float) -> None:
+        """Record a progress report (IndexBuilder progress_callback signature).
+
+        Raises:
+            RebuildCancelled: If cancellation was requested before the save stage.
+        """
+        if self.cancelled.is_set() and percentage < CANCEL_DEADLINE:
+            raise RebuildCancelled(message)
+        with self._lock:
+            self.message = message
+            self.progress = percentage
+
+    def snapshot(self) -> tuple[float, str | None]:
+        """Get the last reported (progress, message)."""
+        with self._lock:
+            return self.progress, self.message
+
+
+def default_worker_id() -> str:
+    """Identify this worker process in the rebuild_jobs table."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def apply_resource_limits(max_memory_mb: int, niceness: int) -> None:
+    """Bound the resources of the worker process.
+
+    Args:
+        max_memory_mb: Address space limit (RLIMIT_AS) in MB, 0 for no limit.
+        niceness: Increment added to the process niceness (lower CPU priority).
+    """
+    if niceness:
+        os.nice(niceness)
+    if max_memory_mb and resource is not None:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    logger.info("Limites du worker : memoire %s Mo, nice +%s", max_memory_mb or "-", niceness)
+
+
+def _default_builder(progress_callback: Callable[[str, float], None]):
+    """Create the IndexBuilder of a job (imported lazily, like the API did)."""
+    from src.rag.index_builder import IndexBuilder
+
+    return IndexBuilder(progress_callback=progress_callback)
+
+
+async def run_job(
+    job_id: UUID,
+    session_maker: async_sessionmaker[AsyncSession],
+    builder_factory: Callable = _default_builder,
+    shard: str | None = None,
+) -> str:
+    """Run one claimed job to completion, failure or cancellation.
+
+    Args:
+        job_id: Id of a job claimed by this worker (status in_progress).
+        session_maker: Session factory for the progress and final writes.
+        builder_factory: Creates the builder from a progress callback.
+        shard: Key of the shard to rebuild, None to rebuild the whole index.
+
+    Returns:
+        Final status of the job ('completed', 'failed' or 'cancelled').
+    """
+    progress = JobProgress()
+
+    def rebuild() -> dict:
+        builder = builder_factory(progress)
+        stats: dict = builder.rebuild_shard(shard) if shard else builder.rebuild()
+        return stats
+
+    build = asyncio.create_task(asyncio.to_thread(rebuild))
+
+    while True:
+        done, _ = await asyncio.wait({build}, timeout=settings.rebuild_worker_poll_interval)
+        if done:
+            break
+        percentage, message = progress.snapshot()
+        try:
+            async with session_maker() as db:
+                cancel = await RebuildJobRepository(db).update_progress(job_id, percentage, message)
+        except Exception:
+            # Keep building: the next write refreshes the heartbeat
+            logger.exception("Echec de l'ecriture de la progression du job %s", job_id)
+            continue
+        if cancel and not progress.cancelled.is_set():
+            logger.info("Annulation demandee pour le job %s", job_id)
+            progress.cancelled.set()
+
+    async with session_maker() as db:
+        repo = RebuildJobRepository(db)
+        try:
+            result = build.result()
+        except RebuildCancelled:
+            status = "cancelled"
+            await repo.finish(job_id, status, message="Reconstruction annulee")
+        except Exception as e:
+            logger.exception("Echec du job de reconstruction %s", job_id)
+            status = "failed"
+            await repo.finish(job_id, status, message="Echec de la reconstruction", error=str(e))
+        else:
+            status = "completed"
+            await repo.finish(job_id, status, message="Reconstruction terminee", result=result)
+
+    logger.info("Job de reconstruction %s : %s", job_id, status)
+    return status
+
+
+async def run_worker(
+    session_maker: async_sessionmaker[AsyncSession],
+    worker_id: str | None = None,
+    once: bool = False,
+) -> None:
+    """Poll the queue and run the rebuild jobs, one at a time.
+
+    Args:
+        session_maker: Session factory of the jobs database.
+        worker_id: Identifier written on claimed jobs (default: host:pid).
+        once: Run the queued jobs, then return instead of polling forever.
+    """
+    worker_id = worker_id or default_worker_id()
+    logger.info("Worker de reconstruction %s demarre", worker_id)
+
+    while True:
+        async with session_maker() as db:
+            repo = RebuildJobRepository(db)
+            stale = await repo.fail_stale(settings.rebuild_job_stale_seconds)
+            if stale:
+                logger.warning("%s job(s) sans heartbeat marques en echec", stale)
+            job = await repo.claim_next(worker_id)
+
+        if job is not None:
+            logger.info("Job de reconstruction %s pris en charge", job.id)
+            await run_job(job.id, session_maker, shard=job.shard)
+        elif once:
+            return
+        else:
+            await asyncio.sleep(settings.rebuild_worker_poll_interval)
@@ -0,0 +1,113 @@
+"""Retention pass of the worker: session TTL and monthly message partitions.
+
+Sessions and messages are otherwise only removed by DELETE /session. Every
+settings.session_purge_interval seconds the worker (``python -m src.worker``):
+
+- creates the messages partitions of the coming months
+  (settings.message_partitions_ahead);
+- deletes the sessions without an exchange for settings.session_ttl_days, in
+  transactions of settings.session_purge_batch_size sessions (their messages
+  go with them, ON DELETE CASCADE), so no purge holds locks for long;
+- drops the monthly partitions older than settings.message_retention_months,
+  when set: a DROP TABLE per month instead of deleting the rows.
+
+The retention should not be shorter than the TTL: a dropped month also removes
+the old messages of sessions still active.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.settings import settings
+from src.database.partitions import MessagePartitionRepository, add_months, month_start
+from src.database.repository import SessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_sessions(
+    session_maker: async_sessionmaker[AsyncSession],
+    ttl_days: float | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Delete the expired sessions, one bounded batch per transaction.
+
+    Args:
+        session_maker: Session factory of the sessions database.
+        ttl_days: Days without an exchange before expiry (default: settings).
+        batch_size: Sessions deleted per transaction (default: settings).
+
+    Returns:
+        Number of sessions deleted.
+    """
+    ttl_seconds = (ttl_days or settings.session_ttl_days) * 86400
+    batch_size = batch_size or settings.session_purge_batch_size
+    total = 0
+    while True:
+        async with session_maker() as db:
+            deleted = await SessionRepository(db).delete_expired(ttl_seconds, batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+        # Let the other tasks of the worker run between two batches
+        await asyncio.sleep(0)
+
+
+async def maintain_message_partitions(
+    session_maker: async_sessionmaker[AsyncSession],
+    now: datetime | None = None,
+) -> tuple[list[str], list[str]]:
+    """Create the upcoming monthly partitions and drop the expired ones.
+
+    Args:
+        session_maker: Session factory of the messages database.
+        now: Reference time (default: now).
+
+    Returns:
+        (partitions created, partitions dropped); both empty when the messages
+        table is not partitioned (migration 004 not applied).
+    """
+    current = month_start(now)
+    async with session_maker() as db:
+        partitions = MessagePartitionRepository(db)
+        if not await partitions.is_partitioned():
+            return [], []
+        created = await partitions.create_partitions(
+            current, add_months(current, settings.message_partitions_ahead)
+        )
+        dropped = []
+        if settings.message_retention_months:
+            dropped = await partitions.drop_partitions_before(
+                add_months(current, -settings.message_retention_months)
+            )
+    return created, dropped
+
+
+async def run_retention(
+    session_maker: async_sessionmaker[AsyncSession],
+    once: bool = False,
+) -> None:
+    """Run the retention pass every settings.session_purge_interval seconds.
+
+    Args:
+        session_maker: Session factory of the sessions database.
+        once: Run a single pass, then return.
+    """
+    while True:
+        try:
+            created, dropped = await maintain_message_partitions(session_maker)
+            if created or dropped:
+                logger.info("Partitions messages : creees %s, supprimees %s", created, dropped)
+            if settings.session_ttl_days > 0:
+                purged = await purge_expired_sessions(session_maker)
+                if purged:
+                    logger.info("%s session(s) expiree(s) supprimee(s)", purged)
+        except Exception:
+            # Retried at the next pass
+            logger.exception("Echec de la passe de retention")
+        if once:
+            return
+        await asyncio.sleep(settings.session_purge_interval)
@@ -2,8 +2,11 @@
 
 import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Generator
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from pydantic import HttpUrl
@@ -134,6 +137,66 @@ def mock_faiss_index(tmp_path: Path) -> Path:
     return index_dir
 
 
+def make_opendatasoft_records(count: int) -> list[dict]:
+    """Create raw OpenDataSoft records (HTML descriptions, a few old and invalid ones)."""
+    from datetime import datetime, timedelta
+
+    future = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    past = (datetime.now() - timedelta(days=800)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    records = []
+    for i in range(count):
+        record = {
+            "uid": f"ods-{i}",
+            "title_fr": f"Événement {i}",
+            "description_fr": f"<p>Description <b>riche</b> {i}</p>" if i % 2 else f"Texte {i}",
+            "firstdate_begin": future,
+            "lastdate_end": past if i % 10 == 9 else future,
+            "location_city": "Marseille",
+            "location_address": f"{i} La Canebière",
+            "canonicalurl": f"https://openagenda.com/events/{i}",
+        }
+        if i % 25 == 24:
+            del record["uid"]
+        records.append(record)
+    return records
+
+
+@pytest.fixture
+def opendatasoft_server() -> Generator[tuple[str, list[dict]], None, None]:
+    """Local stand-in for the OpenDataSoft records endpoint.
+
+    Serves paginated records (offset/limit) with a total_count, like the real API.
+
+    Yields:
+        (records URL, served records)
+    """
+    records = make_opendatasoft_records(250)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            body = json.dumps(
+                {"total_count": len(records), "results": records[offset : offset + limit]}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/records", records
+    server.shutdown()
+    server.server_close()
+
+
 # Markers
 def pytest_configure(config):
     """Configure pytest with custom markers."""
@@ -129,6 +129,51 @@ class TestChatEndpoint:
             assert "session_id" in data
             assert isinstance(data["sources"], list)
 
+    @pytest.mark.integration
+    def test_chat_history_served_from_cache(self, client):
+        """Test qu'une conversation active ne relit pas son historique en base."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from src.api.main import get_db
+        from src.database.history_cache import SessionHistoryCache
+
+        async def no_db():
+            yield None
+
+        unit_of_work = MagicMock()
+        unit_of_work.load_history = AsyncMock(return_value=({}, []))
+        unit_of_work.save_exchanges = AsyncMock()
+        rag = MagicMock()
+        histories = []
+
+        def chat(query, top_k, history, deadline):
+            histories.append(history)
+            return {"response": "Bonjour", "sources": [], "query": query}
+
+        rag.chat.side_effect = chat
+        cache = SessionHistoryCache(max_entries=10, max_bytes=1024 * 1024, ttl=60.0)
+
+        app.dependency_overrides[get_db] = no_db
+        try:
+            with (
+                patch("src.api.main.ChatUnitOfWork", return_value=unit_of_work),
+                patch("src.api.main.get_rag_engine", return_value=rag),
+                patch("src.api.main._message_writer", None),
+                patch("src.api.main._history_cache", cache),
+                patch("src.api.main.update_session_summary", AsyncMock(return_value=None)),
+            ):
+                session_id = client.post("/chat", json={"query": "Salut"}).json()["session_id"]
+                response = client.post(
+                    "/chat", json={"query": "Et demain ?", "session_id": session_id}
+                )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        assert response.status_code == 200
+        unit_of_work.load_history.assert_awaited_once()
+        assert [m["content"] for m in histories[1]] == ["Salut", "Bonjour"]
+        assert cache.stats()["hits"] == 1
+
 
 class TestSessionEndpoints:
     """Tests pour les endpoints de gestion de session."""
@@ -139,6 +184,20 @@ class TestSessionEndpoints:
         response = client.get("/session/nonexistent-session-id")
         assert response.status_code == 404
 
+    @pytest.mark.integration
+    def test_session_messages_invalid_id_returns_400(self, client):
+        """Test que GET /session/{id}/messages rejette un session_id invalide."""
+        response = client.get("/session/nonexistent-session-id/messages")
+        assert response.status_code == 400
+
+    @pytest.mark.integration
+    def test_session_messages_order_validated(self, client):
+        """Test que l'ordre de l'historique est asc ou desc."""
+        response = client.get(
+            "/session/00000000-0000-0000-0000-000000000000/messages", params={"order": "random"}
+        )
+        assert response.status_code == 422
+
     @pytest.mark.integration
     def test_delete_nonexistent_session_returns_404(self, client):
         """Test que DELETE /session pour une session inexistante retourne 404."""
@@ -182,6 +241,185 @@ class TestSessionEndpoints:
         assert get_response.status_code == 404
 
 
+class TestChatWebSocket:
+    """Tests pour le canal WebSocket /ws/chat."""
+
+    @pytest.mark.integration
+    def test_invalid_session_id_closes_connection(self, client):
+        """Test qu'un session_id invalide ferme la connexion (code 1008)."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with client.websocket_connect("/ws/chat?session_id=invalid") as websocket:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+        assert closed.value.code == 1008
+
+    @pytest.mark.integration
+    def test_streams_and_keeps_history_in_memory(self, client):
+        """Test que l'historique est lu une fois et enrichi en memoire entre deux questions."""
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        @asynccontextmanager
+        async def session():
+            yield None
+
+        unit_of_work = MagicMock()
+        unit_of_work.load_history = AsyncMock(return_value=({}, []))
+        unit_of_work.save_exchanges = AsyncMock()
+        rag = MagicMock()
+        histories = []
+
+        def chat_stream(query, top_k, history, deadline):
+            histories.append(history)
+            yield {"type": "sources", "sources": [], "used_rag": False}
+            yield {"type": "token", "content": "Bon"}
+            yield {"type": "token", "content": "jour"}
+
+        rag.chat_stream.side_effect = chat_stream
+
+        with (
+            patch("src.api.main.get_session_maker", return_value=session),
+            patch("src.api.main.ChatUnitOfWork", return_value=unit_of_work),
+            patch("src.api.main.get_rag_engine", return_value=rag),
+            patch("src.api.main._message_writer", None),
+            patch("src.api.main.update_session_summary", AsyncMock(return_value=None)),
+        ):
+            with client.websocket_connect("/ws/chat") as websocket:
+                assert websocket.receive_json()["type"] == "session"
+                for query in ("Salut", "Et demain ?"):
+                    websocket.send_json({"query": query})
+                    events = [websocket.receive_json() for _ in range(4)]
+                    assert [e["type"] for e in events] == ["sources", "token", "token", "done"]
+                    assert events[-1]["response"] == "Bonjour"
+
+        unit_of_work.load_history.assert_awaited_once()
+        assert unit_of_work.save_exchanges.await_count == 2
+        assert [m["content"] for m in histories[1]] == ["Salut", "Bonjour"]
+
+    @pytest.mark.integration
+    def test_engine_error_keeps_connection_open(self, client):
+        """Test qu'une erreur du moteur renvoie une erreur 500 sans fermer la connexion."""
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        @asynccontextmanager
+        async def session():
+            yield None
+
+        unit_of_work = MagicMock()
+        unit_of_work.load_history = AsyncMock(return_value=({}, []))
+        unit_of_work.save_exchanges = AsyncMock(side_effect=[RuntimeError("db down"), None])
+        rag = MagicMock()
+        calls = []
+
+        def chat_stream(query, top_k, history, deadline):
+            calls.append(query)
+            if len(calls) == 1:
+                raise RuntimeError("LLM indisponible")
+            yield {"type": "sources", "sources": [], "used_rag": False}
+            yield {"type": "token", "content": "Bonjour"}
+
+        rag.chat_stream.side_effect = chat_stream
+
+        with (
+            patch("src.api.main.get_session_maker", return_value=session),
+            patch("src.api.main.ChatUnitOfWork", return_value=unit_of_work),
+            patch("src.api.main.get_rag_engine", return_value=rag),
+            patch("src.api.main._message_writer", None),
+            patch("src.api.main.update_session_summary", AsyncMock(return_value=None)),
+        ):
+            with client.websocket_connect("/ws/chat") as websocket:
+                assert websocket.receive_json()["type"] == "session"
+                websocket.send_json({"query": "Salut"})
+                assert websocket.receive_json()["status"] == 500
+                # Exchange not saved: reported, the connection stays usable
+                websocket.send_json({"query": "Salut"})
+                events = [websocket.receive_json() for _ in range(3)]
+                assert (events[-1]["type"], events[-1]["status"]) == ("error", 500)
+                websocket.send_json({"query": "Salut"})
+                events = [websocket.receive_json() for _ in range(3)]
+                assert events[-1]["type"] == "done"
+
+    @pytest.mark.integration
+    def test_history_failure_closes_connection(self, client):
+        """Test qu'un echec de lecture de l'historique ferme la connexion (code 1011)."""
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from starlette.websockets import WebSocketDisconnect
+
+        @asynccontextmanager
+        async def session():
+            yield None
+
+        unit_of_work = MagicMock()
+        unit_of_work.load_history = AsyncMock(side_effect=RuntimeError("db down"))
+
+        with (
+            patch("src.api.main.get_session_maker", return_value=session),
+            patch("src.api.main.ChatUnitOfWork", return_value=unit_of_work),
+            patch("src.api.main._history_cache", None),
+        ):
+            with client.websocket_connect("/ws/chat") as websocket:
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    websocket.receive_json()
+        assert closed.value.code == 1011
+
+
+class TestSessionSummary:
+    """Tests pour le repli de l'historique dans le resume de session."""
+
+    @pytest.mark.integration
+    def test_folds_messages_older_than_the_fetched_window(self):
+        """Test que les messages non resumes hors de la fenetre lue sont replies en premier."""
+        import asyncio
+        import uuid
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from src.api.main import HISTORY_FETCH_LIMIT, update_session_summary
+        from src.database.models import MessageModel
+
+        @asynccontextmanager
+        async def session():
+            yield None
+
+        def message(message_id):
+            return MessageModel(id=message_id, role="user", content=f"m{message_id}")
+
+        # 10 messages before the window of the HISTORY_FETCH_LIMIT latest ones
+        window = [message(i) for i in range(11, 11 + HISTORY_FETCH_LIMIT)]
+        first = [message(i) for i in range(1, 1 + HISTORY_FETCH_LIMIT)]
+
+        async def get_messages_after(session_id, after_id, limit, oldest=False):
+            return [m for m in (first if oldest else window) if m.id > (after_id or 0)]
+
+        session_repo = MagicMock()
+        session_repo.get_metadata = AsyncMock(return_value={"summarized_until": None})
+        session_repo.update_metadata = AsyncMock()
+        message_repo = MagicMock()
+        message_repo.get_messages_after = AsyncMock(side_effect=get_messages_after)
+        rag = MagicMock()
+        rag.summarize_history.side_effect = lambda summary, messages: f"{len(messages)}"
+
+        with (
+            patch("src.api.main.get_session_maker", return_value=session),
+            patch("src.api.main.SessionRepository", return_value=session_repo),
+            patch("src.api.main.MessageRepository", return_value=message_repo),
+            patch("src.api.main.get_rag_engine", return_value=rag),
+            patch("src.api.main._history_cache", None),
+            patch("src.api.main.trim_history_to_tokens", lambda messages, _: messages[-4:]),
+        ):
+            folded = asyncio.run(update_session_summary(uuid.uuid4()))
+
+        folded_batches = [len(c.args[1]) for c in rag.summarize_history.call_args_list]
+        assert folded_batches == [10, HISTORY_FETCH_LIMIT - 4]
+        assert folded == (str(HISTORY_FETCH_LIMIT - 4), HISTORY_FETCH_LIMIT - 4)
+        metadata = session_repo.update_metadata.await_args.args[1]
+        assert metadata["summarized_until"] == window[-5].id
+
+
 class TestRebuildEndpoint:
     """Tests pour l'endpoint /rebuild."""
 
@@ -205,6 +443,153 @@ class TestRebuildEndpoint:
         response = client.get("/rebuild/nonexistent-task-id")
         assert response.status_code == 404
 
+    @pytest.mark.integration
+    def test_rebuild_queues_shard(self, client):
+        """Test que le shard demande est normalise et enregistre sur le job."""
+        import uuid
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from src.api.main import get_db
+        from src.config.settings import settings
+
+        async def no_db():
+            yield None
+
+        job_repo = MagicMock()
+        job_repo.fail_stale = AsyncMock(return_value=0)
+        job_repo.create = AsyncMock(return_value=MagicMock(id=uuid.uuid4()))
+
+        app.dependency_overrides[get_db] = no_db
+        try:
+            with (
+                patch.object(settings, "rebuild_api_key", "test-key"),
+                patch("src.api.main.RebuildJobRepository", return_value=job_repo),
+            ):
+                sharded = client.post(
+                    "/rebuild", json={"shard": "Aix-en-Provence"}, headers={"X-API-Key": "test-key"}
+                )
+                full = client.post("/rebuild", headers={"X-API-Key": "test-key"})
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        assert sharded.status_code == 200
+        assert "aix-en-provence" in sharded.json()["message"]
+        assert full.status_code == 200
+        assert [call.kwargs["shard"] for call in job_repo.create.await_args_list] == [
+            "aix-en-provence",
+            None,
+        ]
+
+    @pytest.mark.integration
+    def test_index_delta_rejects_document_without_content(self, client):
+        """Test qu'un document sans contenu dans /index/delta est rejete (422)."""
+        from unittest.mock import patch
+
+        from src.config.settings import settings
+
+        with patch.object(settings, "rebuild_api_key", "test-key"):
+            response = client.post(
+                "/index/delta",
+                json={"upsert": [{"id": "evt-1", "title": "Concert"}]},
+                headers={"X-API-Key": "test-key"},
+            )
+        assert response.status_code == 422
+
+
+class TestEventsEndpoint:
+    """Tests pour l'endpoint /events."""
+
+    @pytest.mark.integration
+    def test_events_invalid_sort_rejected(self, client):
+        """Test qu'un tri inconnu est rejete."""
+        response = client.get("/events", params={"sort": "title"})
+        assert response.status_code == 422
+
+    @pytest.mark.integration
+    def test_events_limit_bounds(self, client):
+        """Test que limit doit etre strictement positif."""
+        response = client.get("/events", params={"limit": 0})
+        assert response.status_code == 422
+
+    @pytest.mark.integration
+    def test_events_batch_requires_ids(self, client):
+        """Test que POST /events/batch exige au moins un id."""
+        response = client.post("/events/batch", json={"ids": []})
+        assert response.status_code == 422
+
+    @pytest.mark.integration
+    def test_event_lookup_by_id(self, client):
+        """Test de la lecture par id : un evenement, un lot ordonne, un id inconnu."""
+        from unittest.mock import MagicMock, patch
+
+        documents = {
+            doc_id: {"id": doc_id, "title": doc_id.upper(), "content": "", "metadata": {}}
+            for doc_id in ("e1", "e2")
+        }
+        rag = MagicMock()
+        rag.listing.etag = "v1"
+        rag.get_events.side_effect = lambda ids: {i: documents[i] for i in ids if i in documents}
+
+        with patch("src.api.main.get_rag_engine", return_value=rag):
+            single = client.get("/events/e2")
+            missing = client.get("/events/e9")
+            batch = client.post("/events/batch", json={"ids": ["e2", "e9", "e1", "e2"]})
+
+        assert single.status_code == 200
+        assert single.json()["title"] == "E2"
+        assert missing.status_code == 404
+        assert [e["id"] for e in batch.json()["events"]] == ["e2", "e1"]
+        assert batch.json()["missing"] == ["e9"]
+
+
+class TestMetricsEndpoint:
+    """Tests pour l'endpoint /metrics."""
+
+    @pytest.mark.integration
+    def test_metrics_prometheus_format(self, client):
+        """Test que /metrics expose les histogrammes au format texte Prometheus."""
+        client.get("/events", params={"limit": 0})
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE rag_stage_duration_seconds histogram" in response.text
+        assert 'route="/events"' in response.text
+
+
+class TestServerTiming:
+    """Tests pour l'en-tete Server-Timing et le mode debug."""
+
+    @pytest.mark.integration
+    def test_search_debug_timings_and_scores(self, client):
+        """Test que /search renvoie Server-Timing et, avec debug, durees et scores."""
+        from unittest.mock import MagicMock, patch
+
+        from src.utils.metrics import observe_stage
+
+        def search(query, top_k, city, deadline):
+            with observe_stage("search"):
+                return [
+                    {
+                        "document": {"id": "e1", "title": "Concert", "content": "", "metadata": {}},
+                        "similarity": 0.8,
+                        "distance": 0.2,
+                    }
+                ]
+
+        rag = MagicMock()
+        rag.search.side_effect = search
+        with patch("src.api.main.get_rag_engine", return_value=rag):
+            response = client.post("/search", json={"query": "concert", "debug": True})
+
+        assert response.status_code == 200
+        assert "search;dur=" in response.headers["server-timing"]
+        assert "total;dur=" in response.headers["server-timing"]
+        debug = response.json()["debug"]
+        assert "search" in debug["timings_ms"]
+        assert debug["candidates"] == [
+            {"id": "e1", "title": "Concert", "similarity": 0.8, "selected": True}
+        ]
+
 
 class TestCORSHeaders:
     """Tests pour les headers CORS."""
@@ -0,0 +1,90 @@
+"""Tests unitaires pour le pool borné du moteur RAG (src.api.admission)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.admission import EngineExecutor, Overloaded
+from src.rag.engine import DeadlineExceeded, check_deadline
+
+
+def test_runs_call_in_pool():
+    """Test que l'appel s'exécute dans un thread du pool dédié."""
+    executor = EngineExecutor(max_workers=2, max_queue=0)
+
+    result = asyncio.run(executor.run(lambda x: (x, threading.current_thread().name), 3))
+
+    assert result[0] == 3
+    assert result[1].startswith("rag-engine")
+    assert executor.admitted == 0
+    executor.shutdown()
+
+
+def test_rejects_when_queue_full():
+    """Test qu'un appel au-delà des threads et de la file est refusé immédiatement."""
+    executor = EngineExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded) as rejected:
+            await executor.run(lambda: "rejected")
+        release.set()
+        return rejected.value, await queued, await running
+
+    rejected, queued, running = asyncio.run(scenario())
+
+    assert rejected.retry_after >= 1
+    assert (queued, running) == ("queued", True)
+    executor.shutdown()
+
+
+def test_deadline_cancels_queued_call():
+    """Test qu'un appel encore en file à l'échéance n'est jamais lancé."""
+    executor = EngineExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = []
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            await executor.run(started.append, 1, deadline=time.monotonic() + 0.05)
+        release.set()
+        await running
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+    assert started == []
+    assert executor.admitted == 0
+
+
+def test_running_call_keeps_its_slot_after_deadline():
+    """Test qu'un appel commencé garde sa place jusqu'à sa fin, même après l'échéance."""
+    executor = EngineExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(DeadlineExceeded):
+            await executor.run(release.wait, deadline=time.monotonic() + 0.05)
+        admitted_while_running = executor.admitted
+        release.set()
+        await asyncio.sleep(0.05)
+        return admitted_while_running
+
+    assert asyncio.run(scenario()) == 1
+    assert executor.admitted == 0
+    executor.shutdown()
+
+
+def test_check_deadline():
+    """Test que le pipeline s'arrête avant une étape quand l'échéance est passée."""
+    check_deadline(None, "generation")
+    check_deadline(time.monotonic() + 60, "generation")
+    with pytest.raises(DeadlineExceeded, match="generation"):
+        check_deadline(time.monotonic() - 1, "generation")
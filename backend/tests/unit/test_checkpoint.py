@@ -0,0 +1,65 @@
+"""Tests unitaires pour les checkpoints de construction (src.rag.checkpoint)."""
+
+import json
+
+import numpy as np
+
+from src.rag.checkpoint import (
+    CHECKPOINT_DIR,
+    PROGRESS_FILE,
+    VECTORS_FILE,
+    BuildCheckpoint,
+    build_fingerprint,
+)
+
+
+def _batch(rows: int, start: int = 0) -> np.ndarray:
+    return np.arange(start * 4, (start + rows) * 4, dtype=np.float32).reshape(rows, 4)
+
+
+class TestBuildCheckpoint:
+    """Tests pour le fichier de vecteurs et son manifest de progression."""
+
+    def test_append_and_resume(self, tmp_path):
+        """Test que les lots écrits sont relus par un nouveau checkpoint."""
+        checkpoint = BuildCheckpoint(tmp_path, "fp")
+        checkpoint.append(_batch(2))
+        checkpoint.append(_batch(3, start=2))
+
+        resumed = BuildCheckpoint(tmp_path, "fp")
+
+        assert resumed.rows == 5
+        assert resumed.dimension == 4
+        np.testing.assert_array_equal(resumed.vectors(), _batch(5))
+
+    def test_unrecorded_batch_is_truncated(self, tmp_path):
+        """Test qu'un lot écrit mais absent du manifest est ignoré à la reprise."""
+        checkpoint = BuildCheckpoint(tmp_path, "fp")
+        checkpoint.append(_batch(2))
+        with open(tmp_path / CHECKPOINT_DIR / VECTORS_FILE, "ab") as f:
+            f.write(_batch(1, start=2).tobytes()[:10])  # Crash mid-write
+
+        resumed = BuildCheckpoint(tmp_path, "fp")
+
+        assert resumed.rows == 2
+        assert (tmp_path / CHECKPOINT_DIR / VECTORS_FILE).stat().st_size == 2 * 4 * 4
+        resumed.append(_batch(1, start=2))
+        np.testing.assert_array_equal(resumed.vectors(), _batch(3))
+
+    def test_other_fingerprint_or_missing_rows_restart(self, tmp_path):
+        """Test qu'un checkpoint d'une autre build ou incomplet est supprimé."""
+        BuildCheckpoint(tmp_path, "fp").append(_batch(2))
+        assert BuildCheckpoint(tmp_path, "other").rows == 0
+
+        BuildCheckpoint(tmp_path, "fp").append(_batch(2))
+        progress_path = tmp_path / CHECKPOINT_DIR / PROGRESS_FILE
+        progress_path.write_text(json.dumps({"fingerprint": "fp", "dimension": 4, "rows": 9}))
+        assert BuildCheckpoint(tmp_path, "fp").rows == 0
+
+
+def test_fingerprint_depends_on_texts_and_settings():
+    """Test que l'empreinte change avec les textes ou le modèle."""
+    base = build_fingerprint(["a", "b"], ["x", "y"], "mistral-embed")
+    assert base == build_fingerprint(["a", "b"], ["x", "y"], "mistral-embed")
+    assert base != build_fingerprint(["a", "b"], ["x", "z"], "mistral-embed")
+    assert base != build_fingerprint(["a", "b"], ["x", "y"], "other-model")
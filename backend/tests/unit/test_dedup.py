@@ -0,0 +1,141 @@
+"""Tests unitaires pour la détection de quasi-doublons (src.rag.dedup)."""
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.rag.dedup import (
+    build_report,
+    find_duplicate_clusters,
+    may_be_duplicates,
+    merge_duplicates,
+    normalized,
+    select_canonical,
+)
+
+
+def _vectors() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(6, 64))
+    vectors = base.copy()
+    vectors[3] = base[0] + 0.1 * rng.normal(size=64)  # near-duplicate of 0
+    vectors[5] = vectors[3] + 0.1 * rng.normal(size=64)  # near-duplicate of 3 (so of 0)
+    return normalized(vectors)
+
+
+class TestFindDuplicateClusters:
+    """Tests pour le regroupement par range search."""
+
+    def test_transitive_clusters(self):
+        """Test que les paires au-dessus du seuil sont regroupées transitivement."""
+        # 0-5 is below the threshold: 5 joins through 3
+        assert find_duplicate_clusters(_vectors(), threshold=0.99) == [[0, 3, 5]]
+
+    def test_batched_search_gives_same_clusters(self):
+        """Test que le découpage en lots ne change pas le résultat."""
+        vectors = _vectors()
+        assert find_duplicate_clusters(vectors, 0.95, batch_size=2) == find_duplicate_clusters(
+            vectors, 0.95
+        )
+
+    def test_no_duplicates(self):
+        """Test qu'aucun groupe n'est formé sous le seuil."""
+        assert find_duplicate_clusters(_vectors(), threshold=0.999) == []
+        assert find_duplicate_clusters(_vectors()[:1], threshold=0.5) == []
+
+    def test_incompatible_pairs_are_not_merged(self):
+        """Test qu'une paire refusée par compatible n'est pas regroupée."""
+        clusters = find_duplicate_clusters(
+            _vectors(), threshold=0.99, compatible=lambda i, j: 5 not in (i, j)
+        )
+        assert clusters == [[0, 3]]
+
+    def test_chain_through_unknown_city_is_not_merged(self):
+        """Test qu'un événement sans ville ne relie pas Paris et Lyon dans un même groupe."""
+        vectors = normalized(np.ones((3, 8)))
+        metadata = [
+            {"city": "Paris", "start_date": "2026-06-01"},
+            {"city": "", "start_date": "2026-06-01"},
+            {"city": "Lyon", "start_date": "2026-06-01"},
+        ]
+        assert not may_be_duplicates(metadata[0], metadata[2])
+
+        clusters = find_duplicate_clusters(
+            vectors,
+            threshold=0.9,
+            compatible=lambda i, j: may_be_duplicates(metadata[i], metadata[j]),
+        )
+
+        assert clusters == [[0, 1]]
+
+
+class TestMayBeDuplicates:
+    """Tests pour les conditions de fusion sur les métadonnées."""
+
+    def test_same_city_and_overlapping_dates(self):
+        """Test que même ville et dates qui se chevauchent autorisent la fusion."""
+        first = {"city": "Lyon", "start_date": "2026-07-01T20:00", "end_date": "2026-07-03"}
+        second = {"city": " lyon", "start_date": "2026-07-03T18:00", "end_date": "2026-07-03"}
+        assert may_be_duplicates(first, second)
+
+    def test_other_city_or_other_dates(self):
+        """Test qu'une autre ville ou des dates disjointes empêchent la fusion."""
+        first = {"city": "Lyon", "start_date": "2026-07-01", "end_date": "2026-07-01"}
+        assert not may_be_duplicates(first, {**first, "city": "Paris"})
+        assert not may_be_duplicates(
+            first, {**first, "start_date": "2026-07-08", "end_date": "2026-07-08"}
+        )
+
+    def test_missing_fields_do_not_block(self):
+        """Test qu'une ville ou des dates absentes n'empêchent pas la fusion."""
+        assert may_be_duplicates({"city": "Lyon"}, {"start_date": "2026-07-01"})
+
+
+class TestMergeDuplicates:
+    """Tests pour la fusion des métadonnées."""
+
+    def test_canonical_is_most_detailed(self):
+        """Test que le document canonique est le plus détaillé."""
+        documents = [Document(page_content="court"), Document(page_content="plus long")]
+        assert select_canonical(documents) == 1
+
+    def test_merged_metadata(self):
+        """Test que les occurrences, ids et champs manquants sont fusionnés."""
+        canonical = Document(
+            page_content="Festival",
+            metadata={"id": "a", "start_date": "2026-07-01", "end_date": "2026-07-02", "url": ""},
+        )
+        duplicate = Document(
+            page_content="Festival !",
+            metadata={
+                "id": "b",
+                "start_date": "2026-07-08",
+                "end_date": "2026-07-09",
+                "url": "https://example.com/b",
+            },
+        )
+
+        merged = merge_duplicates(canonical, [duplicate])
+
+        assert merged.page_content == "Festival"
+        assert merged.metadata["id"] == "a"
+        assert merged.metadata["duplicate_ids"] == ["b"]
+        assert merged.metadata["url"] == "https://example.com/b"
+        assert merged.metadata["occurrences"] == [
+            ["2026-07-01", "2026-07-02"],
+            ["2026-07-08", "2026-07-09"],
+        ]
+
+
+def test_build_report_counts():
+    """Test des compteurs et exemples du rapport."""
+    clusters = [
+        {"canonical": {"id": "a", "title": "A"}, "duplicates": [{"id": "b"}]},
+        {"canonical": {"id": "c", "title": "C"}, "duplicates": [{"id": "d"}, {"id": "e"}]},
+    ]
+
+    report = build_report(0.95, 10, clusters)
+
+    assert report["clusters"] == 2
+    assert report["duplicates_removed"] == 3
+    assert report["events_after"] == 7
+    assert report["examples"][0]["canonical"]["id"] == "c"
@@ -0,0 +1,100 @@
+"""Tests unitaires pour le docstore colonnaire (src.rag.docstore)."""
+
+import pytest
+
+from src.rag.docstore import (
+    ColumnarDocumentStore,
+    InMemoryDocumentStore,
+    ShardedDocumentStore,
+    open_document_store,
+    write_docstore,
+)
+
+DOCUMENTS = [
+    {
+        "id": "evt-1",
+        "title": "Fête de la musique",
+        "content": "Titre: Fête de la musique\nVille: Marseille",
+        "metadata": {"city": "Marseille", "occurrences": [["2026-06-21", "2026-06-22"]]},
+    },
+    {"id": "evt-2", "title": "", "content": "", "metadata": {}},
+    {"id": "evt-3", "title": "Expo €", "content": "Titre: Expo €", "metadata": {"city": "Nice"}},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Docstore colonnaire écrit à partir de DOCUMENTS."""
+    assert write_docstore(iter(DOCUMENTS), tmp_path) == len(DOCUMENTS)
+    return ColumnarDocumentStore(tmp_path)
+
+
+class TestColumnarDocumentStore:
+    """Tests pour l'écriture et la lecture du docstore colonnaire."""
+
+    def test_roundtrip(self, store):
+        """Test que les documents relus sont identiques aux documents écrits."""
+        assert len(store) == 3
+        assert list(store) == DOCUMENTS
+        assert store[2] == DOCUMENTS[2]
+
+    def test_lazy_field_access(self, store):
+        """Test de la lecture d'un seul champ par ligne."""
+        assert store.get_field(0, "title") == "Fête de la musique"
+        assert store.get_field(0, "metadata")["occurrences"] == [["2026-06-21", "2026-06-22"]]
+        assert store.get_field(1, "content") == ""
+
+    def test_lookup_by_id(self, store):
+        """Test de l'accès par identifiant."""
+        assert store.row_of("evt-3") == 2
+        assert store.get_by_id("evt-1")["title"] == "Fête de la musique"
+        assert store.get_by_id("inconnu") is None
+
+    def test_out_of_range_row(self, store):
+        """Test qu'une ligne hors limites lève IndexError."""
+        with pytest.raises(IndexError):
+            store[3]
+
+    def test_empty_store(self, tmp_path):
+        """Test qu'un docstore vide peut être écrit et relu."""
+        write_docstore([], tmp_path)
+        store = open_document_store(tmp_path)
+        assert len(store) == 0
+        assert list(store) == []
+
+    def test_previous_rows_copied_before_new_documents(self, store, tmp_path):
+        """Test que les lignes conservées sont recopiées puis les nouveaux documents ajoutés."""
+        added = {"id": "evt-4", "title": "Cinéma", "content": "Titre: Cinéma", "metadata": {}}
+        target = tmp_path / "next"
+
+        count = write_docstore([added], target, previous=store, kept_ids={"evt-1", "evt-3"})
+
+        copy = ColumnarDocumentStore(target)
+        assert count == len(copy) == 3
+        assert list(copy) == [DOCUMENTS[0], DOCUMENTS[2], added]
+        assert copy.row_of("evt-2") is None
+
+    def test_open_without_docstore(self, tmp_path):
+        """Test qu'un index sans docstore (ancien format) renvoie None."""
+        assert open_document_store(tmp_path) is None
+
+
+def test_in_memory_store_has_same_interface():
+    """Test que InMemoryDocumentStore expose la même interface (sources JSON)."""
+    store = InMemoryDocumentStore(DOCUMENTS)
+    assert len(store) == 3
+    assert store[0] == DOCUMENTS[0]
+    assert store.get_by_id("evt-3") == DOCUMENTS[2]
+    assert store.row_of("inconnu") is None
+    assert list(store) == DOCUMENTS
+
+
+def test_sharded_store_chains_shards(store):
+    """Test que ShardedDocumentStore numérote les lignes shard après shard."""
+    sharded = ShardedDocumentStore([InMemoryDocumentStore(DOCUMENTS[:1]), store])
+
+    assert len(sharded) == 4
+    assert sharded[1] == DOCUMENTS[0]
+    assert sharded.row_of("evt-3") == 3
+    assert sharded.get_by_id("evt-2") == DOCUMENTS[1]
+    assert list(sharded)[1:] == DOCUMENTS
@@ -0,0 +1,42 @@
+"""Tests unitaires pour le préchargement du moteur avant le fork (gunicorn.conf.py)."""
+
+import gc
+import runpy
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+CONFIG_PATH = Path(__file__).parents[2] / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def config():
+    """Charge la configuration puis restaure l'état du ramasse-miettes."""
+    try:
+        yield runpy.run_path(str(CONFIG_PATH))
+    finally:
+        gc.unfreeze()
+        gc.enable()
+
+
+def test_preload_settings(config):
+    """Test que l'application est chargée dans le maître, le GC coupé jusqu'au fork."""
+    assert config["preload_app"] is True
+    assert config["worker_class"] == "uvicorn_worker.UvicornWorker"
+    assert not gc.isenabled()
+
+
+def test_engine_loaded_and_frozen_before_fork(config):
+    """Test que le moteur est chargé dans le maître et ses objets figés avant le fork."""
+    engine = MagicMock(index_version="v1", num_documents=3)
+
+    with patch("src.api.main.get_rag_engine", return_value=engine) as get_engine:
+        config["on_starting"](MagicMock())
+
+    get_engine.assert_called_once()
+    engine.warm_up.assert_not_called()  # No FAISS threads in the master
+    assert gc.get_freeze_count() > 0
+
+    config["post_fork"](MagicMock(), MagicMock())
+    assert gc.isenabled()
@@ -0,0 +1,135 @@
+"""Tests unitaires pour le cache des historiques de session (src.database.history_cache)."""
+
+import uuid
+from unittest.mock import patch
+
+from src.database.history_cache import CACHE_NAME, SessionHistoryCache
+from src.utils.metrics import CACHE_BYTES, CACHE_ENTRIES, CACHE_REQUESTS
+
+
+def _messages(*contents):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": content}
+        for i, content in enumerate(contents)
+    ]
+
+
+def _cache(**kwargs):
+    options = {"max_entries": 10, "max_bytes": 1024 * 1024, "ttl": 60.0, "max_messages": 50}
+    options.update(kwargs)
+    return SessionHistoryCache(**options)
+
+
+class TestSessionHistoryCache:
+    """Tests pour le cache LRU des historiques de session."""
+
+    def test_miss_then_hit(self):
+        """Test qu'une session est servie depuis le cache une fois lue en base."""
+        cache = _cache()
+        session_id = uuid.uuid4()
+        hits = CACHE_REQUESTS.value(cache=CACHE_NAME, result="hit")
+
+        assert cache.get(session_id) is None
+        cache.put(session_id, {"summary": "Résumé"}, _messages("Concerts ?", "Voici"))
+        metadata, messages = cache.get(session_id)
+
+        assert metadata == {"summary": "Résumé"}
+        assert [m["content"] for m in messages] == ["Concerts ?", "Voici"]
+        assert cache.stats()["hit_rate"] == 0.5
+        assert CACHE_REQUESTS.value(cache=CACHE_NAME, result="hit") == hits + 1
+
+    def test_get_returns_copies(self):
+        """Test que modifier l'historique retourné ne modifie pas le cache."""
+        cache = _cache()
+        session_id = uuid.uuid4()
+        cache.put(session_id, {}, _messages("Concerts ?"))
+
+        metadata, messages = cache.get(session_id)
+        metadata["summary"] = "modifié"
+        messages.append({"role": "assistant", "content": "modifié"})
+
+        assert cache.get(session_id) == ({}, _messages("Concerts ?"))
+
+    def test_append_is_write_through(self):
+        """Test que les messages d'un échange sont ajoutés aux sessions en cache seulement."""
+        cache = _cache(max_messages=3)
+        cached, other = uuid.uuid4(), uuid.uuid4()
+        cache.put(cached, {}, _messages("a", "b"))
+
+        cache.append(cached, _messages("c", "d"))
+        cache.append(other, _messages("c", "d"))
+
+        assert [m["content"] for m in cache.get(cached)[1]] == ["b", "c", "d"]
+        assert cache.get(other) is None
+
+    def test_fold_drops_summarized_messages(self):
+        """Test qu'un repli de résumé remplace les métadonnées et retire les messages repliés."""
+        cache = _cache()
+        session_id = uuid.uuid4()
+        cache.put(session_id, {"summarized_until": 4}, _messages("a", "b", "c", "d"))
+
+        cache.fold(session_id, 4, {"summary": "ab", "summarized_until": 6}, 2)
+
+        metadata, messages = cache.get(session_id)
+        assert metadata == {"summary": "ab", "summarized_until": 6}
+        assert [m["content"] for m in messages] == ["c", "d"]
+
+    def test_fold_from_other_history_invalidates(self):
+        """Test qu'un repli parti d'un autre état de la session invalide l'entrée."""
+        cache = _cache()
+        session_id = uuid.uuid4()
+        cache.put(session_id, {"summarized_until": 4}, _messages("a", "b"))
+
+        cache.fold(session_id, 2, {"summary": "ab", "summarized_until": 6}, 2)
+
+        assert cache.get(session_id) is None
+
+    def test_entries_expire_after_ttl(self):
+        """Test qu'une entrée plus ancienne que le TTL est relue en base."""
+        cache = _cache(ttl=10.0)
+        session_id = uuid.uuid4()
+        with patch("src.database.history_cache.time.monotonic", return_value=100.0):
+            cache.put(session_id, {}, _messages("a"))
+        with patch("src.database.history_cache.time.monotonic", return_value=105.0):
+            assert cache.get(session_id) is not None
+        with patch("src.database.history_cache.time.monotonic", return_value=111.0):
+            assert cache.get(session_id) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test que la session la moins récemment utilisée sort la première."""
+        cache = _cache(max_entries=2)
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cache.put(first, {}, _messages("a"))
+        cache.put(second, {}, _messages("b"))
+        cache.get(first)
+
+        cache.put(third, {}, _messages("c"))
+
+        assert len(cache) == 2
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+
+    def test_bounded_by_bytes(self):
+        """Test que la taille estimée du cache reste sous la limite en octets."""
+        cache = _cache(max_bytes=4000)
+        sessions = [uuid.uuid4() for _ in range(5)]
+        for session_id in sessions:
+            cache.put(session_id, {}, _messages("x" * 1000))
+
+        assert 0 < cache.size_bytes <= 4000
+        assert len(cache) < 5
+        assert cache.get(sessions[-1]) is not None
+        assert CACHE_BYTES.value(cache=CACHE_NAME) == cache.size_bytes
+
+    def test_invalidate(self):
+        """Test que l'invalidation retire la session et met à jour les jauges."""
+        cache = _cache()
+        session_id = uuid.uuid4()
+        cache.put(session_id, {}, _messages("a"))
+
+        cache.invalidate(session_id)
+
+        assert cache.get(session_id) is None
+        assert cache.size_bytes == 0
+        assert CACHE_ENTRIES.value(cache=CACHE_NAME) == 0
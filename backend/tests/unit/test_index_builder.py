@@ -0,0 +1,564 @@
+"""Tests unitaires pour la classe IndexBuilder."""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.config.settings import settings
+from src.data.documents import read_documents
+from src.rag.checkpoint import CHECKPOINT_DIR
+from src.rag.docstore import open_document_store
+from src.rag.index_builder import IndexBuilder
+from src.rag.shards import read_shard_manifest, shard_dir
+from src.rag.vectorstore import chunk_map, is_id_mapped, load_vectorstore, stable_id
+from src.rag.versions import (
+    MANIFEST_FILE,
+    VERSIONS_DIR,
+    IndexLocked,
+    current_version,
+    index_lock,
+    resolve_index_dir,
+)
+
+
+def _occurrence(
+    uid: str | None, title: str, start: str, address: str = "1 rue de la Paix"
+) -> Document:
+    return Document(
+        page_content=f"Titre: {title}\nDate: {start}",
+        metadata={
+            "id": uid,
+            "uid": uid,
+            "title": title,
+            "city": "Marseille",
+            "address": address,
+            "start_date": start,
+            "end_date": start,
+        },
+    )
+
+
+class TestCollapseRecurring:
+    """Tests pour le regroupement des événements récurrents."""
+
+    def test_groups_by_uid(self):
+        """Test que les occurrences d'un même uid produisent un seul document."""
+        documents = [
+            _occurrence("a", "Visite guidée", "2026-03-02T10:00:00+00:00"),
+            _occurrence("a", "Visite guidée", "2026-03-01T10:00:00+00:00"),
+            _occurrence("b", "Concert", "2026-03-01T20:00:00+00:00"),
+        ]
+        collapsed = IndexBuilder().collapse_recurring(documents)
+
+        assert len(collapsed) == 2
+        occurrences = collapsed[0].metadata["occurrences"]
+        assert [start for start, _ in occurrences] == [
+            "2026-03-01T10:00:00+00:00",
+            "2026-03-02T10:00:00+00:00",
+        ]
+        assert collapsed[0].metadata["start_date"] == "2026-03-01T10:00:00+00:00"
+        assert "occurrences" not in collapsed[1].metadata
+
+    def test_groups_by_normalized_title_and_venue(self):
+        """Test que titre + lieu normalisés regroupent les documents sans uid."""
+        documents = [
+            _occurrence(None, "Atelier Poterie", "2026-03-01T10:00:00+00:00"),
+            _occurrence(None, "atelier poterie !", "2026-03-08T10:00:00+00:00"),
+            _occurrence(None, "Atelier Poterie", "2026-03-01T10:00:00+00:00", address="Ailleurs"),
+        ]
+        collapsed = IndexBuilder().collapse_recurring(documents)
+
+        assert len(collapsed) == 2
+        assert len(collapsed[0].metadata["occurrences"]) == 2
+
+    def test_distinct_uids_are_never_merged(self):
+        """Test que des uid différents restent distincts malgré un titre et un lieu identiques."""
+        documents = [
+            _occurrence("a", "Atelier Poterie", "2026-03-01T10:00:00+00:00"),
+            _occurrence("b", "Atelier Poterie", "2026-03-08T10:00:00+00:00"),
+            _occurrence(None, "Atelier Poterie", "2026-03-15T10:00:00+00:00"),
+        ]
+        collapsed = IndexBuilder().collapse_recurring(documents)
+
+        assert [doc.metadata["uid"] for doc in collapsed] == ["a", "b", None]
+
+    def test_city_alone_is_not_a_venue(self):
+        """Test que des documents sans uid ni adresse précise ne sont pas regroupés."""
+        documents = [
+            _occurrence(None, "Concert", "2026-03-01T20:00:00+00:00", address=""),
+            _occurrence(None, "Concert", "2026-03-02T20:00:00+00:00", address=""),
+            _occurrence(None, "Concert", "2026-03-03T20:00:00+00:00", address="MARSEILLE"),
+            _occurrence(None, "Concert", "2026-03-04T20:00:00+00:00", address="Marseille"),
+        ]
+        assert len(IndexBuilder().collapse_recurring(documents)) == 4
+
+    def test_duplicate_occurrences_are_deduplicated(self):
+        """Test que des occurrences identiques ne sont listées qu'une fois."""
+        documents = [_occurrence("a", "Expo", "2026-03-01T10:00:00+00:00")] * 3
+        collapsed = IndexBuilder().collapse_recurring(documents)
+
+        assert len(collapsed) == 1
+        assert len(collapsed[0].metadata["occurrences"]) == 1
+
+
+@pytest.fixture
+def builder(tmp_path):
+    """IndexBuilder sur un répertoire temporaire, avec des embeddings factices."""
+    documents_path = tmp_path / "rag_documents.jsonl"
+    raw_docs = [_raw_document(f"evt-{i}", f"Concert {i}") for i in range(5)]
+    documents_path.write_text("\n".join(json.dumps(doc) for doc in raw_docs) + "\n")
+
+    with patch("src.rag.index_builder.get_embeddings") as mock_emb:
+        mock_emb.return_value = DeterministicFakeEmbedding(size=1024)
+        builder = IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "faiss_index")
+        builder.rebuild()
+        yield builder
+
+
+def _raw_document(uid: str, title: str) -> dict:
+    return {
+        "id": uid,
+        "title": title,
+        "content": f"Titre: {title}",
+        "metadata": {"uid": uid, "city": "Lyon", "start_date": "2026-05-01T20:00:00+00:00"},
+    }
+
+
+class TestIncrementalUpdates:
+    """Tests pour les mises à jour incrémentales (upsert / delete)."""
+
+    def test_stable_ids(self):
+        """Test que les ids FAISS sont stables et positifs."""
+        assert stable_id("evt-1") == stable_id("evt-1")
+        assert stable_id("evt-1") != stable_id("evt-2")
+        assert 0 <= stable_id("evt-1") < 2**63
+
+    def test_rebuild_creates_id_mapped_index(self, builder):
+        """Test que la reconstruction produit un index à ids stables."""
+        vectorstore = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        assert is_id_mapped(vectorstore)
+        assert vectorstore.index.ntotal == 5
+        assert stable_id("evt-3") in vectorstore.index_to_docstore_id
+
+    def test_upsert_replaces_and_adds(self, builder):
+        """Test que upsert remplace un événement existant et en ajoute un nouveau."""
+        result = builder.upsert(
+            [_raw_document("evt-0", "Concert annulé puis reporté"), _raw_document("evt-9", "Expo")]
+        )
+        assert result["upserted"] == 2
+        assert result["index_vectors"] == 6
+
+        vectorstore = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        assert stable_id("evt-0") in vectorstore.index_to_docstore_id
+        store = open_document_store(resolve_index_dir(builder.index_dir))
+        assert store.get_by_id("evt-0")["title"] == "Concert annulé puis reporté"
+        assert len(store) == 6
+
+        source_ids = [doc["id"] for doc in read_documents(builder.documents_path)]
+        assert sorted(source_ids) == sorted(f"evt-{i}" for i in [0, 1, 2, 3, 4, 9])
+
+    def test_delete(self, builder):
+        """Test que delete retire les événements de l'index et de la source."""
+        result = builder.delete(["evt-1", "inconnu"])
+        assert result["deleted"] == 1
+        assert result["index_vectors"] == 4
+
+        vectorstore = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        assert stable_id("evt-1") not in vectorstore.index_to_docstore_id
+        results = vectorstore.similarity_search("Titre: Concert 1", k=5)
+        assert "evt-1" not in [doc.metadata["id"] for doc in results]
+        assert "evt-1" not in [doc["id"] for doc in read_documents(builder.documents_path)]
+
+    def test_delta_publishes_a_single_version(self, builder):
+        """Test qu'un delta (suppression + ajout) publie une seule version."""
+        with (
+            patch.object(builder, "_save", wraps=builder._save) as save,
+            patch.object(builder, "_update_source", wraps=builder._update_source) as update,
+        ):
+            result = builder.apply_delta(upsert=[_raw_document("evt-9", "Expo")], delete=["evt-1"])
+
+        assert (result["upserted"], result["deleted"], result["index_vectors"]) == (1, 1, 5)
+        assert save.call_count == 1
+        assert update.call_count == 1
+        assert current_version(builder.index_dir) == result["version"]
+        source_ids = {doc["id"] for doc in read_documents(builder.documents_path)}
+        assert "evt-9" in source_ids and "evt-1" not in source_ids
+
+    def test_stale_vectorstore_is_reloaded(self, builder):
+        """Test qu'une copie issue d'une version dépassée ne fait pas perdre l'écriture concurrente."""
+        base_version = current_version(builder.index_dir)
+        stale = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        builder.delete(["evt-1"])
+
+        result = builder.apply_delta(
+            upsert=[_raw_document("evt-9", "Expo")], vectorstore=stale, base_version=base_version
+        )
+
+        assert result["vectorstore"] is not stale
+        assert stable_id("evt-1") not in result["vectorstore"].index_to_docstore_id
+        assert result["index_vectors"] == 5
+
+    def test_delta_waits_for_the_index_lock(self, builder):
+        """Test qu'un delta échoue avec IndexLocked si un autre écrivain garde le verrou."""
+        acquired, release = threading.Event(), threading.Event()
+
+        def other_writer():
+            with index_lock(builder.index_dir):
+                acquired.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=other_writer)
+        thread.start()
+        try:
+            acquired.wait(5)
+            with pytest.raises(IndexLocked):
+                builder.apply_delta(delete=["evt-0"], lock_timeout=0.1)
+        finally:
+            release.set()
+            thread.join()
+
+        assert builder.apply_delta(delete=["evt-0"], lock_timeout=1.0)["deleted"] == 1
+
+
+class TestColumnarDocstore:
+    """Tests pour le docstore colonnaire écrit par IndexBuilder."""
+
+    def test_rebuild_writes_docstore_and_slim_pickle(self, builder):
+        """Test que le contenu est dans le docstore et plus dans le pickle LangChain."""
+        index_path = resolve_index_dir(builder.index_dir)
+        store = open_document_store(index_path)
+        assert len(store) == 5
+        assert store.get_by_id("evt-2")["content"].startswith("Titre: Concert 2")
+
+        vectorstore = load_vectorstore(DeterministicFakeEmbedding(size=1024), index_path)
+        doc = vectorstore.docstore.search("evt-2")
+        assert doc.page_content == ""
+        assert doc.metadata == {"id": "evt-2", "parent_id": "evt-2"}
+
+    def test_delete_keeps_other_documents(self, builder):
+        """Test qu'une nouvelle version recopie les documents inchangés."""
+        builder.delete(["evt-2"])
+
+        store = open_document_store(resolve_index_dir(builder.index_dir))
+        assert store.get_by_id("evt-2") is None
+        assert sorted(doc["id"] for doc in store) == ["evt-0", "evt-1", "evt-3", "evt-4"]
+
+
+def _long_document(uid: str) -> dict:
+    description = " ".join(f"Phrase {i} de la description du festival." for i in range(60))
+    doc = _raw_document(uid, "Festival")
+    doc["content"] = f"Titre: Festival\nDescription: {description}"
+    return doc
+
+
+class TestChunking:
+    """Tests pour le découpage des descriptions longues en chunks."""
+
+    def test_short_documents_are_single_chunks(self):
+        """Test qu'un document court donne un seul chunk avec l'id de l'événement."""
+        builder = IndexBuilder()
+        documents = IndexBuilder.to_langchain_documents([_raw_document("evt-1", "Concert")])
+
+        chunks = builder.split_into_chunks(documents)
+
+        assert len(chunks) == 1
+        assert chunks[0].metadata == {"id": "evt-1", "parent_id": "evt-1"}
+
+    def test_long_documents_are_split_with_overlap(self):
+        """Test qu'un document long est découpé en chunks chevauchants rattachés au parent."""
+        builder = IndexBuilder()
+        documents = IndexBuilder.to_langchain_documents([_long_document("evt-1")])
+
+        chunks = builder.split_into_chunks(documents)
+
+        assert len(chunks) > 2
+        assert [c.metadata["id"] for c in chunks] == [f"evt-1#{i}" for i in range(len(chunks))]
+        assert {c.metadata["parent_id"] for c in chunks} == {"evt-1"}
+        assert all(c.page_content.startswith("Titre: Festival") for c in chunks)
+        # Overlap: the end of a chunk is repeated at the start of the next one
+        tail = chunks[0].page_content[-20:].split(" ", 1)[1]
+        assert tail in chunks[1].page_content
+
+    def test_upsert_and_delete_handle_all_chunks(self, builder):
+        """Test que upsert / delete traitent tous les chunks d'un événement."""
+        result = builder.upsert([_long_document("evt-9")])
+        chunk_count = result["index_vectors"] - 5
+        assert result["upserted"] == 1
+        assert chunk_count > 2
+
+        result = builder.upsert([_raw_document("evt-9", "Festival court")])
+        assert result["index_vectors"] == 6
+
+        result = builder.delete(["evt-9"])
+        assert result["deleted"] == 1
+        assert result["index_vectors"] == 5
+        store = open_document_store(resolve_index_dir(builder.index_dir))
+        assert len(store) == 5
+
+    def test_chunk_map_follows_deltas(self, builder):
+        """Test que la table événement -> chunks suit les ajouts et suppressions."""
+        vectorstore = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        result = builder.apply_delta(
+            upsert=[_long_document("evt-9")],
+            delete=["evt-1"],
+            vectorstore=vectorstore,
+            base_version=current_version(builder.index_dir),
+        )
+
+        chunks = chunk_map(result["vectorstore"])
+        assert "evt-1" not in chunks
+        assert len(chunks["evt-9"]) > 2
+        # Same map as a full scan of the published index
+        reloaded = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        assert chunk_map(reloaded) == chunks
+
+    def test_delta_keeps_source_lines_verbatim(self, builder):
+        """Test que les lignes inchangées du fichier source sont recopiées telles quelles."""
+        lines = builder.documents_path.read_text().splitlines()
+
+        builder.apply_delta(upsert=[_raw_document("evt-2", "Opéra")], delete=["evt-4"])
+
+        updated = builder.documents_path.read_text().splitlines()
+        assert updated[:3] == [lines[0], lines[1], lines[3]]
+        assert json.loads(updated[-1])["title"] == "Opéra"
+        assert len(updated) == 4
+
+
+class TestDeduplication:
+    """Tests pour la fusion des quasi-doublons à la construction."""
+
+    def test_rebuild_merges_duplicates_and_writes_report(self, tmp_path):
+        """Test qu'un même événement publié deux fois n'est indexé qu'une fois."""
+        documents_path = tmp_path / "rag_documents.jsonl"
+        raw_docs = [_raw_document(f"evt-{i}", f"Concert {i}") for i in range(3)]
+        duplicate = _raw_document("evt-dup", "Soirée concert 1")
+        duplicate["content"] = raw_docs[1]["content"]
+        duplicate["metadata"]["url"] = "https://example.com/dup"
+        raw_docs.append(duplicate)
+        documents_path.write_text("\n".join(json.dumps(doc) for doc in raw_docs) + "\n")
+
+        with (
+            patch("src.rag.index_builder.get_embeddings") as mock_emb,
+            patch.object(settings, "dedup_enabled", True),
+        ):
+            mock_emb.return_value = DeterministicFakeEmbedding(size=1024)
+            builder = IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx")
+            result = builder.rebuild()
+
+        assert result["duplicates_removed"] == 1
+        assert result["index_vectors"] == 3
+
+        index_path = resolve_index_dir(builder.index_dir)
+        report = json.loads((index_path / "dedup_report.json").read_text())
+        assert report["events_before"] == 4
+        assert report["events_after"] == 3
+        assert report["examples"][0]["duplicates"][0]["similarity"] > 0.99
+
+        store = open_document_store(index_path)
+        kept = store.get_by_id("evt-1") or store.get_by_id("evt-dup")
+        assert kept["metadata"]["duplicate_ids"] in (["evt-dup"], ["evt-1"])
+        assert kept["metadata"]["url"] == "https://example.com/dup"
+
+    def test_same_text_in_another_city_is_kept(self, tmp_path):
+        """Test qu'un texte identique dans une autre ville ou à d'autres dates n'est pas fusionné."""
+        documents_path = tmp_path / "rag_documents.jsonl"
+        raw_docs = [_raw_document(f"evt-{i}", "Tournée") for i in range(3)]
+        raw_docs[1]["metadata"]["city"] = "Paris"
+        raw_docs[2]["metadata"]["start_date"] = "2026-06-12T20:00:00+00:00"
+        documents_path.write_text("\n".join(json.dumps(doc) for doc in raw_docs) + "\n")
+
+        with (
+            patch("src.rag.index_builder.get_embeddings") as mock_emb,
+            patch.object(settings, "dedup_enabled", True),
+        ):
+            mock_emb.return_value = DeterministicFakeEmbedding(size=1024)
+            builder = IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx")
+            result = builder.rebuild()
+
+        assert result["duplicates_removed"] == 0
+        assert result["index_vectors"] == 3
+
+    def test_dedup_can_be_disabled(self, tmp_path):
+        """Test que settings.dedup_enabled désactive la fusion."""
+        documents_path = tmp_path / "rag_documents.jsonl"
+        raw_docs = [_raw_document("evt-a", "Jazz"), _raw_document("evt-b", "Soirée jazz")]
+        raw_docs[1]["content"] = raw_docs[0]["content"]
+        documents_path.write_text("\n".join(json.dumps(doc) for doc in raw_docs) + "\n")
+
+        with (
+            patch("src.rag.index_builder.get_embeddings") as mock_emb,
+            patch.object(settings, "dedup_enabled", False),
+        ):
+            mock_emb.return_value = DeterministicFakeEmbedding(size=1024)
+            builder = IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx")
+            result = builder.rebuild()
+
+        assert result["duplicates_removed"] == 0
+        assert result["index_vectors"] == 2
+
+
+class FlakyEmbedding(DeterministicFakeEmbedding):
+    """Embeddings factices qui échouent après quelques lots et comptent les textes."""
+
+    fail_after: int | None = None
+    embedded: int = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.fail_after is not None and self.embedded >= self.fail_after:
+            raise ConnectionError("network blip")
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+class TestCheckpointedBuild:
+    """Tests pour la reprise d'une construction interrompue."""
+
+    def test_interrupted_build_resumes_from_last_batch(self, tmp_path):
+        """Test qu'une reconstruction reprend au dernier lot embeddé."""
+        documents = IndexBuilder.to_langchain_documents(
+            [_raw_document(f"evt-{i}", f"Concert {i}") for i in range(5)]
+        )
+        builder = IndexBuilder(index_dir=tmp_path / "idx")
+
+        with patch("src.rag.index_builder.get_embeddings") as mock_emb:
+            mock_emb.return_value = FlakyEmbedding(size=1024, fail_after=4)
+            with pytest.raises(ConnectionError):
+                builder.build_and_save(documents, batch_size=2)
+            assert (builder.index_dir / CHECKPOINT_DIR).exists()
+
+            mock_emb.return_value = resumed = FlakyEmbedding(size=1024)
+            config = builder.build_and_save(documents, batch_size=2)
+
+        assert resumed.embedded == 1  # Only the last batch was embedded again
+        assert config["num_vectors"] == 5
+        assert not (builder.index_dir / CHECKPOINT_DIR).exists()
+
+        vectorstore = load_vectorstore(
+            DeterministicFakeEmbedding(size=1024), resolve_index_dir(builder.index_dir)
+        )
+        results = vectorstore.similarity_search_with_score("Titre: Concert 3", k=1)
+        assert results[0][0].metadata["id"] == "evt-3"
+
+    def test_checkpoint_of_other_corpus_is_discarded(self, tmp_path):
+        """Test qu'un checkpoint d'un autre corpus n'est pas réutilisé."""
+        builder = IndexBuilder(index_dir=tmp_path / "idx")
+
+        with patch("src.rag.index_builder.get_embeddings") as mock_emb:
+            mock_emb.return_value = FlakyEmbedding(size=1024, fail_after=2)
+            with pytest.raises(ConnectionError):
+                builder.build_and_save(
+                    IndexBuilder.to_langchain_documents(
+                        [_raw_document(f"old-{i}", f"Expo {i}") for i in range(3)]
+                    ),
+                    batch_size=2,
+                )
+
+            mock_emb.return_value = resumed = FlakyEmbedding(size=1024)
+            builder.build_and_save(
+                IndexBuilder.to_langchain_documents(
+                    [_raw_document(f"evt-{i}", f"Concert {i}") for i in range(3)]
+                ),
+                batch_size=2,
+            )
+
+        assert resumed.embedded == 3
+
+
+@pytest.fixture
+def sharded_builder(tmp_path):
+    """IndexBuilder d'un index shardé par ville (Lyon et Marseille)."""
+    documents_path = tmp_path / "rag_documents.jsonl"
+    raw_docs = [_raw_document(f"evt-{i}", f"Concert {i}") for i in range(5)]
+    for doc in raw_docs[3:]:
+        doc["metadata"]["city"] = "Marseille"
+    documents_path.write_text("\n".join(json.dumps(doc) for doc in raw_docs) + "\n")
+
+    with (
+        patch("src.rag.index_builder.get_embeddings") as mock_emb,
+        patch.object(settings, "index_shard_by", "city"),
+    ):
+        mock_emb.return_value = DeterministicFakeEmbedding(size=1024)
+        builder = IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx")
+        builder.rebuild()
+        yield builder
+
+
+class TestShardedIndex:
+    """Tests pour la construction d'un index par ville."""
+
+    def test_rebuild_writes_one_shard_per_city(self, sharded_builder):
+        """Test que chaque ville a son index et son docstore, décrits dans shards.json."""
+        index_path = resolve_index_dir(sharded_builder.index_dir)
+        manifest = read_shard_manifest(index_path)
+
+        assert manifest["shard_by"] == "city"
+        assert manifest["shards"]["lyon"]["documents"] == 3
+        assert manifest["shards"]["marseille"]["cities"] == ["Marseille"]
+        store = open_document_store(shard_dir(index_path, "marseille"))
+        assert sorted(doc["id"] for doc in store) == ["evt-3", "evt-4"]
+        assert not (index_path / "index.faiss").exists()
+
+    def test_rebuild_one_shard_links_the_others(self, sharded_builder):
+        """Test qu'un shard se reconstruit seul, les autres étant repris sans copie."""
+        before = resolve_index_dir(sharded_builder.index_dir)
+        docs = read_documents(sharded_builder.documents_path)
+        docs[3]["content"] = "Titre: Concert 3 (complet)"
+        sharded_builder.documents_path.write_text("\n".join(json.dumps(doc) for doc in docs) + "\n")
+
+        embeddings = DeterministicFakeEmbedding(size=1024)
+        with patch("src.rag.index_builder.get_embeddings", return_value=embeddings):
+            config = sharded_builder.rebuild_shard("marseille")
+
+        after = resolve_index_dir(sharded_builder.index_dir)
+        assert after != before
+        assert config["num_shards"] == 2
+        lyon_index = shard_dir(after, "lyon") / "index.faiss"
+        assert lyon_index.stat().st_ino == (shard_dir(before, "lyon") / "index.faiss").stat().st_ino
+        store = open_document_store(shard_dir(after, "marseille"))
+        assert store.get_by_id("evt-3")["content"] == "Titre: Concert 3 (complet)"
+
+    def test_incremental_update_is_refused(self, sharded_builder):
+        """Test que upsert / delete refusent un index shardé."""
+        with pytest.raises(ValueError):
+            sharded_builder.delete(["evt-0"])
+
+
+class TestIndexVersions:
+    """Tests pour les versions d'index et le manifest."""
+
+    def test_rebuild_publishes_new_version(self, builder):
+        """Test que chaque sauvegarde publie une nouvelle version via le manifest."""
+        first = current_version(builder.index_dir)
+        assert (builder.index_dir / MANIFEST_FILE).exists()
+        assert (resolve_index_dir(builder.index_dir) / "index.faiss").exists()
+
+        result = builder.delete(["evt-0"])
+
+        assert result["version"] != first
+        assert current_version(builder.index_dir) == result["version"]
+
+    def test_old_versions_are_garbage_collected(self, builder):
+        """Test que seules settings.index_keep_versions versions sont conservées."""
+        with patch.object(settings, "index_keep_versions", 2):
+            for i in range(4):
+                builder.delete([f"evt-{i}"])
+
+        versions = list((builder.index_dir / VERSIONS_DIR).iterdir())
+        assert len(versions) == 2
+        assert resolve_index_dir(builder.index_dir) in versions
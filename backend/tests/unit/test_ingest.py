@@ -0,0 +1,134 @@
+"""Tests unitaires pour le pipeline d'ingestion (src.ingest)."""
+
+import asyncio
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from src.data.documents import read_documents
+from src.ingest.fetcher import fetch_pages
+from src.ingest.pipeline import run_ingestion
+from src.ingest.stages import (
+    IngestionStats,
+    build_documents,
+    clean_descriptions,
+    clean_html,
+    validate_records,
+)
+from src.rag.index_builder import IndexBuilder
+
+HTML_SAMPLES = [
+    "Concert en plein air",
+    "  Texte   brut\n\tsur plusieurs   lignes  ",
+    "<p>Soirée <b>jazz</b></p>\n<p>Entrée libre</p>",
+    "Tom &amp; Jerry &eacute;t&eacute; &#39;2024&#x27;",
+    "Prix &lt; 10&nbsp;€ &ampx",
+    "a < b et c > d",
+    "<!-- commentaire -->Visible<script>var x = 1;</script> fin<style>p {}</style>",
+    "<ul><li>Atelier<li>Goûter</ul>un<br>deux",
+    "<html><body><p>Document complet</p></body></html>",
+    "<a href='https://example.com'>lien</a>.<img src=x>",
+]
+
+
+def reference_clean_html(text: str | None) -> str:
+    """Nettoyage BeautifulSoup du notebook 02 (reference)."""
+    if not text:
+        return ""
+    soup = BeautifulSoup(text, "html.parser")
+    return re.sub(r"\s+", " ", soup.get_text(separator=" ", strip=True)).strip()
+
+
+class TestFetcher:
+    """Tests pour le fetcher asynchrone pagine."""
+
+    def test_fetches_all_pages_in_order(self, opendatasoft_server):
+        """Test que toutes les pages sont recuperees, dans l'ordre des offsets."""
+        url, records = opendatasoft_server
+
+        async def collect():
+            return [page async for page in fetch_pages(1000, url=url, concurrency=3)]
+
+        pages = asyncio.run(collect())
+        fetched = [record for page in pages for record in page]
+        assert fetched == records
+        assert len(pages) == 3
+
+    def test_respects_max_events(self, opendatasoft_server):
+        """Test que max_events limite le nombre d'enregistrements."""
+        url, _ = opendatasoft_server
+
+        async def collect():
+            return [page async for page in fetch_pages(130, url=url)]
+
+        pages = asyncio.run(collect())
+        assert sum(len(page) for page in pages) == 130
+
+
+class TestStages:
+    """Tests pour les etapes de validation et de nettoyage."""
+
+    def test_validation_counts(self):
+        """Test que la validation filtre les evenements anciens et invalides."""
+        from tests.conftest import make_opendatasoft_records
+
+        stats = IngestionStats()
+        valid = list(validate_records(make_opendatasoft_records(50), stats))
+
+        assert stats.fetched == 50
+        assert stats.filtered == 5
+        assert stats.errors == 1
+        assert len(valid) == stats.validated == 44
+
+    def test_clean_html(self):
+        """Test du nettoyage HTML."""
+        assert clean_html("<p>Soirée <b>jazz</b></p>\n\n<p>Entrée libre</p>") == (
+            "Soirée jazz Entrée libre"
+        )
+        assert clean_html(None) == ""
+
+    def test_clean_html_matches_notebook_reference(self):
+        """Test que le nettoyage lxml donne le meme texte que BeautifulSoup."""
+        for sample in HTML_SAMPLES:
+            assert clean_html(sample) == reference_clean_html(sample), sample
+
+    def test_clean_descriptions_with_process_pool(self):
+        """Test que le nettoyage parallele conserve l'ordre des descriptions."""
+        descriptions = (HTML_SAMPLES + [None, ""]) * 5
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            cleaned = clean_descriptions(descriptions, executor)
+
+        assert cleaned == [reference_clean_html(text) for text in descriptions]
+
+    def test_build_documents_format(self):
+        """Test que les documents ont le format attendu par IndexBuilder."""
+        from tests.conftest import make_opendatasoft_records
+
+        doc = next(build_documents(validate_records(make_opendatasoft_records(2)[1:])))
+        assert doc["id"] == "ods-1"
+        assert "Description: Description riche 1" in doc["content"]
+        assert doc["metadata"]["city"] == "Marseille"
+
+
+class TestPipeline:
+    """Tests pour le pipeline complet vers JSONL."""
+
+    def test_run_ingestion_writes_jsonl(self, opendatasoft_server, tmp_path):
+        """Test que le pipeline produit un JSONL lisible par IndexBuilder."""
+        url, _ = opendatasoft_server
+        output = tmp_path / "rag_documents.jsonl"
+
+        stats = asyncio.run(run_ingestion(output_path=output, max_events=1000, url=url, workers=2))
+
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == stats.written == stats.validated
+        assert json.loads(lines[0])["id"] == "ods-0"
+        assert stats.events_per_second > 0
+        assert not (tmp_path / "rag_documents.jsonl.tmp").exists()
+
+        assert len(read_documents(output)) == stats.written
+        documents = IndexBuilder(documents_path=output).load_documents()
+        assert len(documents) == stats.written
@@ -0,0 +1,137 @@
+"""Tests unitaires pour l'index de listing des événements (src.rag.listing)."""
+
+import pytest
+
+from src.rag.docstore import InMemoryDocumentStore
+from src.rag.listing import EventListing, decode_cursor, encode_cursor, normalize_date
+
+
+def _event(doc_id, city, start, end=None, is_free=None):
+    metadata = {"city": city, "start_date": start, "end_date": end or start}
+    if is_free is not None:
+        metadata["is_free"] = is_free
+    return {"id": doc_id, "title": doc_id, "content": "", "metadata": metadata}
+
+
+@pytest.fixture
+def documents():
+    """Événements de plusieurs villes, dans le désordre."""
+    return InMemoryDocumentStore(
+        [
+            _event("e1", "Lyon", "2025-06-03T20:00:00+00:00", is_free=True),
+            _event("e2", "Marseille", "2025-06-01T10:00:00+00:00", is_free=False),
+            _event("e3", "Lyon", "2025-06-01T18:00:00+02:00"),
+            _event("e4", "Paris", "2025-05-20T09:00:00", "2025-06-30T18:00:00", is_free=True),
+            _event("e5", "Lyon", "2025-06-10T20:00:00+00:00", is_free=True),
+            _event("e6", "Marseille", ""),
+        ]
+    )
+
+
+def _ids(listing, documents, **kwargs):
+    return [documents[row]["id"] for row in listing.page(100, **kwargs).rows]
+
+
+def _walk(listing, documents, limit, **kwargs):
+    """Parcourt toutes les pages d'un listing en suivant les curseurs."""
+    ids, cursor = [], None
+    while True:
+        page = listing.page(limit, cursor=cursor, **kwargs)
+        ids.extend(documents[row]["id"] for row in page.rows)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+def test_normalize_date():
+    """Test que les dates sont converties en clés UTC triables."""
+    assert normalize_date("2025-06-01T18:00:00+02:00") == "2025-06-01T16:00:00"
+    assert normalize_date("2025-06-01") == "2025-06-01T00:00:00"
+    assert normalize_date("2025-06-01", end_of_day=True) == "2025-06-01T23:59:59"
+    assert normalize_date("pas une date") == ""
+
+
+def test_cursor_round_trip():
+    """Test qu'un curseur décode la clé encodée et rejette les valeurs invalides."""
+    key = ("saint etienne", "2025-06-01T16:00:00", "évt-1")
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor("!!!")
+
+
+class TestEventListing:
+    """Tests pour le tri, les filtres et la pagination du listing."""
+
+    def test_sorted_by_start_date(self, documents):
+        """Test que le tri par défaut suit la date de début (sans date en dernier)."""
+        listing = EventListing(documents)
+        assert _ids(listing, documents) == ["e4", "e2", "e3", "e1", "e5", "e6"]
+
+    def test_sorted_by_city(self, documents):
+        """Test que le tri par ville ordonne ensuite par date de début."""
+        listing = EventListing(documents)
+        assert _ids(listing, documents, sort="city") == ["e3", "e1", "e5", "e2", "e6", "e4"]
+
+    def test_city_filter(self, documents):
+        """Test que le filtre de ville ignore la casse et les accents."""
+        listing = EventListing(documents)
+        assert _ids(listing, documents, city="lyon") == ["e3", "e1", "e5"]
+        assert _ids(listing, documents, city="LYÔN") == ["e3", "e1", "e5"]
+        assert _ids(listing, documents, city="Nice") == []
+
+    def test_date_range_filter(self, documents):
+        """Test que le filtre de dates garde les événements qui chevauchent la plage."""
+        listing = EventListing(documents)
+        ids = _ids(listing, documents, date_from="2025-06-02", date_to="2025-06-05")
+        assert ids == ["e4", "e1"]
+        assert _ids(listing, documents, city="Lyon", date_to="2025-06-03") == ["e3", "e1"]
+
+    @pytest.mark.parametrize("city", [None, "Lyon"])
+    def test_date_from_seeks_past_ended_events(self, city):
+        """Test que date_from saute les événements terminés au lieu de les parcourir."""
+        past = [_event(f"p{i:03d}", "Lyon", f"2025-01-01T{i % 24:02d}:00:00") for i in range(200)]
+        long_run = _event("long", "Lyon", "2025-01-02T00:00:00", "2025-12-31T00:00:00")
+        coming = [_event(f"c{i}", "Lyon", f"2025-07-0{i + 1}T10:00:00") for i in range(3)]
+        documents = InMemoryDocumentStore([*coming, *past, long_run])
+        listing = EventListing(documents)
+
+        page = listing.page(10, city=city, date_from="2025-07-01")
+        assert [documents[row]["id"] for row in page.rows] == ["long", "c0", "c1", "c2"]
+        assert page.scanned == 4
+
+    def test_free_filter(self, documents):
+        """Test que le filtre gratuit exclut les événements sans prix connu."""
+        listing = EventListing(documents)
+        assert _ids(listing, documents, free=True) == ["e4", "e1", "e5"]
+        assert _ids(listing, documents, free=False) == ["e2"]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"sort": "city"}, {"city": "Lyon"}, {"free": True}, {"date_from": "2025-06-02"}],
+    )
+    def test_cursor_pages_cover_listing(self, documents, kwargs):
+        """Test que les pages successives couvrent le listing sans doublon ni trou."""
+        listing = EventListing(documents)
+        assert _walk(listing, documents, 2, **kwargs) == _ids(listing, documents, **kwargs)
+
+    def test_offset_pagination(self, documents):
+        """Test que skip reste supporté, avec ou sans filtre."""
+        listing = EventListing(documents)
+        assert _ids(listing, documents, offset=4) == ["e5", "e6"]
+        assert _ids(listing, documents, offset=1, free=True) == ["e1", "e5"]
+
+    def test_cursor_survives_index_change(self, documents):
+        """Test qu'un curseur reste valide après remplacement de l'index."""
+        page = EventListing(documents).page(2)
+        updated = InMemoryDocumentStore(
+            [*documents, _event("e7", "Nice", "2025-06-02T00:00:00+00:00")]
+        )
+        listing = EventListing(updated, version="v2")
+
+        rows = listing.page(2, cursor=page.next_cursor).rows
+        assert [updated[row]["id"] for row in rows] == ["e3", "e7"]
+
+    def test_etag_follows_index_version(self, documents):
+        """Test que l'ETag change avec la version d'index."""
+        assert EventListing(documents, "v1").etag != EventListing(documents, "v2").etag
+        assert EventListing(documents, "v1").etag == EventListing(documents, "v1").etag
@@ -0,0 +1,129 @@
+"""Tests unitaires pour les métriques exposées par /metrics (src.utils.metrics)."""
+
+import asyncio
+
+import pytest
+from langchain_core.outputs import LLMResult
+
+from src.rag.llm import TokenUsageCallback
+from src.utils.metrics import (
+    DB_QUERY_SECONDS,
+    ERRORS,
+    LLM_TOKENS,
+    STAGE_SECONDS,
+    Counter,
+    Histogram,
+    current_timer,
+    observe_query,
+    observe_stage,
+    render_metrics,
+    track_request,
+)
+
+
+class TestHistogram:
+    """Tests pour les histogrammes de latence."""
+
+    def test_buckets_are_cumulative(self):
+        """Test que le rendu texte cumule les buckets et expose somme et nombre."""
+        histogram = Histogram("test_seconds", "Durées de test.", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="a")
+        histogram.observe(0.5, stage="a")
+        histogram.observe(2.0, stage="a")
+
+        lines = histogram.render().splitlines()
+        assert lines[:2] == ["# HELP test_seconds Durées de test.", "# TYPE test_seconds histogram"]
+        assert 'test_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{stage="a",le="1"} 2' in lines
+        assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+        assert 'test_seconds_sum{stage="a"} 2.55' in lines
+        assert 'test_seconds_count{stage="a"} 3' in lines
+
+    def test_labels_are_required(self):
+        """Test qu'une observation sans les labels déclarés est refusée."""
+        histogram = Histogram("test_labels_seconds", "Test.", ("stage",))
+        with pytest.raises(ValueError):
+            histogram.observe(1.0)
+
+
+def test_counter_escapes_label_values():
+    """Test que les valeurs de labels sont échappées dans le rendu texte."""
+    counter = Counter("test_total", "Test.", ("name",))
+    counter.inc(name='a"b')
+    counter.inc(2, name='a"b')
+    assert 'test_total{name="a\\"b"} 3' in counter.render()
+
+
+def test_observe_stage_counts_errors():
+    """Test qu'une étape en erreur est chronométrée et comptée comme erreur."""
+    count = STAGE_SECONDS.count(stage="test_stage")
+    errors = ERRORS.value(component="test_stage")
+
+    with pytest.raises(RuntimeError):
+        with observe_stage("test_stage"):
+            raise RuntimeError("échec")
+
+    assert STAGE_SECONDS.count(stage="test_stage") == count + 1
+    assert ERRORS.value(component="test_stage") == errors + 1
+
+
+def test_observe_query_times_repository_calls():
+    """Test que le décorateur des repositories chronomètre chaque appel."""
+
+    class FakeRepository:
+        @observe_query
+        async def get(self, value):
+            return value
+
+    operation = "test_observe_query_times_repository_calls.<locals>.FakeRepository.get"
+    assert asyncio.run(FakeRepository().get(42)) == 42
+    assert DB_QUERY_SECONDS.count(operation=operation) == 1
+
+
+def test_request_timer_collects_stages_and_queries():
+    """Test que les étapes et requêtes DB de la requête en cours alimentent Server-Timing."""
+
+    class Repository:
+        @observe_query
+        async def load(self):
+            return "ok"
+
+    async def handler():
+        with observe_stage("embedding"):
+            pass
+        with observe_stage("embedding"):
+            pass
+        await Repository().load()
+        # Engine calls run in a copied context: the timer is shared
+        await asyncio.to_thread(generate)
+
+    def generate():
+        with observe_stage("generation"):
+            pass
+
+    with track_request() as timer:
+        asyncio.run(handler())
+    assert current_timer() is None
+
+    timings = timer.as_dict()
+    assert len(timings) == 3
+    assert {"embedding", "generation"} <= set(timings)
+    header = timer.header(total=0.25)
+    assert 'Repository.load";dur=' in header
+    assert header.endswith("total;dur=250.0")
+
+
+def test_token_usage_callback():
+    """Test que les tokens rapportés par le LLM sont comptés par modèle."""
+    before = LLM_TOKENS.value(model="test-model", kind="completion")
+    TokenUsageCallback().on_llm_end(
+        LLMResult(
+            generations=[],
+            llm_output={
+                "model_name": "test-model",
+                "token_usage": {"prompt_tokens": 120, "completion_tokens": 30},
+            },
+        )
+    )
+    assert LLM_TOKENS.value(model="test-model", kind="completion") == before + 30
+    assert "rag_llm_tokens_total" in render_metrics()
@@ -7,7 +7,67 @@ from unittest.mock import MagicMock, patch
 import numpy as np
 import pytest
 
-from src.rag.engine import RAGEngine
+from src.config.settings import settings
+from src.rag.engine import RAGEngine, expand_occurrence, pool_chunk_scores
+
+
+@pytest.fixture
+def mock_engine(tmp_path):
+    """Crée un RAGEngine mocké pour les tests avec support legacy."""
+    import faiss
+
+    index_dir = tmp_path / "faiss_index"
+    index_dir.mkdir()
+
+    # Créer un index FAISS factice (legacy format pour tests unitaires)
+    dimension = 1024
+    index = faiss.IndexFlatL2(dimension)
+    vectors = np.random.rand(5, dimension).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    index.add(vectors)
+    faiss.write_index(index, str(index_dir / "events.index"))
+
+    # Créer la configuration
+    config = {
+        "embedding_dim": dimension,
+        "provider": "mistral",
+        "model_name": "mistral-embed",
+    }
+    with open(index_dir / "config.json", "w") as f:
+        json.dump(config, f)
+
+    # Créer les documents
+    documents = [
+        {
+            "id": f"doc-{i}",
+            "title": f"Document {i}",
+            "content": f"Contenu du document {i} avec événement culturel",
+            "metadata": {"city": "Paris"},
+        }
+        for i in range(5)
+    ]
+    documents_path = tmp_path / "documents.json"
+    with open(documents_path, "w") as f:
+        json.dump(documents, f)
+
+    # Mock LangChain components
+    with (
+        patch("src.rag.engine.get_embeddings") as mock_emb,
+        patch("src.rag.engine.get_llm") as mock_llm,
+    ):
+
+        # Mock embeddings
+        mock_embeddings = MagicMock()
+        mock_embeddings.embed_query.return_value = np.random.rand(dimension).tolist()
+        mock_emb.return_value = mock_embeddings
+
+        # Mock LLM
+        mock_llm_instance = MagicMock()
+        mock_llm.return_value = mock_llm_instance
+
+        engine = RAGEngine(index_dir=index_dir, documents_path=documents_path)
+
+    return engine
 
 
 class TestRAGEngineInitialization:
@@ -48,66 +108,187 @@ class TestRAGEngineInitialization:
             pytest.skip("Index FAISS non disponible pour ce test")
 
 
-class TestRAGEngineProperties:
-    """Tests pour les propriétés du RAGEngine."""
+class TestColumnarDocstoreEngine:
+    """Tests du moteur sur un index écrit par IndexBuilder (docstore colonnaire)."""
 
-    @pytest.fixture
-    def mock_engine(self, tmp_path):
-        """Crée un RAGEngine mocké pour les tests avec support legacy."""
-        import faiss
+    def test_search_reads_content_from_docstore(self, tmp_path):
+        """Test que les résultats sont réhydratés depuis le docstore colonnaire."""
+        from langchain_core.embeddings import DeterministicFakeEmbedding
 
-        index_dir = tmp_path / "faiss_index"
-        index_dir.mkdir()
+        from src.rag.index_builder import IndexBuilder
 
-        # Créer un index FAISS factice (legacy format pour tests unitaires)
-        dimension = 1024
-        index = faiss.IndexFlatL2(dimension)
-        vectors = np.random.rand(5, dimension).astype(np.float32)
-        faiss.normalize_L2(vectors)
-        index.add(vectors)
-        faiss.write_index(index, str(index_dir / "events.index"))
+        documents_path = tmp_path / "rag_documents.json"
+        documents = [
+            {
+                "id": f"evt-{i}",
+                "title": f"Concert {i}",
+                "content": f"Titre: Concert {i}",
+                "metadata": {"city": "Lyon"},
+            }
+            for i in range(3)
+        ]
+        documents_path.write_text(json.dumps(documents))
+        embeddings = DeterministicFakeEmbedding(size=1024)
+        with patch("src.rag.index_builder.get_embeddings", return_value=embeddings):
+            IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx").rebuild()
+        documents_path.unlink()  # The JSON source is no longer needed at runtime
 
-        # Créer la configuration
-        config = {
-            "embedding_dim": dimension,
-            "provider": "mistral",
-            "model_name": "mistral-embed",
-        }
-        with open(index_dir / "config.json", "w") as f:
-            json.dump(config, f)
+        with (
+            patch("src.rag.engine.get_embeddings", return_value=embeddings),
+            patch("src.rag.engine.get_llm"),
+        ):
+            engine = RAGEngine(index_dir=tmp_path / "idx", documents_path=documents_path)
 
-        # Créer les documents
+        assert engine.num_documents == 3
+        result = engine.search("Titre: Concert 1", top_k=1)[0]["document"]
+        assert result["content"] == "Titre: Concert 1"
+        assert result["metadata"]["city"] == "Lyon"
+        assert result["metadata"]["title"] == "Concert 1"
+
+    def test_search_returns_distinct_events(self, tmp_path):
+        """Test que top_k compte des événements distincts malgré les chunks."""
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        from src.rag.index_builder import IndexBuilder
+
+        documents_path = tmp_path / "rag_documents.json"
+        long_description = " ".join(f"Passage {i} du programme." for i in range(80))
         documents = [
             {
-                "id": f"doc-{i}",
-                "title": f"Document {i}",
-                "content": f"Contenu du document {i} avec événement culturel",
-                "metadata": {"city": "Paris"},
-            }
-            for i in range(5)
+                "id": "evt-long",
+                "title": "Festival",
+                "content": f"Titre: Festival\nDescription: {long_description}",
+                "metadata": {},
+            },
+            {"id": "evt-a", "title": "A", "content": "Titre: A", "metadata": {}},
+            {"id": "evt-b", "title": "B", "content": "Titre: B", "metadata": {}},
         ]
-        documents_path = tmp_path / "documents.json"
-        with open(documents_path, "w") as f:
-            json.dump(documents, f)
+        documents_path.write_text(json.dumps(documents))
+        embeddings = DeterministicFakeEmbedding(size=1024)
+        with patch("src.rag.index_builder.get_embeddings", return_value=embeddings):
+            IndexBuilder(documents_path=documents_path, index_dir=tmp_path / "idx").rebuild()
 
-        # Mock LangChain components
         with (
-            patch("src.rag.engine.get_embeddings") as mock_emb,
-            patch("src.rag.engine.get_llm") as mock_llm,
+            patch("src.rag.engine.get_embeddings", return_value=embeddings),
+            patch("src.rag.engine.get_llm"),
         ):
+            engine = RAGEngine(index_dir=tmp_path / "idx", documents_path=documents_path)
 
-            # Mock embeddings
-            mock_embeddings = MagicMock()
-            mock_embeddings.embed_query.return_value = np.random.rand(dimension).tolist()
-            mock_emb.return_value = mock_embeddings
+        assert engine._vectorstore.index.ntotal > len(documents)
+        results = engine.search("Passage 3 du programme.", top_k=3)
+        ids = [r["document"]["id"] for r in results]
+        assert sorted(ids) == ["evt-a", "evt-b", "evt-long"]
+        long_result = next(r for r in results if r["document"]["id"] == "evt-long")
+        assert long_result["document"]["content"].endswith("Passage 79 du programme.")
 
-            # Mock LLM
-            mock_llm_instance = MagicMock()
-            mock_llm.return_value = mock_llm_instance
 
-            engine = RAGEngine(index_dir=index_dir, documents_path=documents_path)
+class TestShardedEngine:
+    """Tests du moteur sur un index shardé par ville."""
+
+    @pytest.fixture
+    def engines(self, tmp_path):
+        """Moteurs sur le même corpus, avec et sans shards."""
+        from langchain_core.embeddings import DeterministicFakeEmbedding
 
-        return engine
+        from src.rag.index_builder import IndexBuilder
+
+        documents_path = tmp_path / "rag_documents.json"
+        documents = [
+            {
+                "id": f"evt-{i}",
+                "title": f"Concert {i}",
+                "content": f"Titre: Concert {i}",
+                "metadata": {"city": "Lyon" if i < 3 else "Marseille"},
+            }
+            for i in range(6)
+        ]
+        documents_path.write_text(json.dumps(documents))
+        embeddings = DeterministicFakeEmbedding(size=1024)
+        engines = {}
+        for shard_by in ("none", "city"):
+            index_dir = tmp_path / shard_by
+            with (
+                patch("src.rag.index_builder.get_embeddings", return_value=embeddings),
+                patch.object(settings, "index_shard_by", shard_by),
+            ):
+                IndexBuilder(documents_path=documents_path, index_dir=index_dir).rebuild()
+            with (
+                patch("src.rag.engine.get_embeddings", return_value=embeddings),
+                patch("src.rag.engine.get_llm"),
+            ):
+                engines[shard_by] = RAGEngine(index_dir=index_dir, documents_path=documents_path)
+        return engines
+
+    def test_fan_out_matches_single_index(self, engines):
+        """Test que la recherche sur tous les shards donne le même top_k qu'un index unique."""
+        sharded, single = engines["city"], engines["none"]
+        assert sharded.is_sharded and not single.is_sharded
+        assert sharded.num_documents == 6
+
+        def ranking(engine):
+            return [r["document"]["id"] for r in engine.search("Titre: Concert 4", top_k=4)]
+
+        assert ranking(sharded) == ranking(single)
+        assert ranking(sharded)[0] == "evt-4"
+
+    def test_city_queries_use_one_shard(self, engines):
+        """Test qu'une requête citant une ville n'interroge que son shard."""
+        sharded = engines["city"]
+
+        results = sharded.search("Titre: Concert 4 à Lyon", top_k=6)
+        assert {r["document"]["metadata"]["city"] for r in results} == {"Lyon"}
+
+        results = sharded.search("Titre: Concert 1", top_k=6, city="marseille")
+        assert sorted(r["document"]["id"] for r in results) == ["evt-3", "evt-4", "evt-5"]
+        assert sharded.search("concert", city="Paris") == []
+
+    @pytest.mark.parametrize("shard_by", ["none", "city"])
+    def test_deadline_stops_between_embedding_and_search(self, engines, shard_by):
+        """Test qu'une échéance dépassée pendant l'embedding évite la recherche FAISS."""
+        from langchain_community.vectorstores import FAISS
+
+        from src.rag.engine import DeadlineExceeded
+
+        engine = engines[shard_by]
+        with (
+            patch.object(engine, "_embeddings") as embeddings,
+            patch.object(FAISS, "similarity_search_with_score_by_vector") as similarity_search,
+            pytest.raises(DeadlineExceeded, match="search"),
+        ):
+            engine.search("Titre: Concert 4", top_k=4, deadline=0.0)
+        embeddings.embed_query.assert_called_once()
+        similarity_search.assert_not_called()
+
+
+class TestChunkPooling:
+    """Tests pour l'agrégation des chunks par événement."""
+
+    def test_max_pooling(self):
+        """Test que le score d'un événement est celui de son meilleur chunk."""
+        pooled = pool_chunk_scores(
+            ["a", "b", "a", "c", "b"], np.array([0.9, 0.8, 0.7, 0.85, 0.6]), "max"
+        )
+        assert [(p[0], round(p[1], 2), p[3]) for p in pooled] == [
+            ("a", 0.9, 2),
+            ("c", 0.85, 1),
+            ("b", 0.8, 2),
+        ]
+
+    def test_sum_pooling(self):
+        """Test que la somme favorise les événements avec plusieurs chunks pertinents."""
+        pooled = pool_chunk_scores(["a", "b", "b"], np.array([0.9, 0.6, 0.5]), "sum")
+        assert [p[0] for p in pooled] == ["b", "a"]
+        # The reported similarity stays the best chunk similarity
+        assert round(pooled[0][2], 2) == 0.6
+
+    def test_ties_keep_search_order(self):
+        """Test qu'à score égal l'ordre de la recherche est conservé."""
+        pooled = pool_chunk_scores(["z", "a"], np.array([0.5, 0.5]))
+        assert [p[0] for p in pooled] == ["z", "a"]
+
+
+class TestRAGEngineProperties:
+    """Tests pour les propriétés du RAGEngine."""
 
     def test_num_documents_property(self, mock_engine):
         """Test de la propriété num_documents."""
@@ -118,6 +299,87 @@ class TestRAGEngineProperties:
         assert mock_engine.embedding_dim == 1024
 
 
+class TestGetEvents:
+    """Tests pour la lecture d'événements par id."""
+
+    def test_known_and_unknown_ids(self, mock_engine):
+        """Test que seuls les ids connus sont renvoyés, lus dans le docstore."""
+        events = mock_engine.get_events(["doc-3", "inconnu", "doc-0"])
+
+        assert list(events) == ["doc-3", "doc-0"]
+        assert events["doc-3"]["title"] == "Document 3"
+        assert events["doc-0"]["metadata"] == {"city": "Paris"}
+
+
+class TestSelectContext:
+    """Tests pour la sélection adaptative du contexte (top_k adaptatif)."""
+
+    @staticmethod
+    def _results(*scores):
+        return [
+            {"document": {"id": str(i), "content": "x"}, "similarity": s, "distance": 1 - s}
+            for i, s in enumerate(scores)
+        ]
+
+    def test_absolute_threshold(self, mock_engine):
+        """Test que les résultats sous min_similarity_score sont écartés."""
+        with patch("src.rag.engine.settings") as mock_settings:
+            mock_settings.min_similarity_score = 0.5
+            mock_settings.score_gap_ratio = 1.0
+            mock_settings.max_context_documents = 10
+            selected = mock_engine.select_context(self._results(0.8, 0.6, 0.4, 0.3))
+        assert [r["similarity"] for r in selected] == [0.8, 0.6]
+
+    def test_score_gap_cutoff(self, mock_engine):
+        """Test qu'une chute relative brutale coupe le contexte."""
+        with patch("src.rag.engine.settings") as mock_settings:
+            mock_settings.min_similarity_score = 0.0
+            mock_settings.score_gap_ratio = 0.2
+            mock_settings.max_context_documents = 10
+            selected = mock_engine.select_context(self._results(0.9, 0.85, 0.5, 0.49))
+        assert len(selected) == 2
+
+    def test_max_cap(self, mock_engine):
+        """Test du plafond max_documents."""
+        with patch("src.rag.engine.settings") as mock_settings:
+            mock_settings.min_similarity_score = 0.0
+            mock_settings.score_gap_ratio = 1.0
+            mock_settings.max_context_documents = 3
+            results = self._results(0.9, 0.89, 0.88, 0.87, 0.86)
+            assert len(mock_engine.select_context(results)) == 3
+            assert len(mock_engine.select_context(results, max_documents=2)) == 2
+
+    def test_no_relevant_results(self, mock_engine):
+        """Test qu'aucun document n'est retenu si tout est sous le seuil."""
+        assert mock_engine.select_context(self._results(0.1, 0.05)) == []
+
+
+class TestRecurringEvents:
+    """Tests pour l'expansion des événements récurrents."""
+
+    def test_expand_to_next_occurrence(self):
+        """Test que start_date/end_date pointent vers la prochaine occurrence."""
+        from datetime import UTC, datetime
+
+        metadata = {
+            "start_date": "2026-01-01T10:00:00+00:00",
+            "occurrences": [
+                ["2026-01-01T10:00:00+00:00", "2026-01-01T12:00:00+00:00"],
+                ["2026-02-01T10:00:00+00:00", "2026-02-01T12:00:00+00:00"],
+            ],
+        }
+        now = datetime(2026, 1, 15, tzinfo=UTC)
+        expanded = expand_occurrence(metadata, now=now)
+
+        assert expanded["start_date"] == "2026-02-01T10:00:00+00:00"
+        assert metadata["start_date"] == "2026-01-01T10:00:00+00:00"
+
+    def test_non_recurring_metadata_unchanged(self):
+        """Test qu'un événement simple n'est pas modifié."""
+        metadata = {"start_date": "2026-01-01"}
+        assert expand_occurrence(metadata) is metadata
+
+
 class TestNeedsRAG:
     """Tests pour la classification needs_rag."""
 
@@ -235,6 +497,35 @@ class TestChat:
             pytest.skip("Index FAISS non disponible")
 
 
+class TestChatStream:
+    """Tests pour le pipeline de chat en flux (WebSocket)."""
+
+    def test_sources_then_tokens(self, mock_engine):
+        """Test que les sources sont émises avant les morceaux de réponse."""
+        mock_engine.needs_rag = MagicMock(return_value=False)
+        mock_engine._conversation_chain = MagicMock()
+        mock_engine._conversation_chain.stream.return_value = iter(["Bon", "", "jour"])
+
+        events = list(mock_engine.chat_stream("Bonjour", history=[]))
+
+        assert events == [
+            {"type": "sources", "sources": [], "used_rag": False},
+            {"type": "token", "content": "Bon"},
+            {"type": "token", "content": "jour"},
+        ]
+
+    def test_deadline_stops_before_generation(self, mock_engine):
+        """Test qu'une échéance dépassée arrête le flux avant l'appel au LLM."""
+        from src.rag.engine import DeadlineExceeded
+
+        mock_engine.needs_rag = MagicMock(return_value=False)
+        mock_engine._conversation_chain = MagicMock()
+
+        with pytest.raises(DeadlineExceeded):
+            list(mock_engine.chat_stream("Bonjour", deadline=0.0))
+        mock_engine._conversation_chain.stream.assert_not_called()
+
+
 class TestConversationResponse:
     """Tests pour les réponses conversationnelles."""
 
@@ -311,7 +602,6 @@ class TestLangChainComponents:
             patch("src.rag.engine.get_embeddings") as mock_emb,
             patch("src.rag.engine.get_llm") as mock_llm,
         ):
-
             mock_embeddings = MagicMock()
             mock_embeddings.embed_query.return_value = np.random.rand(dimension).tolist()
             mock_emb.return_value = mock_embeddings
@@ -332,6 +622,19 @@ class TestLangChainComponents:
             assert converted[0].content == "Hello"
             assert converted[1].content == "Hi there!"
 
+    def test_summary_history_conversion(self, mock_engine):
+        """Test que le résumé glissant devient un SystemMessage."""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        history = [
+            {"role": "system", "content": "Résumé : l'utilisateur aime le jazz"},
+            {"role": "user", "content": "Et à Lyon ?"},
+        ]
+        converted = mock_engine._convert_history(history)
+
+        assert isinstance(converted[0], SystemMessage)
+        assert isinstance(converted[1], HumanMessage)
+
     def test_empty_history_conversion(self, tmp_path):
         """Test de la conversion d'un historique vide."""
         import faiss
@@ -359,7 +662,6 @@ class TestLangChainComponents:
             patch("src.rag.engine.get_embeddings") as mock_emb,
             patch("src.rag.engine.get_llm") as mock_llm,
         ):
-
             mock_embeddings = MagicMock()
             mock_embeddings.embed_query.return_value = np.random.rand(dimension).tolist()
             mock_emb.return_value = mock_embeddings
@@ -0,0 +1,139 @@
+"""Tests unitaires pour le worker de reconstruction (src.worker)."""
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.config.settings import settings
+from src.database.models import RebuildJobModel
+from src.worker.rebuild import JobProgress, RebuildCancelled, run_job
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+class FakeBuilder:
+    """Builder qui rapporte sa progression pendant quelques cycles du worker."""
+
+    def __init__(self, progress_callback, steps=5, error=None):
+        self.progress_callback = progress_callback
+        self.steps = steps
+        self.error = error
+
+    def rebuild(self) -> dict:
+        for step in range(self.steps):
+            self.progress_callback(f"Etape {step}", step / (self.steps * 2))
+            time.sleep(0.02)
+        if self.error:
+            raise self.error
+        self.progress_callback("Reconstruction terminée", 1.0)
+        return {"status": "completed", "index_vectors": 3}
+
+    def rebuild_shard(self, key: str) -> dict:
+        return {**self.rebuild(), "shard": key}
+
+
+@pytest.fixture
+def repo():
+    """Repository des jobs remplacé par un mock (pas de PostgreSQL)."""
+    repository = AsyncMock()
+    repository.update_progress.return_value = False
+    with (
+        patch("src.worker.rebuild.RebuildJobRepository", return_value=repository),
+        patch.object(settings, "rebuild_worker_poll_interval", 0.01),
+    ):
+        yield repository
+
+
+class TestJobProgress:
+    """Tests pour le callback de progression partagé avec le thread de build."""
+
+    def test_records_last_report(self):
+        """Test que le dernier état rapporté est lu par le worker."""
+        progress = JobProgress()
+        progress("Embeddings: 10/20", 0.4)
+        assert progress.snapshot() == (0.4, "Embeddings: 10/20")
+
+    def test_cancel_stops_before_save(self):
+        """Test que l'annulation interrompt le build avant la sauvegarde seulement."""
+        progress = JobProgress()
+        progress.cancelled.set()
+        with pytest.raises(RebuildCancelled):
+            progress("Embeddings: 10/20", 0.4)
+        # The new version is being written: finish it
+        progress("Sauvegarde terminée", 0.95)
+        assert progress.snapshot() == (0.95, "Sauvegarde terminée")
+
+
+class TestRunJob:
+    """Tests pour l'exécution d'un job réclamé par le worker."""
+
+    def test_completed_job_stores_result(self, repo):
+        """Test qu'un job terminé enregistre les statistiques et la progression."""
+        job_id = uuid.uuid4()
+
+        status = asyncio.run(run_job(job_id, _session, builder_factory=FakeBuilder))
+
+        assert status == "completed"
+        assert repo.update_progress.await_count > 0
+        repo.finish.assert_awaited_once_with(
+            job_id,
+            "completed",
+            message="Reconstruction terminee",
+            result={"status": "completed", "index_vectors": 3},
+        )
+
+    def test_shard_job_rebuilds_only_its_shard(self, repo):
+        """Test qu'un job portant un shard appelle rebuild_shard avec sa clé."""
+        job_id = uuid.uuid4()
+
+        status = asyncio.run(
+            run_job(job_id, _session, builder_factory=FakeBuilder, shard="marseille")
+        )
+
+        assert status == "completed"
+        assert repo.finish.await_args.kwargs["result"]["shard"] == "marseille"
+
+    def test_cancel_requested_through_database(self, repo):
+        """Test qu'une annulation lue en base arrête le build."""
+        repo.update_progress.return_value = True
+
+        status = asyncio.run(
+            run_job(uuid.uuid4(), _session, builder_factory=lambda cb: FakeBuilder(cb, steps=50))
+        )
+
+        assert status == "cancelled"
+        assert repo.finish.await_args.args[1] == "cancelled"
+
+    def test_failed_job_stores_error(self, repo):
+        """Test qu'une erreur du build marque le job en échec."""
+        status = asyncio.run(
+            run_job(
+                uuid.uuid4(),
+                _session,
+                builder_factory=lambda cb: FakeBuilder(cb, error=FileNotFoundError("absent")),
+            )
+        )
+
+        assert status == "failed"
+        assert repo.finish.await_args.kwargs["error"] == "absent"
+
+
+def test_single_active_job_index():
+    """Test que l'index partiel unique limite les jobs actifs à un seul."""
+    index = next(
+        index
+        for index in RebuildJobModel.__table__.indexes
+        if index.name == "ux_rebuild_jobs_single_active"
+    )
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "CREATE UNIQUE INDEX" in ddl
+    assert "WHERE status IN ('queued', 'in_progress')" in ddl
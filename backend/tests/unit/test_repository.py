@@ -0,0 +1,177 @@
+"""Tests unitaires pour l'unité de travail de /chat (src.database.repository)."""
+
+import asyncio
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import MessageModel, SessionModel
+from src.database.repository import (
+    ChatUnitOfWork,
+    MessageRepository,
+    SessionRepository,
+    decode_message_cursor,
+    encode_message_cursor,
+)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestSaveExchange:
+    """Tests pour la persistance d'un échange en une transaction."""
+
+    def test_single_commit_without_refresh(self):
+        """Test que session et messages sont écrits en deux requêtes et un seul commit."""
+        db = AsyncMock()
+
+        asyncio.run(
+            ChatUnitOfWork(db).save_exchange(
+                uuid.uuid4(),
+                query="Concerts ce soir ?",
+                response="Voici trois concerts.",
+                asked_at=datetime(2025, 6, 1, 20, 0),
+                sources=[{"title": "Concert"}],
+                latency_ms=850.0,
+                top_k=5,
+            )
+        )
+
+        assert db.execute.await_count == 2
+        db.commit.assert_awaited_once()
+        db.refresh.assert_not_awaited()
+
+        upsert, messages = (_sql(call.args[0]) for call in db.execute.await_args_list)
+        assert "ON CONFLICT (id) DO UPDATE SET updated_at" in upsert
+        # Both messages in one multi-row INSERT
+        assert "INSERT INTO messages" in messages
+        assert "role_m1" in messages
+
+    def test_rollback_on_error(self):
+        """Test qu'un échec d'écriture annule la transaction."""
+        db = AsyncMock()
+        db.execute.side_effect = [None, RuntimeError("violation")]
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(
+                ChatUnitOfWork(db).save_exchange(
+                    uuid.uuid4(), query="q", response="r", asked_at=datetime(2025, 6, 1)
+                )
+            )
+
+        db.commit.assert_not_awaited()
+        db.rollback.assert_awaited_once()
+
+
+class TestLoadHistory:
+    """Tests pour la lecture de l'historique avant la génération."""
+
+    def test_new_session(self):
+        """Test qu'une session inconnue donne un historique vide sans lire les messages."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.first.return_value = None
+        db.execute.return_value = result
+
+        metadata, messages = asyncio.run(ChatUnitOfWork(db).load_history(uuid.uuid4()))
+
+        assert (metadata, messages) == ({}, [])
+        assert db.execute.await_count == 1
+        # The read transaction is closed before generation
+        db.rollback.assert_awaited_once()
+
+    def test_existing_session(self):
+        """Test que les messages non résumés sont lus après summarized_until."""
+        db = AsyncMock()
+        session_row, message_rows = MagicMock(), MagicMock()
+        session_row.first.return_value = ({"summary": "Résumé", "summarized_until": 4},)
+        message_rows.scalars.return_value.all.return_value = ["m6", "m5"]
+        db.execute.side_effect = [session_row, message_rows]
+
+        metadata, messages = asyncio.run(ChatUnitOfWork(db).load_history(uuid.uuid4()))
+
+        assert metadata["summary"] == "Résumé"
+        assert messages == ["m5", "m6"]
+        assert "messages.id > " in _sql(db.execute.await_args_list[1].args[0])
+
+
+def _message(message_id: int, minute: int) -> MessageModel:
+    return MessageModel(
+        id=message_id, role="user", content="q", created_at=datetime(2025, 6, 1, 20, minute)
+    )
+
+
+class TestMessagePage:
+    """Tests pour la pagination par curseur (created_at, id) de l'historique."""
+
+    def test_next_cursor_from_extra_row(self):
+        """Test qu'une ligne de plus que limit est lue pour savoir s'il reste une page."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [_message(1, 0), _message(2, 1)]
+        db.execute.return_value = result
+
+        messages, cursor = asyncio.run(MessageRepository(db).get_page(uuid.uuid4(), limit=1))
+
+        assert [m.id for m in messages] == [1]
+        assert decode_message_cursor(cursor) == (datetime(2025, 6, 1, 20, 0), 1)
+        sql = _sql(db.execute.await_args.args[0])
+        assert "ORDER BY messages.created_at, messages.id" in sql
+        assert "LIMIT" in sql
+
+    def test_cursor_seeks_with_row_comparison(self):
+        """Test que le curseur devient une comparaison (created_at, id) sans OFFSET."""
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [_message(3, 2)]
+        db.execute.return_value = result
+        cursor = encode_message_cursor(_message(5, 4))
+
+        messages, next_cursor = asyncio.run(
+            MessageRepository(db).get_page(uuid.uuid4(), limit=2, cursor=cursor, newest_first=True)
+        )
+
+        assert next_cursor is None
+        sql = _sql(db.execute.await_args.args[0])
+        assert "(messages.created_at, messages.id) < (" in sql
+        assert "OFFSET" not in sql
+
+    def test_invalid_cursor(self):
+        """Test qu'un curseur illisible lève ValueError."""
+        with pytest.raises(ValueError):
+            decode_message_cursor("pas-un-curseur")
+
+
+def test_session_messages_never_loaded_implicitly():
+    """Test que les relations session/messages ne se chargent pas implicitement."""
+    assert SessionModel.messages.property.lazy == "raise"
+    assert MessageModel.session.property.lazy == "raise"
+
+
+def test_delete_expired_bounded_batch():
+    """Test que la purge supprime un lot borné de sessions expirées, sans attendre les verrous."""
+    db = AsyncMock()
+    db.execute.return_value = MagicMock(rowcount=3)
+
+    deleted = asyncio.run(SessionRepository(db).delete_expired(86400.0, 500))
+
+    assert deleted == 3
+    db.commit.assert_awaited_once()
+    sql = _sql(db.execute.await_args.args[0])
+    assert sql.startswith("DELETE FROM sessions WHERE sessions.id IN (SELECT sessions.id")
+    assert "sessions.updated_at < now() -" in sql
+    assert "LIMIT" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_messages_partitioned_by_month():
+    """Test que la table messages est partitionnée sur created_at, inclus dans la clé."""
+    from sqlalchemy.schema import CreateTable
+
+    ddl = str(CreateTable(MessageModel.__table__).compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    assert "PRIMARY KEY (id, created_at)" in ddl
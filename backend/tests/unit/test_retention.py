@@ -0,0 +1,123 @@
+"""Tests unitaires pour la rétention des sessions et des partitions (src.worker.retention)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.config.settings import settings
+from src.database.partitions import (
+    MessagePartitionRepository,
+    add_months,
+    create_partition_sql,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from src.worker.retention import maintain_message_partitions, purge_expired_sessions
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+class TestPartitionNames:
+    """Tests pour le calcul des partitions mensuelles."""
+
+    def test_month_arithmetic(self):
+        """Test le passage d'année dans les deux sens."""
+        assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert add_months(date(2026, 10, 1), -12) == date(2025, 10, 1)
+
+    def test_month_start_in_utc(self):
+        """Test que le mois d'un horodatage est calculé en UTC."""
+        moment = datetime(2026, 11, 1, 0, 30, tzinfo=UTC).astimezone()
+        assert month_start(moment) == date(2026, 11, 1)
+        assert month_start(datetime(2026, 10, 19, 12)) == date(2026, 10, 1)
+
+    def test_partition_name_round_trip(self):
+        """Test que le nom d'une partition redonne son mois (aucun pour la partition DEFAULT)."""
+        assert partition_name(date(2026, 3, 1)) == "messages_y2026m03"
+        assert partition_month("messages_y2026m03") == date(2026, 3, 1)
+        assert partition_month("messages_default") is None
+
+    def test_partition_bounds(self):
+        """Test que la partition couvre le mois, borne haute exclue."""
+        sql = create_partition_sql(date(2026, 12, 1))
+        assert "messages_y2026m12 PARTITION OF messages" in sql
+        assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+
+class TestMessagePartitionRepository:
+    """Tests pour la création et la suppression des partitions."""
+
+    def test_creates_only_missing_partitions(self):
+        """Test que seules les partitions absentes sont créées."""
+        db = AsyncMock()
+        repo = MessagePartitionRepository(db)
+        with patch.object(
+            MessagePartitionRepository,
+            "list_partitions",
+            AsyncMock(return_value=["messages_default", "messages_y2026m10"]),
+        ):
+            created = asyncio.run(repo.create_partitions(date(2026, 10, 1), date(2026, 12, 1)))
+
+        assert created == ["messages_y2026m11", "messages_y2026m12"]
+        assert db.execute.await_count == 2
+
+    def test_drops_old_months_only(self):
+        """Test que seules les partitions mensuelles antérieures sont supprimées."""
+        db = AsyncMock()
+        repo = MessagePartitionRepository(db)
+        partitions = ["messages_default", "messages_y2026m01", "messages_y2026m02"]
+        with patch.object(
+            MessagePartitionRepository, "list_partitions", AsyncMock(return_value=partitions)
+        ):
+            dropped = asyncio.run(repo.drop_partitions_before(date(2026, 2, 1)))
+
+        assert dropped == ["messages_y2026m01"]
+        assert "DROP TABLE IF EXISTS messages_y2026m01" in str(db.execute.await_args.args[0])
+
+
+class TestRetention:
+    """Tests pour la passe de rétention du worker."""
+
+    def test_purge_runs_batches_until_short_one(self):
+        """Test que la purge enchaîne des lots bornés jusqu'au dernier lot incomplet."""
+        repository = AsyncMock()
+        repository.delete_expired.side_effect = [2, 2, 1]
+        with patch("src.worker.retention.SessionRepository", return_value=repository):
+            purged = asyncio.run(purge_expired_sessions(_session, ttl_days=1.0, batch_size=2))
+
+        assert purged == 5
+        assert repository.delete_expired.await_count == 3
+        assert repository.delete_expired.await_args.args == (86400.0, 2)
+
+    def test_partitions_created_ahead_and_dropped(self):
+        """Test que les mois à venir sont créés et les mois hors rétention supprimés."""
+        partitions = MagicMock()
+        partitions.is_partitioned = AsyncMock(return_value=True)
+        partitions.create_partitions = AsyncMock(return_value=["messages_y2026m12"])
+        partitions.drop_partitions_before = AsyncMock(return_value=["messages_y2026m06"])
+        with (
+            patch("src.worker.retention.MessagePartitionRepository", return_value=partitions),
+            patch.object(settings, "message_partitions_ahead", 2),
+            patch.object(settings, "message_retention_months", 4),
+        ):
+            created, dropped = asyncio.run(
+                maintain_message_partitions(_session, now=datetime(2026, 10, 19))
+            )
+
+        assert (created, dropped) == (["messages_y2026m12"], ["messages_y2026m06"])
+        partitions.create_partitions.assert_awaited_once_with(date(2026, 10, 1), date(2026, 12, 1))
+        partitions.drop_partitions_before.assert_awaited_once_with(date(2026, 6, 1))
+
+    def test_unpartitioned_table_left_alone(self):
+        """Test qu'une table messages non partitionnée (migration 004 absente) est ignorée."""
+        partitions = MagicMock()
+        partitions.is_partitioned = AsyncMock(return_value=False)
+        with patch("src.worker.retention.MessagePartitionRepository", return_value=partitions):
+            assert asyncio.run(maintain_message_partitions(_session)) == ([], [])
+        partitions.create_partitions.assert_not_called()
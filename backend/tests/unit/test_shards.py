@@ -0,0 +1,35 @@
+"""Tests unitaires pour les shards d'index par ville / région (src.rag.shards)."""
+
+from src.rag.shards import UNKNOWN_SHARD, merge_ranked, route_query, shard_key
+
+
+class TestShardKey:
+    """Tests pour la clé de shard d'un événement."""
+
+    def test_city_slug(self):
+        """Test que la clé est un slug de la ville sans accents."""
+        assert shard_key({"city": "Aix-en-Provence"}, "city") == "aix-en-provence"
+        assert shard_key({"city": "Montélimar"}, "city") == "montelimar"
+
+    def test_missing_place(self):
+        """Test que les événements sans ville vont dans un shard dédié."""
+        assert shard_key({"city": ""}, "city") == UNKNOWN_SHARD
+        assert shard_key({"city": "Lyon"}, "region") == UNKNOWN_SHARD
+
+
+def test_route_query_matches_whole_words():
+    """Test que seules les villes citées comme mots entiers routent la requête."""
+    city_to_shard = {"marseille": "marseille", "aix en provence": "aix-en-provence"}
+
+    assert route_query("Concerts à Marseille ce soir", city_to_shard) == ["marseille"]
+    assert route_query("Expo à Aix-en-Provence ?", city_to_shard) == ["aix-en-provence"]
+    assert route_query("Marseillaise chantée", city_to_shard) == []
+
+
+def test_merge_ranked_keeps_global_top_k():
+    """Test que la fusion des résultats triés de chaque shard garde les meilleurs."""
+    lyon = [("a", 0.9), ("b", 0.5)]
+    marseille = [("c", 0.8), ("d", 0.7), ("e", 0.1)]
+
+    assert [hit[0] for hit in merge_ranked([lyon, marseille], 3)] == ["a", "c", "d"]
+    assert merge_ranked([[], []], 3) == []
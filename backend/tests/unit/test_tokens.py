@@ -0,0 +1,39 @@
+"""Tests unitaires pour le budget de tokens de l'historique."""
+
+from src.utils.tokens import estimate_tokens, trim_history_to_tokens
+
+
+class TestEstimateTokens:
+    """Tests pour l'estimation du nombre de tokens."""
+
+    def test_empty_text(self):
+        """Test qu'un texte vide compte 0 token."""
+        assert estimate_tokens("") == 0
+
+    def test_grows_with_length(self):
+        """Test que l'estimation croît avec la longueur du texte."""
+        assert estimate_tokens("a" * 400) > estimate_tokens("a" * 40) > 0
+
+
+class TestTrimHistory:
+    """Tests pour le plafonnement de l'historique en tokens."""
+
+    @staticmethod
+    def _history(*sizes):
+        roles = ["user", "assistant"]
+        return [{"role": roles[i % 2], "content": "a" * size} for i, size in enumerate(sizes)]
+
+    def test_keeps_everything_within_budget(self):
+        """Test que tout l'historique est conservé s'il tient dans le budget."""
+        history = self._history(40, 40)
+        assert trim_history_to_tokens(history, 100) == history
+
+    def test_drops_oldest_messages(self):
+        """Test que les messages les plus anciens sont écartés en premier."""
+        history = self._history(400, 40, 40)
+        trimmed = trim_history_to_tokens(history, 50)
+        assert trimmed == history[1:]
+
+    def test_zero_budget(self):
+        """Test qu'un budget nul vide l'historique."""
+        assert trim_history_to_tokens(self._history(40), 0) == []
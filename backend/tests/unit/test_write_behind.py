@@ -0,0 +1,147 @@
+"""Tests unitaires pour la file d'écriture différée des messages (src.database.write_behind)."""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.config.settings import settings
+from src.database.repository import ChatExchange
+from src.database.write_behind import MessageWriteBehind, WriteBehindFull
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+class FakeDatabase:
+    """Remplace ChatUnitOfWork : enregistre les lots écrits, ou échoue."""
+
+    def __init__(self):
+        self.batches = []
+        self.available = True
+        self.gate = None
+
+    def __call__(self, db):
+        return self
+
+    async def save_exchanges(self, exchanges):
+        if self.gate is not None:
+            await self.gate.wait()
+        if not self.available:
+            raise ConnectionError("PostgreSQL indisponible")
+        self.batches.append(list(exchanges))
+
+
+def _exchange(session_id, query="Concerts ?"):
+    return ChatExchange(
+        session_id=session_id,
+        query=query,
+        response="Voici des concerts.",
+        asked_at=datetime(2025, 6, 1, 20, 0),
+        answered_at=datetime(2025, 6, 1, 20, 0, 2),
+        sources=[{"title": "Concert"}],
+        latency_ms=2000.0,
+        top_k=5,
+    )
+
+
+@pytest.fixture
+def database():
+    fake = FakeDatabase()
+    with patch("src.database.write_behind.ChatUnitOfWork", fake):
+        yield fake
+
+
+def test_batch_flushed_and_pending_until_written(database, tmp_path):
+    """Test que les échanges sont écrits par lots et restent lisibles avant l'écriture."""
+    session_id = uuid.uuid4()
+
+    async def scenario():
+        writer = MessageWriteBehind(_session, batch_size=2, flush_interval=60, spill_dir=tmp_path)
+        await writer.start()
+        await writer.submit(_exchange(session_id, "Première question"))
+        pending = writer.pending_messages(session_id)
+        await writer.submit(_exchange(session_id, "Deuxième question"))  # Batch full
+        await asyncio.sleep(0.01)
+        await writer.close()
+        return pending, writer.pending_messages(session_id)
+
+    pending, after = asyncio.run(scenario())
+
+    assert [m["content"] for m in pending] == ["Première question", "Voici des concerts."]
+    assert after == []
+    assert [len(batch) for batch in database.batches] == [2]
+
+
+def test_buffer_full_raises(database, tmp_path):
+    """Test que submit échoue quand la base ne libère pas de place à temps."""
+
+    async def scenario():
+        database.gate = asyncio.Event()  # Database stalled
+        writer = MessageWriteBehind(
+            _session, buffer_size=1, batch_size=1, flush_interval=0.01, spill_dir=tmp_path
+        )
+        await writer.start()
+        await writer.submit(_exchange(uuid.uuid4()))
+        with pytest.raises(WriteBehindFull):
+            await writer.submit(_exchange(uuid.uuid4()))
+        database.gate.set()
+        await writer.close()
+
+    with patch.object(settings, "message_buffer_timeout", 0.05):
+        asyncio.run(scenario())
+    assert len(database.batches) == 1
+
+
+def test_spilled_on_shutdown_and_replayed(database, tmp_path):
+    """Test que les échanges non écrits à l'arrêt sont sauvegardés puis repris."""
+    session_id = uuid.uuid4()
+    database.available = False
+
+    async def shutdown_without_database():
+        writer = MessageWriteBehind(_session, flush_interval=60, spill_dir=tmp_path)
+        await writer.start()
+        await writer.submit(_exchange(session_id))
+        await writer.close()
+
+    async def restart():
+        writer = MessageWriteBehind(_session, flush_interval=60, spill_dir=tmp_path)
+        await writer.start()
+        pending = writer.pending_messages(session_id)
+        await writer.close()
+        return pending
+
+    asyncio.run(shutdown_without_database())
+    assert database.batches == []
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+    database.available = True
+    pending = asyncio.run(restart())
+
+    assert len(pending) == 2
+    [[replayed]] = database.batches
+    assert replayed.session_id == session_id
+    assert replayed.answered_at == datetime(2025, 6, 1, 20, 0, 2)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_discard_deleted_session(database, tmp_path):
+    """Test que les échanges en attente d'une session supprimée ne sont pas écrits."""
+    deleted, kept = uuid.uuid4(), uuid.uuid4()
+
+    async def scenario():
+        writer = MessageWriteBehind(_session, flush_interval=60, spill_dir=tmp_path)
+        await writer.start()
+        await writer.submit(_exchange(deleted))
+        await writer.submit(_exchange(kept))
+        dropped = writer.discard(deleted)
+        await writer.close()
+        return dropped
+
+    assert asyncio.run(scenario()) == 1
+    assert [e.session_id for batch in database.batches for e in batch] == [kept]